@@ -1,64 +1,275 @@
-# config.py
-"""Configuration management for the Weather App."""
-
-import os
-from dotenv import load_dotenv
-
-# Load environment variables from .env file
-load_dotenv()
-
-class Config:
-    """Application configuration."""
-    
-    # API Configuration
-    API_KEY = os.getenv("OPENWEATHER_API_KEY", "")
-    BASE_URL = os.getenv(
-        "OPENWEATHER_BASE_URL", 
-        "https://api.openweathermap.org/data/2.5/weather"
-    )
-    
-    # App Configuration
-    APP_TITLE = "Weather App"
-    APP_WIDTH = 400
-    APP_HEIGHT = 600
-    
-    # API Settings
-    UNITS = "metric"  # metric, imperial, or standard
-    TIMEOUT = 10  # seconds
-    
-    @classmethod
-    def validate(cls):
-        """Validate that required configuration is present."""
-        if not cls.API_KEY:
-            raise ValueError(
-                "OPENWEATHER_API_KEY not found. "
-                "Please create a .env file with your API key."
-            )
-        return True
-
-# config.py
-
-CUSTOM_ICONS = {
-    "01d": "01d.png",
-    "01n": "01n.png",
-    "02d": "02d.png",
-    "02n": "02n.png",
-    "03d": "03d.png",
-    "03n": "03n.png",
-    "04d": "04d.png",
-    "04n": "04n.png",
-    "09d": "09d.png",
-    "09n": "09n.png",
-    "10d": "10d.png",
-    "10n": "10n.png",
-    "11d": "11d.png",
-    "11n": "11n.png",
-    "13d": "13d.png",
-    "13n": "13n.png",
-    "50d": "50d.png",
-    "50n": "50n.png",
-}
-
-
-# Validate configuration on import
-Config.validate()
\ No newline at end of file
+# config.py
+"""
+Configuration management for the Weather App.
+
+Nothing is read at import time. Settings are resolved the first time they
+are used, from these layers (later layers win):
+
+1. Defaults declared on Settings
+2. An optional TOML file: ``WEATHER_CONFIG_FILE``, or ``weather.toml``
+   in the working directory if it exists
+3. A ``.env`` file (the nearest one above this module, as load_dotenv finds)
+4. Process environment variables
+
+The merged result is validated once and cached. ``Config`` keeps the old
+``Config.API_KEY`` style of access working on top of that cache.
+"""
+
+import os
+from dataclasses import dataclass, fields, replace
+from typing import Any, Dict, Mapping, Optional, Union
+
+try:
+    import tomllib  # Python 3.11+
+except ImportError:
+    tomllib = None
+
+
+@dataclass(frozen=True)
+class Settings:
+    """Application configuration."""
+
+    # API Configuration
+    API_KEY: str = ""
+    BASE_URL: str = "https://api.openweathermap.org/data/2.5/weather"
+    FORECAST_URL: str = "https://api.openweathermap.org/data/2.5/forecast"
+    GEOLOCATION_URL: str = "https://ipapi.co/json/"
+
+    # App Configuration
+    APP_TITLE: str = "Weather App"
+    APP_WIDTH: int = 400
+    APP_HEIGHT: int = 600
+
+    # API Settings
+    UNITS: str = "metric"  # metric, imperial, or standard
+    TIMEOUT: float = 10  # seconds
+
+    # HTTP Connection Pool
+    MAX_CONNECTIONS: int = 10
+    MAX_KEEPALIVE_CONNECTIONS: int = 5
+    KEEPALIVE_EXPIRY: float = 30  # seconds
+    BATCH_CONCURRENCY: int = 5  # parallel batch requests
+
+    # Retries and Circuit Breaker
+    MAX_RETRIES: int = 2
+    RETRY_BACKOFF_BASE: float = 0.5  # seconds
+    RETRY_BACKOFF_MAX: float = 8  # seconds
+    CIRCUIT_FAILURE_THRESHOLD: int = 5
+    CIRCUIT_RESET_TIMEOUT: float = 30  # seconds
+
+    # Rate Limit (0 calls per minute disables it). Set RATE_LIMIT_SHARED_PATH
+    # to a file to share one budget between app instances on this host.
+    RATE_LIMIT_PER_MINUTE: float = 60
+    RATE_LIMIT_BURST: int = 10
+    RATE_LIMIT_SHARED_PATH: str = ""
+
+    # Response Cache
+    CACHE_MAX_ENTRIES: int = 128
+    CURRENT_WEATHER_TTL: int = 600  # seconds
+    FORECAST_TTL: int = 1800  # seconds
+
+    # On-disk Snapshot (shown instantly on startup, then refreshed)
+    SNAPSHOT_DB_PATH: str = "weather_snapshots.db"
+    SNAPSHOT_STALE_AFTER: int = 900  # seconds
+    SNAPSHOT_MAX_AGE: int = 86400  # seconds
+
+    def validate(self) -> bool:
+        """Validate that required configuration is present."""
+        if not self.API_KEY:
+            raise ValueError(
+                "OPENWEATHER_API_KEY not found. "
+                "Please create a .env file with your API key."
+            )
+        if self.UNITS not in ("metric", "imperial", "standard"):
+            raise ValueError(f"Unknown UNITS {self.UNITS!r}")
+        return True
+
+    def with_overrides(self, **overrides: Any) -> "Settings":
+        """Return a copy with some settings replaced (values are coerced)."""
+        return replace(self, **_coerce(overrides))
+
+
+# Setting name -> environment / .env variable
+ENV_VARS = {
+    "API_KEY": "OPENWEATHER_API_KEY",
+    "BASE_URL": "OPENWEATHER_BASE_URL",
+    "FORECAST_URL": "OPENWEATHER_FORECAST_URL",
+    "GEOLOCATION_URL": "GEOLOCATION_URL",
+    "UNITS": "OPENWEATHER_UNITS",
+    "TIMEOUT": "HTTP_TIMEOUT",
+    "MAX_CONNECTIONS": "HTTP_MAX_CONNECTIONS",
+    "MAX_KEEPALIVE_CONNECTIONS": "HTTP_MAX_KEEPALIVE",
+    "KEEPALIVE_EXPIRY": "HTTP_KEEPALIVE_EXPIRY",
+    "BATCH_CONCURRENCY": "BATCH_CONCURRENCY",
+    "MAX_RETRIES": "MAX_RETRIES",
+    "RETRY_BACKOFF_BASE": "RETRY_BACKOFF_BASE",
+    "RETRY_BACKOFF_MAX": "RETRY_BACKOFF_MAX",
+    "CIRCUIT_FAILURE_THRESHOLD": "CIRCUIT_FAILURE_THRESHOLD",
+    "CIRCUIT_RESET_TIMEOUT": "CIRCUIT_RESET_TIMEOUT",
+    "RATE_LIMIT_PER_MINUTE": "RATE_LIMIT_PER_MINUTE",
+    "RATE_LIMIT_BURST": "RATE_LIMIT_BURST",
+    "RATE_LIMIT_SHARED_PATH": "RATE_LIMIT_SHARED_PATH",
+    "CACHE_MAX_ENTRIES": "CACHE_MAX_ENTRIES",
+    "CURRENT_WEATHER_TTL": "CURRENT_WEATHER_TTL",
+    "FORECAST_TTL": "FORECAST_TTL",
+    "SNAPSHOT_DB_PATH": "WEATHER_SNAPSHOT_PATH",
+    "SNAPSHOT_STALE_AFTER": "SNAPSHOT_STALE_AFTER",
+    "SNAPSHOT_MAX_AGE": "SNAPSHOT_MAX_AGE",
+}
+
+DEFAULT_TOML_FILE = "weather.toml"
+
+_FIELD_TYPES = {f.name: f.type for f in fields(Settings)}
+
+
+def _coerce(values: Mapping[str, Any]) -> Dict[str, Any]:
+    """Convert raw (string or TOML) values to the types declared on Settings."""
+    coerced = {}
+    for name, value in values.items():
+        field_type = _FIELD_TYPES.get(name)
+        if field_type is None:
+            raise ValueError(f"Unknown setting {name!r}")
+        try:
+            coerced[name] = field_type(value)
+        except (TypeError, ValueError) as e:
+            raise ValueError(f"Invalid value for {name}: {value!r}") from e
+    return coerced
+
+
+def _read_toml(path: str) -> Dict[str, Any]:
+    """Read settings from a TOML file; keys are setting names in any case."""
+    if tomllib is None:
+        raise ValueError(f"Cannot read {path}: TOML needs Python 3.11+")
+    with open(path, "rb") as f:
+        data = tomllib.load(f)
+    # Settings may sit at the top level or under a [weather] table
+    data = {**data, **data.get("weather", {})}
+    return {k.upper(): v for k, v in data.items() if k.upper() in _FIELD_TYPES}
+
+
+def _from_variables(variables: Mapping[str, Optional[str]]) -> Dict[str, str]:
+    """Pick the settings present (and non-empty) in a variable mapping."""
+    return {
+        name: variables[var]
+        for name, var in ENV_VARS.items()
+        if variables.get(var) not in (None, "")
+    }
+
+
+def load_settings(
+    env_file: Optional[str] = None,
+    toml_file: Optional[str] = None,
+    environ: Optional[Mapping[str, str]] = None,
+) -> Settings:
+    """
+    Build Settings from defaults, a TOML file, a .env file and the environment.
+
+    Nothing is cached and os.environ is not modified.
+
+    Args:
+        env_file: Path of the .env file. Defaults to the nearest .env found
+            from this module's directory upwards
+        toml_file: Path of a TOML file. Defaults to WEATHER_CONFIG_FILE, or
+            weather.toml if that exists
+        environ: Environment to read (defaults to os.environ)
+
+    Returns:
+        Unvalidated Settings
+    """
+    environ = os.environ if environ is None else environ
+    values: Dict[str, Any] = {}
+
+    toml_file = toml_file or environ.get("WEATHER_CONFIG_FILE")
+    if toml_file is None and os.path.exists(DEFAULT_TOML_FILE):
+        toml_file = DEFAULT_TOML_FILE
+    if toml_file:
+        values.update(_read_toml(toml_file))
+
+    from dotenv import dotenv_values, find_dotenv
+
+    env_file = env_file or find_dotenv()
+    if env_file and os.path.exists(env_file):
+        values.update(_from_variables(dotenv_values(env_file)))
+
+    values.update(_from_variables(environ))
+    return Settings(**_coerce(values))
+
+
+_settings: Optional[Settings] = None
+
+
+def get_settings() -> Settings:
+    """Return the process-wide settings, loading and validating them once."""
+    global _settings
+    if _settings is None:
+        settings = load_settings()
+        settings.validate()
+        _settings = settings
+    return _settings
+
+
+def reset_settings() -> None:
+    """Forget the cached settings so the next use reloads them."""
+    global _settings
+    _settings = None
+
+
+def resolve_settings(
+    config: Union[Settings, Mapping[str, Any], None] = None,
+) -> Settings:
+    """
+    Settings for one WeatherService instance.
+
+    Args:
+        config: None for the process-wide settings, a Settings object, or a
+            mapping of overrides (e.g. ``{"API_KEY": "..."}``) applied on
+            top of the files and environment
+
+    Returns:
+        Validated Settings
+    """
+    if config is None:
+        return get_settings()
+    if not isinstance(config, Settings):
+        config = load_settings().with_overrides(**config)
+    config.validate()
+    return config
+
+
+class _LazyConfig:
+    """Attribute access (``Config.API_KEY``) to the process-wide settings."""
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(get_settings(), name)
+
+    def validate(self) -> bool:
+        """Validate that required configuration is present."""
+        return get_settings().validate()
+
+    def __repr__(self) -> str:
+        return f"<Config {'unloaded' if _settings is None else 'loaded'}>"
+
+
+Config = _LazyConfig()
+
+
+CUSTOM_ICONS = {
+    "01d": "01d.png",
+    "01n": "01n.png",
+    "02d": "02d.png",
+    "02n": "02n.png",
+    "03d": "03d.png",
+    "03n": "03n.png",
+    "04d": "04d.png",
+    "04n": "04n.png",
+    "09d": "09d.png",
+    "09n": "09n.png",
+    "10d": "10d.png",
+    "10n": "10n.png",
+    "11d": "11d.png",
+    "11n": "11n.png",
+    "13d": "13d.png",
+    "13n": "13n.png",
+    "50d": "50d.png",
+    "50n": "50n.png",
+}
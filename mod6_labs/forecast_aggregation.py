@@ -0,0 +1,193 @@
+"""
+Daily aggregation of the 3-hourly forecast, in the city's local time.
+
+Works on plain arrays and has no Flet dependency, so it can be used from
+tests or the command line:
+
+    python forecast_aggregation.py forecast.json
+"""
+
+import json
+import sys
+from datetime import datetime, timezone
+from typing import Dict, List, Sequence
+
+SECONDS_PER_DAY = 86400
+
+# Icon families from calm to severe, used to break ties between conditions
+SEVERITY = {
+    "01": 0,  # clear
+    "02": 1,  # few clouds
+    "03": 2,  # scattered clouds
+    "04": 3,  # broken clouds
+    "50": 4,  # mist
+    "09": 5,  # shower rain
+    "10": 6,  # rain
+    "13": 7,  # snow
+    "11": 8,  # thunderstorm
+}
+
+
+class DailySummary:
+    """Aggregated forecast for one local calendar day."""
+
+    __slots__ = (
+        "day",
+        "temp_min",
+        "temp_max",
+        "temp_mean",
+        "pop",
+        "icon",
+        "description",
+        "condition",
+        "points",
+    )
+
+    def __init__(
+        self,
+        day,
+        temp_min,
+        temp_max,
+        temp_mean,
+        pop,
+        icon,
+        description,
+        condition,
+        points,
+    ):
+        self.day = day  # local days since the epoch
+        self.temp_min = temp_min
+        self.temp_max = temp_max
+        self.temp_mean = temp_mean
+        self.pop = pop  # highest probability of precipitation, 0..1
+        self.icon = icon
+        self.description = description
+        self.condition = condition
+        self.points = points  # number of 3-hour slots that fell on this day
+
+    @property
+    def date(self):
+        """Local calendar date of this day."""
+        return datetime.fromtimestamp(self.day * SECONDS_PER_DAY, tz=timezone.utc).date()
+
+    @property
+    def day_name(self) -> str:
+        """Short weekday name, e.g. 'Mon'."""
+        return self.date.strftime("%a")
+
+    def __repr__(self) -> str:
+        return (
+            f"DailySummary({self.date}, min={self.temp_min:.1f}, "
+            f"max={self.temp_max:.1f}, pop={self.pop:.0%}, icon={self.icon!r})"
+        )
+
+
+def aggregate_daily(
+    timestamps: Sequence[int],
+    temps: Sequence[float],
+    temp_mins: Sequence[float],
+    temp_maxs: Sequence[float],
+    pops: Sequence[float],
+    icons: Sequence[str],
+    descriptions: Sequence[str],
+    tz_offset: int = 0,
+) -> List[DailySummary]:
+    """
+    Bucket forecast points into local days and aggregate each day.
+
+    All columns are walked once, in order; each point updates its day's
+    running min/max/sum/pop and condition counts.
+
+    The dominant condition is the icon family (``"10"`` for rain, ...)
+    seen most often that day, ties going to the more severe code. The
+    icon and description shown for the day come from the slot of that
+    condition closest to local noon.
+
+    Args:
+        timestamps: Epoch seconds (UTC) of each 3-hour slot, ascending
+        temps, temp_mins, temp_maxs: Temperatures per slot
+        pops: Probability of precipitation per slot (0..1)
+        icons: OpenWeatherMap icon code per slot, e.g. ``"10d"``
+        descriptions: Weather description per slot
+        tz_offset: City's offset from UTC in seconds (``city.timezone``)
+
+    Returns:
+        One DailySummary per local day, in order
+    """
+    days: List[DailySummary] = []
+    n = len(timestamps)
+    i = 0
+
+    while i < n:
+        local = timestamps[i] + tz_offset
+        day = local // SECONDS_PER_DAY
+        noon = day * SECONDS_PER_DAY + SECONDS_PER_DAY // 2
+
+        t_min = temp_mins[i]
+        t_max = temp_maxs[i]
+        t_sum = 0.0
+        pop = 0.0
+        counts: Dict[str, int] = {}
+        # condition family -> (distance to noon, index of that slot)
+        nearest_noon: Dict[str, tuple] = {}
+        start = i
+
+        while i < n and (timestamps[i] + tz_offset) // SECONDS_PER_DAY == day:
+            if temp_mins[i] < t_min:
+                t_min = temp_mins[i]
+            if temp_maxs[i] > t_max:
+                t_max = temp_maxs[i]
+            t_sum += temps[i]
+            if pops[i] > pop:
+                pop = pops[i]
+
+            family = icons[i][:2]
+            counts[family] = counts.get(family, 0) + 1
+            distance = abs(timestamps[i] + tz_offset - noon)
+            if family not in nearest_noon or distance < nearest_noon[family][0]:
+                nearest_noon[family] = (distance, i)
+            i += 1
+
+        dominant = max(
+            counts, key=lambda family: (counts[family], SEVERITY.get(family, 0))
+        )
+        rep = nearest_noon[dominant][1]
+        days.append(
+            DailySummary(
+                day=day,
+                temp_min=t_min,
+                temp_max=t_max,
+                temp_mean=t_sum / (i - start),
+                pop=pop,
+                icon=icons[rep],
+                description=descriptions[rep],
+                condition=dominant,
+                points=i - start,
+            )
+        )
+
+    return days
+
+
+def main(argv: List[str]) -> int:
+    """Print the daily summary of a saved /forecast response."""
+    if len(argv) != 2:
+        print("usage: python forecast_aggregation.py FORECAST.json")
+        return 2
+
+    from forecast_model import Forecast
+
+    with open(argv[1], encoding="utf-8") as f:
+        forecast = Forecast.from_api(json.load(f))
+
+    print(f"{forecast.city} (UTC{forecast.timezone / 3600:+g}h)")
+    for day in forecast.daily:
+        print(
+            f"{day.date} {day.day_name}  {day.temp_min:6.1f} .. {day.temp_max:6.1f}"
+            f"  mean {day.temp_mean:6.1f}  pop {day.pop:4.0%}  {day.description}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
@@ -0,0 +1,123 @@
+"""Compact, typed representation of the 5-day / 3-hour forecast."""
+
+import sys
+from array import array
+from typing import Dict, List, Optional
+
+from forecast_aggregation import DailySummary, aggregate_daily
+
+
+class Forecast:
+    """
+    Forecast points stored column-wise.
+
+    Timestamps are epoch seconds in an int64 array and temperatures are
+    float arrays, so a 40-point forecast is a handful of small buffers
+    instead of 40 nested dicts. Icon codes and descriptions are interned;
+    the same few strings are shared by every cached forecast.
+    """
+
+    __slots__ = (
+        "city",
+        "timezone",
+        "timestamps",
+        "temps",
+        "temp_mins",
+        "temp_maxs",
+        "pops",
+        "icons",
+        "descriptions",
+        "_daily",
+    )
+
+    def __init__(self, city: str = "", timezone: int = 0):
+        self.city = city
+        self.timezone = timezone  # city's offset from UTC, in seconds
+        self.timestamps = array("q")
+        self.temps = array("d")
+        self.temp_mins = array("d")
+        self.temp_maxs = array("d")
+        self.pops = array("d")
+        self.icons: List[str] = []
+        self.descriptions: List[str] = []
+        self._daily: Optional[List[DailySummary]] = None
+
+    @classmethod
+    def from_api(cls, data: Dict) -> "Forecast":
+        """Parse an OpenWeatherMap /forecast response."""
+        city = data.get("city", {})
+        forecast = cls(
+            city=city.get("name", ""),
+            timezone=int(city.get("timezone", 0)),
+        )
+
+        for entry in data.get("list", []):
+            main = entry.get("main", {})
+            weather = (entry.get("weather") or [{}])[0]
+            temp = float(main.get("temp", 0))
+
+            forecast.timestamps.append(int(entry.get("dt", 0)))
+            forecast.temps.append(temp)
+            forecast.temp_mins.append(float(main.get("temp_min", temp)))
+            forecast.temp_maxs.append(float(main.get("temp_max", temp)))
+            forecast.pops.append(float(entry.get("pop", 0)))
+            forecast.icons.append(sys.intern(weather.get("icon", "01d")))
+            forecast.descriptions.append(
+                sys.intern(weather.get("description", "").title())
+            )
+
+        return forecast
+
+    def to_dict(self) -> Dict:
+        """Serialize back to an API-shaped dict holding only the fields we use."""
+        return {
+            "city": {"name": self.city, "timezone": self.timezone},
+            "list": [
+                {
+                    "dt": self.timestamps[i],
+                    "main": {
+                        "temp": self.temps[i],
+                        "temp_min": self.temp_mins[i],
+                        "temp_max": self.temp_maxs[i],
+                    },
+                    "weather": [
+                        {"icon": self.icons[i], "description": self.descriptions[i]}
+                    ],
+                    "pop": self.pops[i],
+                }
+                for i in range(len(self))
+            ],
+        }
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+    @property
+    def daily(self) -> List[DailySummary]:
+        """
+        Per-day summaries in the city's local time.
+
+        Computed on first access and kept with this forecast, so re-renders
+        (unit or theme toggles) never re-aggregate.
+        """
+        if self._daily is None:
+            self._daily = aggregate_daily(
+                self.timestamps,
+                self.temps,
+                self.temp_mins,
+                self.temp_maxs,
+                self.pops,
+                self.icons,
+                self.descriptions,
+                tz_offset=self.timezone,
+            )
+        return self._daily
+
+    def upcoming_days(self, count: int = 5) -> List[DailySummary]:
+        """Return the first ``count`` daily summaries."""
+        return self.daily[:count]
+
+
+def parse_forecast(data: Optional[Dict]) -> Optional[Forecast]:
+    """Parse a forecast payload, passing None (no forecast) through."""
+    return Forecast.from_api(data) if data else None
@@ -0,0 +1,134 @@
+"""Retry and circuit breaker policies for outgoing API requests."""
+
+import random
+import time
+from email.utils import parsedate_to_datetime
+from typing import Optional
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Parse a Retry-After header into seconds to wait.
+
+    The header is either a number of seconds or an HTTP date.
+    Returns None if the header is missing or malformed.
+    """
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, retry_at.timestamp() - time.time())
+
+
+class RetryPolicy:
+    """
+    Bounded retries with exponential backoff and full jitter.
+
+    The n-th retry waits a random time between 0 and
+    ``min(backoff_max, backoff_base * 2 ** n)`` seconds, which spreads out
+    clients that failed at the same moment.
+    """
+
+    def __init__(
+        self,
+        max_retries: int = 2,
+        backoff_base: float = 0.5,
+        backoff_max: float = 8.0,
+        jitter: bool = True,
+    ):
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.jitter = jitter
+
+    def next_delay(
+        self,
+        attempt: int,
+        retry_after: Optional[float] = None,
+    ) -> Optional[float]:
+        """
+        Return how long to wait before retry number ``attempt + 1``.
+
+        Args:
+            attempt: Number of retries already made (0 for the first failure)
+            retry_after: Server-requested wait from a Retry-After header
+
+        Returns:
+            Seconds to sleep, or None if the request should not be retried
+        """
+        if attempt >= self.max_retries:
+            return None
+
+        if retry_after is not None:
+            # Waiting longer than our own cap would just freeze the UI
+            return retry_after if retry_after <= self.backoff_max else None
+
+        ceiling = min(self.backoff_max, self.backoff_base * (2 ** attempt))
+        return random.uniform(0, ceiling) if self.jitter else ceiling
+
+
+class CircuitBreaker:
+    """
+    Fail fast while the upstream keeps failing.
+
+    After ``failure_threshold`` consecutive failures the circuit opens and
+    requests are refused for ``reset_timeout`` seconds. Then one trial
+    request is let through (half-open); success closes the circuit again,
+    failure re-opens it.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.failures = 0
+        self._opened_at = 0.0
+        self._trial_in_flight = False
+
+    def allow(self) -> bool:
+        """Return True if a request may be sent right now."""
+        if self.failure_threshold <= 0 or self.state == self.CLOSED:
+            return True
+
+        if self.state == self.OPEN:
+            if time.monotonic() - self._opened_at < self.reset_timeout:
+                return False
+            self.state = self.HALF_OPEN
+            self._trial_in_flight = False
+
+        # Half-open: only one trial request at a time
+        if self._trial_in_flight:
+            return False
+        self._trial_in_flight = True
+        return True
+
+    def record_success(self) -> None:
+        """Close the circuit after a successful request."""
+        self.state = self.CLOSED
+        self.failures = 0
+        self._trial_in_flight = False
+
+    def release(self) -> None:
+        """Give back a half-open trial slot without recording an outcome."""
+        self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        """Count a failed request, opening the circuit at the threshold."""
+        self.failures += 1
+        self._trial_in_flight = False
+        if self.failure_threshold <= 0:
+            return
+        if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+            self.state = self.OPEN
+            self._opened_at = time.monotonic()
@@ -0,0 +1,115 @@
+"""On-disk store of the last weather responses per city."""
+
+import json
+import sqlite3
+import time
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+
+@dataclass
+class Snapshot:
+    """A saved weather + forecast response for one city."""
+    city: str
+    weather: Dict
+    forecast: Optional[Dict]
+    fetched_at: float
+
+    @property
+    def age(self) -> float:
+        """Seconds since the snapshot was fetched."""
+        return time.time() - self.fetched_at
+
+
+class SnapshotStore:
+    """
+    SQLite-backed store holding one snapshot per city.
+
+    Reads and writes are single-row operations on a local file, so loading
+    the last snapshot on startup costs about as much as opening the file.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS snapshots (
+                city_key TEXT PRIMARY KEY,
+                city TEXT NOT NULL,
+                weather TEXT NOT NULL,
+                forecast TEXT,
+                fetched_at REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_snapshots_fetched_at "
+            "ON snapshots (fetched_at)"
+        )
+        self._conn.commit()
+
+    def save(
+        self,
+        city_key: str,
+        city: str,
+        weather: Dict,
+        forecast: Optional[Dict],
+    ) -> None:
+        """Insert or replace the snapshot for a city."""
+        self._conn.execute(
+            "INSERT OR REPLACE INTO snapshots "
+            "(city_key, city, weather, forecast, fetched_at) "
+            "VALUES (?, ?, ?, ?, ?)",
+            (
+                city_key,
+                city,
+                json.dumps(weather, separators=(",", ":")),
+                json.dumps(forecast, separators=(",", ":")) if forecast else None,
+                time.time(),
+            ),
+        )
+        self._conn.commit()
+
+    def load(self, city_key: Optional[str] = None) -> Optional[Snapshot]:
+        """
+        Load the snapshot for a city, or the most recent one if no key is given.
+
+        Returns:
+            The Snapshot, or None if nothing has been saved
+        """
+        if city_key is None:
+            row = self._conn.execute(
+                "SELECT city, weather, forecast, fetched_at FROM snapshots "
+                "ORDER BY fetched_at DESC LIMIT 1"
+            ).fetchone()
+        else:
+            row = self._conn.execute(
+                "SELECT city, weather, forecast, fetched_at FROM snapshots "
+                "WHERE city_key = ?",
+                (city_key,),
+            ).fetchone()
+
+        if row is None:
+            return None
+
+        city, weather, forecast, fetched_at = row
+        return Snapshot(
+            city=city,
+            weather=json.loads(weather),
+            forecast=json.loads(forecast) if forecast else None,
+            fetched_at=fetched_at,
+        )
+
+    def prune(self, max_age: float) -> int:
+        """Delete snapshots older than max_age seconds. Returns the number removed."""
+        cursor = self._conn.execute(
+            "DELETE FROM snapshots WHERE fetched_at < ?",
+            (time.time() - max_age,),
+        )
+        self._conn.commit()
+        return cursor.rowcount
+
+    def close(self) -> None:
+        """Close the underlying database connection."""
+        self._conn.close()
@@ -0,0 +1,230 @@
+# test_replay.py
+"""
+Offline tests for every outcome of WeatherService.get_weather.
+
+Requests are answered by replay.ReplayTransport from the recorded
+fixtures, so no API key or network is needed:
+
+    python -m pytest -q test_replay.py
+"""
+
+import asyncio
+import time
+
+import pytest
+
+from replay import Fault, Replay, ReplayServer, ReplayTransport
+from weather_service import WeatherService, WeatherServiceError
+
+
+def make_service(replay, **overrides):
+    """Build a WeatherService on the replay with fast, unthrottled retries."""
+    settings = {
+        "API_KEY": "test-key",
+        "SNAPSHOT_DB_PATH": "",
+        "RATE_LIMIT_PER_MINUTE": 0,
+        "MAX_RETRIES": 2,
+        "RETRY_BACKOFF_BASE": 0.001,
+        "RETRY_BACKOFF_MAX": 0.5,
+        **overrides,
+    }
+    return WeatherService(config=settings, transport=ReplayTransport(replay))
+
+
+def get_weather(replay, city="London", **overrides):
+    """Run one get_weather call against the replay."""
+    async def run():
+        async with make_service(replay, **overrides) as service:
+            return await service.get_weather(city)
+
+    return asyncio.run(run())
+
+
+def expect_error(replay, match, city="London", **overrides):
+    with pytest.raises(WeatherServiceError, match=match):
+        get_weather(replay, city, **overrides)
+
+
+def test_success_returns_recorded_response():
+    replay = Replay()
+    data = get_weather(replay, "Paris")
+    assert data["name"] == "Paris"
+    assert data["main"]["temp"] == 14.2
+    assert replay.requests == 1
+
+
+def test_repeated_lookup_is_served_from_cache():
+    replay = Replay()
+
+    async def run():
+        async with make_service(replay) as service:
+            first = await service.get_weather("London")
+            second = await service.get_weather("  london ")
+            return first, second, service.cache_stats()
+
+    first, second, stats = asyncio.run(run())
+    assert first is second
+    assert replay.requests == 1
+    assert stats["hits"] == 1
+
+
+def test_concurrent_lookups_share_one_request():
+    replay = Replay(latency=0.05)
+
+    async def run():
+        async with make_service(replay) as service:
+            return await asyncio.gather(*(service.get_weather("London") for _ in range(10)))
+
+    results = asyncio.run(run())
+    assert len(results) == 10
+    assert replay.requests == 1
+
+
+def test_cancelled_waiter_leaves_shared_request_running():
+    replay = Replay(latency=0.05)
+
+    async def run():
+        async with make_service(replay) as service:
+            first = asyncio.create_task(service.get_weather("London"))
+            second = asyncio.create_task(service.get_weather("London"))
+            await asyncio.sleep(0.01)
+            first.cancel()
+            data = await second
+            with pytest.raises(asyncio.CancelledError):
+                await first
+            return data, await service.get_weather("London")
+
+    data, cached = asyncio.run(run())
+    assert data["name"] == "London"
+    assert cached is data
+    assert replay.requests == 1
+
+
+def test_shared_failure_reaches_every_waiter_and_is_not_cached():
+    replay = Replay(latency=0.05).fail_next(Fault(status=418))
+
+    async def run():
+        async with make_service(replay) as service:
+            results = await asyncio.gather(
+                *(service.get_weather("London") for _ in range(5)), return_exceptions=True
+            )
+            return results, await service.get_weather("London")
+
+    results, retried = asyncio.run(run())
+    assert all(isinstance(r, WeatherServiceError) for r in results)
+    assert retried["name"] == "London"
+    assert replay.requests == 2
+
+
+def test_empty_city_is_rejected_without_a_request():
+    replay = Replay()
+    expect_error(replay, "cannot be empty", city="")
+    assert replay.requests == 0
+
+
+def test_unknown_city_is_not_retried():
+    replay = Replay()
+    expect_error(replay, "City 'Atlantis' not found", city="Atlantis")
+    assert replay.requests == 1
+
+
+def test_invalid_api_key():
+    replay = Replay()
+    expect_error(replay, "Invalid API key", API_KEY="invalid")
+    assert replay.requests == 1
+
+
+def test_unexpected_status_is_reported():
+    replay = Replay().fail_next(Fault(status=418))
+    expect_error(replay, "Error fetching weather data: 418")
+    assert replay.requests == 1
+
+
+def test_server_error_is_retried_until_success():
+    replay = Replay().fail_next(Fault(status=500), Fault(status=503))
+    assert get_weather(replay)["name"] == "London"
+    assert replay.requests == 3
+
+
+def test_server_error_after_all_retries():
+    replay = Replay().fail_next(*[Fault(status=502)] * 3)
+    expect_error(replay, "currently unavailable")
+    assert replay.requests == 3
+
+
+def test_rate_limited_response_honors_retry_after():
+    replay = Replay().fail_next(Fault(status=429, headers={"Retry-After": "0.2"}))
+    started = time.monotonic()
+    assert get_weather(replay)["name"] == "London"
+    assert time.monotonic() - started >= 0.2
+    assert replay.requests == 2
+
+
+def test_rate_limited_with_long_retry_after_fails_fast():
+    replay = Replay().fail_next(Fault(status=429, headers={"Retry-After": "120"}))
+    expect_error(replay, "Too many requests")
+    assert replay.requests == 1
+
+
+def test_timeout_after_all_retries():
+    replay = Replay().fail_next(*[Fault(error="timeout")] * 3)
+    expect_error(replay, "timed out")
+    assert replay.requests == 3
+
+
+def test_network_error_is_retried_until_success():
+    replay = Replay().fail_next(Fault(error="network"))
+    assert get_weather(replay)["name"] == "London"
+    assert replay.requests == 2
+
+
+def test_network_error_after_all_retries():
+    replay = Replay().fail_next(*[Fault(error="network")] * 3)
+    expect_error(replay, "Network error")
+
+
+def test_protocol_error_is_not_retried():
+    replay = Replay().fail_next(Fault(error="protocol"))
+    expect_error(replay, "HTTP error occurred")
+    assert replay.requests == 1
+
+
+def test_malformed_json():
+    replay = Replay().fail_next(Fault(body=b"{not json"))
+    expect_error(replay, "unexpected error")
+
+
+def test_open_circuit_fails_without_a_request():
+    replay = Replay(error_rate=1.0)
+
+    async def run():
+        async with make_service(replay, MAX_RETRIES=0, CIRCUIT_FAILURE_THRESHOLD=2) as service:
+            for _ in range(2):
+                with pytest.raises(WeatherServiceError, match="currently unavailable"):
+                    await service.get_weather("London")
+            with pytest.raises(WeatherServiceError, match="temporarily unavailable"):
+                await service.get_weather("London")
+
+    asyncio.run(run())
+    assert replay.requests == 2
+
+
+def test_replay_server_serves_fixtures_over_http():
+    with ReplayServer(Replay()) as server:
+        async def run():
+            settings = {
+                "API_KEY": "test-key",
+                "SNAPSHOT_DB_PATH": "",
+                "RATE_LIMIT_PER_MINUTE": 0,
+                **server.settings(),
+            }
+            async with WeatherService(config=settings) as service:
+                bundle = await service.get_weather_bundle("Oslo")
+            return bundle
+
+        bundle = asyncio.run(run())
+
+    assert bundle.ok
+    assert bundle.weather["name"] == "Oslo"
+    assert bundle.forecast.city == "Oslo"
+    assert len(bundle.forecast) == 40
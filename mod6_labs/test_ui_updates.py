@@ -0,0 +1,85 @@
+# test_ui_updates.py
+"""
+Tests for UpdateScheduler's coalescing and update counts, against a
+stand-in page (no Flet session needed):
+
+    python -m pytest -q test_ui_updates.py
+"""
+
+import asyncio
+import logging
+
+from ui_updates import UpdateScheduler
+
+
+class FakePage:
+    """Counts update() calls; has a loop attribute like ft.Page."""
+
+    def __init__(self, loop=None):
+        self.loop = loop
+        self.updates = 0
+
+    def update(self):
+        self.updates += 1
+
+
+def test_requests_in_one_tick_make_one_update():
+    async def scenario():
+        page = FakePage(asyncio.get_running_loop())
+        scheduler = UpdateScheduler(page)
+        for _ in range(5):
+            scheduler.request()
+        before_tick = page.updates
+        await asyncio.sleep(0)
+        after_first_tick = page.updates
+
+        scheduler.request()
+        scheduler.request()
+        await asyncio.sleep(0)
+        return before_tick, after_first_tick, page.updates, scheduler.total_updates
+
+    assert asyncio.run(scenario()) == (0, 1, 2, 2)
+
+
+def test_flush_sends_at_once_and_the_scheduled_sync_is_skipped():
+    async def scenario():
+        page = FakePage(asyncio.get_running_loop())
+        scheduler = UpdateScheduler(page)
+        scheduler.request()
+        scheduler.flush()
+        flushed = page.updates
+        await asyncio.sleep(0)
+        return flushed, page.updates
+
+    assert asyncio.run(scenario()) == (1, 1)
+
+
+def test_without_a_running_loop_requests_sync_immediately():
+    page = FakePage()
+    scheduler = UpdateScheduler(page)
+    scheduler.request()
+    scheduler.request()
+    assert page.updates == 2
+
+
+def test_updates_are_counted_and_logged_per_action(caplog):
+    page = FakePage()
+    scheduler = UpdateScheduler(page, history_size=2)
+    with caplog.at_level(logging.DEBUG, logger="ui_updates"):
+        for name, updates in (("search", 3), ("toggle_theme", 1), ("toggle_units", 2)):
+            scheduler.begin_action(name)
+            for _ in range(updates):
+                scheduler.flush()
+        scheduler.begin_action("search")
+
+    assert scheduler.stats() == {
+        "total_updates": 6,
+        "current_action": "search",
+        "current_action_updates": 0,
+        "recent_actions": [("toggle_theme", 1), ("toggle_units", 2), ("search", 0)],
+    }
+    assert [r.getMessage() for r in caplog.records] == [
+        "Page updates for search: 3",
+        "Page updates for toggle_theme: 1",
+        "Page updates for toggle_units: 2",
+    ]
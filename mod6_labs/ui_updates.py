@@ -0,0 +1,101 @@
+"""Batching of Flet page updates."""
+
+import asyncio
+import logging
+import threading
+from collections import deque
+from typing import Dict, List, Optional, Tuple
+
+import flet as ft
+
+logger = logging.getLogger(__name__)
+
+
+class UpdateScheduler:
+    """
+    Coalesce page.update() calls into one sync per event-loop tick.
+
+    Handlers call request() whenever they change controls. The first
+    request in a tick schedules a single flush on the page's event loop;
+    later requests in the same tick just ride along. Use flush() when the
+    change must reach the client right now, e.g. before an animation.
+
+    Syncs are counted per user action (begin_action). Each finished
+    action's count is logged at DEBUG level, and stats() returns them.
+    """
+
+    def __init__(self, page: ft.Page, history_size: int = 50):
+        self.page = page
+        self._lock = threading.Lock()
+        self._dirty = False
+        self._scheduled = False
+        self.total_updates = 0
+        self.action: Optional[str] = None
+        self.action_updates = 0
+        self.history: "deque[Tuple[str, int]]" = deque(maxlen=history_size)
+
+    def request(self) -> None:
+        """Mark the page dirty; it will be synced once on the next tick."""
+        with self._lock:
+            self._dirty = True
+            if self._scheduled:
+                return
+            self._scheduled = True
+
+        loop = self._loop()
+        if loop is None:
+            # No running event loop to defer to: sync right away
+            self._run_scheduled()
+        else:
+            loop.call_soon_threadsafe(self._run_scheduled)
+
+    def flush(self) -> None:
+        """Sync pending changes to the client immediately."""
+        with self._lock:
+            self._dirty = False
+        self._send()
+
+    def begin_action(self, name: str) -> None:
+        """Start counting updates for a new user action."""
+        with self._lock:
+            finished = None
+            if self.action is not None:
+                finished = (self.action, self.action_updates)
+                self.history.append(finished)
+            self.action = name
+            self.action_updates = 0
+        if finished is not None:
+            logger.debug("Page updates for %s: %d", *finished)
+
+    def stats(self) -> Dict[str, object]:
+        """Return update counters, including updates per recent action."""
+        with self._lock:
+            recent: List[Tuple[str, int]] = list(self.history)
+            if self.action is not None:
+                recent.append((self.action, self.action_updates))
+            return {
+                "total_updates": self.total_updates,
+                "current_action": self.action,
+                "current_action_updates": self.action_updates,
+                "recent_actions": recent,
+            }
+
+    def _loop(self) -> Optional[asyncio.AbstractEventLoop]:
+        loop = getattr(self.page, "loop", None)
+        if isinstance(loop, asyncio.AbstractEventLoop) and loop.is_running():
+            return loop
+        return None
+
+    def _run_scheduled(self) -> None:
+        with self._lock:
+            self._scheduled = False
+            if not self._dirty:
+                return  # an explicit flush() already sent it
+            self._dirty = False
+        self._send()
+
+    def _send(self) -> None:
+        with self._lock:
+            self.total_updates += 1
+            self.action_updates += 1
+        self.page.update()
@@ -0,0 +1,226 @@
+# benchmark.py
+"""
+Offline latency benchmark for WeatherService.
+
+Every lookup goes to a local ReplayServer serving the recorded fixtures
+with a simulated network latency, so results are repeatable and need no
+API key:
+
+    python benchmark.py
+    python benchmark.py --requests 400 --latency 0.05 --error-rate 0.02
+    python benchmark.py --json results.json
+    python benchmark.py --baseline results.json   # exit 1 on a p95 regression
+
+Each scenario (single, concurrent, batch) runs with and without the
+response cache and with and without connection pooling, and reports
+p50/p95/p99 latency and throughput.
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import sys
+import time
+from typing import Dict, List, Optional, Sequence
+
+from replay import Replay, ReplayServer
+from weather_service import WeatherService, WeatherServiceError
+
+SCENARIOS = ("single", "concurrent", "batch")
+
+# Mode name -> config overrides
+MODES = {
+    "cache+pool": {},
+    "cache": {"MAX_KEEPALIVE_CONNECTIONS": 0},
+    "pool": {"CACHE_MAX_ENTRIES": 0},
+    "none": {"CACHE_MAX_ENTRIES": 0, "MAX_KEEPALIVE_CONNECTIONS": 0},
+}
+
+
+def percentile(sorted_samples: Sequence[float], pct: float) -> float:
+    """Nearest-rank percentile of already sorted samples."""
+    if not sorted_samples:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100 * len(sorted_samples)))
+    return sorted_samples[rank - 1]
+
+
+class Run:
+    """Latency samples and counters for one scenario/mode combination."""
+
+    def __init__(self, scenario: str, mode: str):
+        self.scenario = scenario
+        self.mode = mode
+        self.samples: List[float] = []
+        self.lookups = 0
+        self.errors = 0
+        self.elapsed = 0.0
+        self.upstream_requests = 0
+
+    def summary(self) -> Dict[str, object]:
+        samples = sorted(self.samples)
+        return {
+            "scenario": self.scenario,
+            "mode": self.mode,
+            "lookups": self.lookups,
+            "errors": self.errors,
+            "upstream_requests": self.upstream_requests,
+            "p50_ms": round(percentile(samples, 50) * 1000, 2),
+            "p95_ms": round(percentile(samples, 95) * 1000, 2),
+            "p99_ms": round(percentile(samples, 99) * 1000, 2),
+            "throughput": round(self.lookups / self.elapsed, 1) if self.elapsed else 0.0,
+        }
+
+
+async def _timed_lookup(service: WeatherService, city: str, run: Run) -> None:
+    started = time.perf_counter()
+    try:
+        await service.get_weather(city)
+    except WeatherServiceError:
+        run.errors += 1
+    run.samples.append(time.perf_counter() - started)
+    run.lookups += 1
+
+
+async def _single(service: WeatherService, cities: List[str], run: Run, args) -> None:
+    for city in cities:
+        await _timed_lookup(service, city, run)
+
+
+async def _concurrent(service: WeatherService, cities: List[str], run: Run, args) -> None:
+    semaphore = asyncio.Semaphore(args.concurrency)
+
+    async def lookup(city: str) -> None:
+        async with semaphore:
+            await _timed_lookup(service, city, run)
+
+    await asyncio.gather(*(lookup(city) for city in cities))
+
+
+async def _batch(service: WeatherService, cities: List[str], run: Run, args) -> None:
+    # One sample per get_weather_many call; throughput still counts cities
+    for start in range(0, len(cities), args.batch_size):
+        chunk = cities[start:start + args.batch_size]
+        started = time.perf_counter()
+        results = await service.get_weather_many(chunk, concurrency=args.concurrency)
+        run.samples.append(time.perf_counter() - started)
+        run.lookups += len(chunk)
+        run.errors += sum(1 for result in results if not result.ok)
+
+
+RUNNERS = {"single": _single, "concurrent": _concurrent, "batch": _batch}
+
+
+async def run_scenario(scenario: str, mode: str, server: ReplayServer, args) -> Run:
+    """Run one scenario against a fresh service (empty cache, cold pool)."""
+    settings = {
+        "API_KEY": "benchmark",
+        "SNAPSHOT_DB_PATH": "",
+        "RATE_LIMIT_PER_MINUTE": 0,
+        "RETRY_BACKOFF_BASE": args.backoff,
+        "BATCH_CONCURRENCY": args.concurrency,
+        "MAX_CONNECTIONS": max(10, args.concurrency),
+        **server.settings(),
+        **MODES[mode],
+    }
+    cities = [f"City{i % args.distinct}" for i in range(args.requests)]
+    run = Run(scenario, mode)
+    requests_before = server.replay.requests
+
+    async with WeatherService(config=settings) as service:
+        started = time.perf_counter()
+        await RUNNERS[scenario](service, cities, run, args)
+        run.elapsed = time.perf_counter() - started
+
+    run.upstream_requests = server.replay.requests - requests_before
+    return run
+
+
+def print_table(results: List[Dict[str, object]]) -> None:
+    header = (
+        f"{'scenario':<11}{'mode':<11}{'lookups':>8}{'errors':>7}{'upstream':>9}"
+        f"{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'lookups/s':>11}"
+    )
+    print(header)
+    print("-" * len(header))
+    for r in results:
+        print(
+            f"{r['scenario']:<11}{r['mode']:<11}{r['lookups']:>8}{r['errors']:>7}"
+            f"{r['upstream_requests']:>9}{r['p50_ms']:>9.2f}{r['p95_ms']:>9.2f}"
+            f"{r['p99_ms']:>9.2f}{r['throughput']:>11.1f}"
+        )
+
+
+def find_regressions(
+    results: List[Dict[str, object]],
+    baseline: List[Dict[str, object]],
+    tolerance: float,
+) -> List[str]:
+    """Describe every run whose p95 grew by more than ``tolerance`` (a fraction)."""
+    previous = {(r["scenario"], r["mode"]): r for r in baseline}
+    regressions = []
+    for r in results:
+        before = previous.get((r["scenario"], r["mode"]))
+        if before and before["p95_ms"] and r["p95_ms"] > before["p95_ms"] * (1 + tolerance):
+            regressions.append(
+                f"{r['scenario']}/{r['mode']}: p95 {before['p95_ms']} -> {r['p95_ms']} ms"
+            )
+    return regressions
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--requests", type=int, default=200, help="lookups per run")
+    parser.add_argument("--distinct", type=int, default=20, help="distinct cities")
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--batch-size", type=int, default=20)
+    parser.add_argument("--latency", type=float, default=0.02, help="server latency (s)")
+    parser.add_argument("--jitter", type=float, default=0.005, help="extra random latency (s)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of 503s")
+    parser.add_argument("--backoff", type=float, default=0.05, help="retry backoff base (s)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--scenarios", nargs="+", choices=SCENARIOS, default=list(SCENARIOS))
+    parser.add_argument("--modes", nargs="+", choices=list(MODES), default=list(MODES))
+    parser.add_argument("--json", metavar="FILE", help="write results as JSON")
+    parser.add_argument("--baseline", metavar="FILE", help="compare with an earlier --json")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed p95 growth")
+    return parser.parse_args(argv)
+
+
+async def run_all(args: argparse.Namespace) -> List[Dict[str, object]]:
+    replay = Replay(
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        seed=args.seed,
+    )
+    results = []
+    with ReplayServer(replay) as server:
+        for scenario in args.scenarios:
+            for mode in args.modes:
+                run = await run_scenario(scenario, mode, server, args)
+                results.append(run.summary())
+    return results
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = parse_args(argv)
+    results = asyncio.run(run_all(args))
+    print_table(results)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            regressions = find_regressions(results, json.load(f), args.tolerance)
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
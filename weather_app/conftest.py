@@ -0,0 +1,19 @@
+# conftest.py
+"""Let pytest run the script-style async tests in test_weather_service.py."""
+
+import asyncio
+import inspect
+
+import pytest
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_pyfunc_call(pyfuncitem):
+    """Run ``async def`` tests to completion; a False result is a failure."""
+    if not inspect.iscoroutinefunction(pyfuncitem.obj):
+        return None
+
+    args = {name: pyfuncitem.funcargs[name] for name in pyfuncitem._fixtureinfo.argnames}
+    result = asyncio.run(pyfuncitem.obj(**args))
+    assert result is not False, f"{pyfuncitem.name} reported a failure"
+    return True
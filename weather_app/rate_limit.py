@@ -0,0 +1,160 @@
+"""Client-side rate limiting for the OpenWeatherMap quota."""
+
+import asyncio
+import sqlite3
+import time
+from typing import Optional
+
+
+class TokenBucket:
+    """
+    Async token bucket.
+
+    Tokens refill continuously at ``rate`` per second up to ``burst``. Each
+    request takes one token; when the bucket is empty callers wait in line
+    (first come, first served) instead of getting an error.
+    """
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = max(1, burst)
+        self._tokens = float(self.burst)
+        self._updated_at = time.monotonic()
+        self._lock: Optional[asyncio.Lock] = None
+
+    @classmethod
+    def per_minute(cls, calls: float, burst: int) -> "TokenBucket":
+        """Build a bucket from a calls-per-minute quota."""
+        return cls(rate=calls / 60.0, burst=burst)
+
+    def _take(self) -> float:
+        """
+        Try to take one token.
+
+        Returns:
+            0 if a token was taken, otherwise seconds until one is available
+        """
+        now = time.monotonic()
+        self._tokens = min(
+            self.burst, self._tokens + (now - self._updated_at) * self.rate
+        )
+        self._updated_at = now
+
+        if self._tokens >= 1:
+            self._tokens -= 1
+            return 0.0
+        return (1 - self._tokens) / self.rate
+
+    async def _next_wait(self) -> float:
+        """Take a token if possible; see _take."""
+        return self._take()
+
+    def open(self) -> None:
+        """Acquire any resources the bucket needs (none for an in-memory bucket)."""
+
+    def close(self) -> None:
+        """Release the bucket's resources; it reopens them on next use."""
+
+    async def acquire(self) -> None:
+        """Wait until a request may be sent. A rate of 0 disables limiting."""
+        if self.rate <= 0:
+            return
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+
+        # Holding the lock while sleeping keeps waiters in arrival order
+        async with self._lock:
+            while True:
+                wait = await self._next_wait()
+                if wait <= 0:
+                    return
+                await asyncio.sleep(wait)
+
+
+class SharedTokenBucket(TokenBucket):
+    """
+    Token bucket whose state lives in a SQLite file.
+
+    Every app instance on the host that points at the same file draws from
+    one budget. Each take is a short write transaction, so instances
+    serialize on the file lock rather than on each other. Waiting for that
+    lock can take seconds under contention, so takes run on a worker
+    thread and never block the event loop.
+    """
+
+    def __init__(self, rate: float, burst: int, path: str, name: str = "openweathermap"):
+        super().__init__(rate, burst)
+        self.path = path
+        self.name = name
+        self._conn: Optional[sqlite3.Connection] = None
+
+    def open(self) -> None:
+        """Open the database connection (done on first use if not called)."""
+        if self._conn is not None:
+            return
+        conn = sqlite3.connect(
+            self.path, timeout=5, isolation_level=None, check_same_thread=False
+        )
+        try:
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS token_buckets (
+                    name TEXT PRIMARY KEY,
+                    tokens REAL NOT NULL,
+                    updated_at REAL NOT NULL
+                )
+                """
+            )
+        except sqlite3.Error:
+            conn.close()
+            raise
+        self._conn = conn
+
+    @classmethod
+    def per_minute(cls, calls: float, burst: int, path: str) -> "SharedTokenBucket":
+        """Build a shared bucket from a calls-per-minute quota."""
+        return cls(rate=calls / 60.0, burst=burst, path=path)
+
+    async def _next_wait(self) -> float:
+        return await asyncio.to_thread(self._take)
+
+    def _take(self) -> float:
+        # Wall-clock time, since monotonic clocks are not shared between processes
+        now = time.time()
+        try:
+            self.open()
+            conn = self._conn
+            conn.execute("BEGIN IMMEDIATE")
+        except sqlite3.Error:
+            return 0.0  # shared file unusable: don't block requests on it
+        try:
+            row = conn.execute(
+                "SELECT tokens, updated_at FROM token_buckets WHERE name = ?",
+                (self.name,),
+            ).fetchone()
+            tokens, updated_at = row if row else (float(self.burst), now)
+            tokens = min(self.burst, tokens + max(0.0, now - updated_at) * self.rate)
+
+            if tokens >= 1:
+                tokens -= 1
+                wait = 0.0
+            else:
+                wait = (1 - tokens) / self.rate
+
+            conn.execute(
+                "INSERT OR REPLACE INTO token_buckets (name, tokens, updated_at) "
+                "VALUES (?, ?, ?)",
+                (self.name, tokens, now),
+            )
+            conn.execute("COMMIT")
+        except sqlite3.Error:
+            if conn.in_transaction:
+                conn.rollback()
+            return 0.0
+        return wait
+
+    def close(self) -> None:
+        """Close the database connection; the next take reopens it."""
+        if self._conn is not None:
+            conn, self._conn = self._conn, None
+            conn.close()
@@ -0,0 +1,277 @@
+"""
+Offline OpenWeatherMap replay for tests and benchmarks.
+
+Serves the recorded responses in ``fixtures/`` with configurable latency
+and injected failures. One Replay (the routing and fault logic) can be put
+behind either front end:
+
+- ReplayTransport: an in-process httpx transport, no sockets at all. Pass
+  it as ``WeatherService(transport=...)``; used by the tests.
+- ReplayServer: a real HTTP server on localhost, so connection pooling and
+  keep-alive behave as they do against the API; used by the benchmark.
+"""
+
+import asyncio
+import json
+import os
+import random
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Iterable, Optional, Tuple
+from urllib.parse import parse_qsl, urlparse
+
+import httpx
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+_fixtures: Dict[str, Any] = {}
+
+
+def load_fixture(name: str) -> Any:
+    """Load (once) a recorded JSON response from the fixtures directory."""
+    if name not in _fixtures:
+        with open(os.path.join(FIXTURES_DIR, f"{name}.json"), encoding="utf-8") as f:
+            _fixtures[name] = json.load(f)
+    return _fixtures[name]
+
+
+@dataclass
+class Fault:
+    """
+    One injected failure, served instead of the recorded response.
+
+    Attributes:
+        status: HTTP status to answer with (0 keeps the recorded response)
+        headers: Extra response headers, e.g. ``{"Retry-After": "1"}``
+        body: Raw body to send instead of the fixture (e.g. broken JSON)
+        error: "timeout", "network" or "protocol" to fail the transport
+        delay: Extra seconds to wait before answering
+    """
+
+    status: int = 0
+    headers: Dict[str, str] = field(default_factory=dict)
+    body: Optional[bytes] = None
+    error: Optional[str] = None
+    delay: float = 0.0
+
+
+@dataclass
+class ReplayResponse:
+    """What the replay decided to answer for one request."""
+
+    status: int
+    headers: Dict[str, str]
+    body: bytes
+    delay: float = 0.0
+    error: Optional[str] = None
+
+
+class Replay:
+    """
+    Routes OpenWeatherMap requests to recorded fixtures.
+
+    ``/weather`` and ``/forecast`` answer with the recorded London
+    responses renamed to the requested city. Cities in ``unknown_cities``
+    get the recorded 404 and keys in ``invalid_keys`` the recorded 401.
+    Queued faults (fail_next) are served first, in order; after that each
+    request fails with ``error_status`` with probability ``error_rate``.
+    """
+
+    def __init__(
+        self,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        error_status: int = 503,
+        unknown_cities: Iterable[str] = ("Atlantis",),
+        invalid_keys: Iterable[str] = ("invalid",),
+        seed: int = 0,
+    ):
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.unknown_cities = {city.lower() for city in unknown_cities}
+        self.invalid_keys = set(invalid_keys)
+        self.requests = 0
+        self.faults_served = 0
+        self._faults: "deque[Fault]" = deque()
+        self._bodies: Dict[Tuple[str, str], bytes] = {}
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def fail_next(self, *faults: Fault) -> "Replay":
+        """Queue faults for the next requests, one fault per request."""
+        with self._lock:
+            self._faults.extend(faults)
+        return self
+
+    def respond(self, path: str, params: Dict[str, str]) -> ReplayResponse:
+        """Decide the response for one request."""
+        with self._lock:
+            self.requests += 1
+            fault = self._faults.popleft() if self._faults else None
+            if fault is None and self.error_rate and self._random.random() < self.error_rate:
+                fault = Fault(status=self.error_status)
+            delay = self.latency
+            if self.jitter:
+                delay += self._random.uniform(0, self.jitter)
+            if fault is not None:
+                self.faults_served += 1
+
+        if fault is not None:
+            delay += fault.delay
+            if fault.error:
+                return ReplayResponse(0, {}, b"", delay, fault.error)
+            if fault.status:
+                response = self._error(fault.status)
+            else:
+                response = self._route(path, params)
+            response.headers.update(fault.headers)
+            if fault.body is not None:
+                response.body = fault.body
+            response.delay = delay
+            return response
+
+        response = self._route(path, params)
+        response.delay = delay
+        return response
+
+    def _route(self, path: str, params: Dict[str, str]) -> ReplayResponse:
+        if params.get("appid") in self.invalid_keys:
+            return self._error(401)
+
+        city = params.get("q", "")
+        if city.lower() in self.unknown_cities:
+            return self._error(404)
+
+        for kind in ("weather", "forecast"):
+            if path.rstrip("/").endswith(f"/{kind}"):
+                return ReplayResponse(200, self._json_headers(), self._body(kind, city))
+        return self._error(404)
+
+    def _body(self, kind: str, city: str) -> bytes:
+        """Serialized fixture for a city, built once per (kind, city)."""
+        key = (kind, city)
+        body = self._bodies.get(key)
+        if body is None:
+            data = dict(load_fixture(kind))
+            if city:
+                if kind == "weather":
+                    data["name"] = city
+                else:
+                    data["city"] = {**data["city"], "name": city}
+            body = json.dumps(data).encode()
+            self._bodies[key] = body
+        return body
+
+    def _error(self, status: int) -> ReplayResponse:
+        recorded = load_fixture("errors").get(str(status), {"cod": status, "message": "error"})
+        return ReplayResponse(status, self._json_headers(), json.dumps(recorded).encode())
+
+    @staticmethod
+    def _json_headers() -> Dict[str, str]:
+        return {"Content-Type": "application/json; charset=utf-8"}
+
+
+class ReplayTransport(httpx.AsyncBaseTransport):
+    """In-process httpx transport answering from a Replay."""
+
+    def __init__(self, replay: Optional[Replay] = None):
+        self.replay = replay or Replay()
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        response = self.replay.respond(request.url.path, dict(request.url.params))
+        if response.delay:
+            await asyncio.sleep(response.delay)
+
+        if response.error == "timeout":
+            raise httpx.ReadTimeout("Replayed timeout", request=request)
+        if response.error == "network":
+            raise httpx.ConnectError("Replayed connection failure", request=request)
+        if response.error == "protocol":
+            raise httpx.RemoteProtocolError("Replayed protocol error", request=request)
+
+        return httpx.Response(
+            response.status,
+            headers=response.headers,
+            content=response.body,
+            request=request,
+        )
+
+
+class ReplayServer:
+    """
+    Local HTTP/1.1 server answering from a Replay.
+
+    Keep-alive is supported, so a pooled client reuses connections exactly
+    as it would against the real API. Transport faults are approximated:
+    "timeout" sleeps for ``timeout_delay`` and "network"/"protocol" drop
+    the connection without answering.
+    """
+
+    def __init__(self, replay: Optional[Replay] = None, timeout_delay: float = 30.0):
+        self.replay = replay or Replay()
+        self.timeout_delay = timeout_delay
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # Headers and body go out as separate writes; without this, Nagle
+            # plus delayed ACKs add ~40 ms to every keep-alive response
+            disable_nagle_algorithm = True
+
+            def do_GET(self):
+                url = urlparse(self.path)
+                response = server.replay.respond(url.path, dict(parse_qsl(url.query)))
+                delay = response.delay
+                if response.error == "timeout":
+                    delay += server.timeout_delay
+                if delay:
+                    time.sleep(delay)
+                if response.error:
+                    self.close_connection = True
+                    return
+
+                self.send_response(response.status)
+                for name, value in response.headers.items():
+                    self.send_header(name, value)
+                self.send_header("Content-Length", str(len(response.body)))
+                self.end_headers()
+                self.wfile.write(response.body)
+
+            def log_message(self, *args):
+                pass
+
+        class Server(ThreadingHTTPServer):
+            request_queue_size = 128  # concurrent unpooled connects overflow the default 5
+
+        self._server = Server(("127.0.0.1", 0), Handler)
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self._server.server_port}"
+
+    def settings(self) -> Dict[str, str]:
+        """Config overrides pointing a WeatherService at this server."""
+        return {
+            "BASE_URL": f"{self.url}/data/2.5/weather",
+            "FORECAST_URL": f"{self.url}/data/2.5/forecast",
+        }
+
+    def stop(self) -> None:
+        """Shut the server down."""
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> "ReplayServer":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
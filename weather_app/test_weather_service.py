@@ -1,62 +1,613 @@
-# test_weather_service.py
-"""Simple tests for weather service."""
-
-import asyncio
-from weather_service import WeatherService, WeatherServiceError
-
-
-async def test_valid_city():
-    """Test fetching weather for a valid city."""
-    service = WeatherService()
-    try:
-        data = await service.get_weather("London")
-        print(f"✅ Successfully fetched weather for {data['name']}")
-        print(f"   Temperature: {data['main']['temp']}°C")
-        return True
-    except Exception as e:
-        print(f"❌ Test failed: {e}")
-        return False
-
-
-async def test_invalid_city():
-    """Test handling of invalid city."""
-    service = WeatherService()
-    try:
-        await service.get_weather("InvalidCityXYZ123")
-        print("❌ Should have raised an error")
-        return False
-    except WeatherServiceError as e:
-        print(f"✅ Correctly handled error: {e}")
-        return True
-
-
-async def test_empty_city():
-    """Test handling of empty city name."""
-    service = WeatherService()
-    try:
-        await service.get_weather("")
-        print("❌ Should have raised an error")
-        return False
-    except WeatherServiceError as e:
-        print(f"✅ Correctly handled error: {e}")
-        return True
-
-
-async def run_tests():
-    """Run all tests."""
-    print("Running Weather Service Tests\n")
-    print("=" * 50)
-    
-    results = []
-    results.append(await test_valid_city())
-    results.append(await test_invalid_city())
-    results.append(await test_empty_city())
-    
-    print("\n" + "=" * 50)
-    passed = sum(results)
-    total = len(results)
-    print(f"\nTests Passed: {passed}/{total}")
-
-
-if __name__ == "__main__":
+# test_weather_service.py
+"""
+Simple tests for weather service.
+
+Everything runs offline against local stubs or the recorded fixtures in
+fixtures/. Run as a script (python test_weather_service.py) or with pytest.
+"""
+
+import asyncio
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from cache import TTLCache
+from config import Settings, load_settings
+from forecast_model import Forecast
+from rate_limit import SharedTokenBucket, TokenBucket
+from replay import Replay, ReplayTransport
+from resilience import CircuitBreaker, RetryPolicy
+from units import WeatherReadings
+from weather_service import WeatherService, WeatherServiceError
+
+
+class StubServer:
+    """
+    Local stand-in for the OpenWeatherMap API.
+
+    Replies with the scripted (status, headers) responses in order and
+    then keeps repeating the last one. A 200 carries a minimal weather body.
+    """
+
+    def __init__(self, responses):
+        self.responses = list(responses)
+        self.requests = 0
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                index = min(stub.requests, len(stub.responses) - 1)
+                stub.requests += 1
+                status, headers = stub.responses[index]
+                body = json.dumps({"name": "Stubville", "main": {"temp": 20}}).encode()
+                self.send_response(status)
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass  # keep test output clean
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}/"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+def stub_service(stub, max_retries=2, failure_threshold=5, geolocation_stub=None):
+    """Build a WeatherService pointed at the stub with fast, jitter-free backoff."""
+    service = WeatherService(config={
+        "API_KEY": "test-key",
+        "BASE_URL": stub.url,
+        "FORECAST_URL": stub.url,
+        "GEOLOCATION_URL": (geolocation_stub or stub).url,
+        "SNAPSHOT_DB_PATH": "",
+    })
+    service.retry_policy = RetryPolicy(
+        max_retries=max_retries, backoff_base=0.01, backoff_max=2, jitter=False
+    )
+    service.circuit_breaker = CircuitBreaker(
+        failure_threshold=failure_threshold, reset_timeout=60
+    )
+    service.geolocation_breaker = CircuitBreaker(
+        failure_threshold=failure_threshold, reset_timeout=60
+    )
+    return service
+
+
+def replay_service():
+    """Build a WeatherService answered from the recorded fixtures."""
+    replay = Replay(unknown_cities=["InvalidCityXYZ123"])
+    return WeatherService(
+        config={"API_KEY": "test-key", "SNAPSHOT_DB_PATH": ""},
+        transport=ReplayTransport(replay),
+    )
+
+
+async def test_valid_city():
+    """Test fetching weather for a valid city."""
+    service = replay_service()
+    try:
+        data = await service.get_weather("London")
+        print(f"✅ Successfully fetched weather for {data['name']}")
+        print(f"   Temperature: {data['main']['temp']}°C")
+        return True
+    except Exception as e:
+        print(f"❌ Test failed: {e}")
+        return False
+
+
+async def test_invalid_city():
+    """Test handling of invalid city."""
+    service = replay_service()
+    try:
+        await service.get_weather("InvalidCityXYZ123")
+        print("❌ Should have raised an error")
+        return False
+    except WeatherServiceError as e:
+        print(f"✅ Correctly handled error: {e}")
+        return True
+
+
+async def test_empty_city():
+    """Test handling of empty city name."""
+    service = replay_service()
+    try:
+        await service.get_weather("")
+        print("❌ Should have raised an error")
+        return False
+    except WeatherServiceError as e:
+        print(f"✅ Correctly handled error: {e}")
+        return True
+
+
+async def test_batch_partial_failure():
+    """Test that one bad city in a batch does not fail the others."""
+    service = replay_service()
+    async with service:
+        results = await service.get_weather_many(["London", "InvalidCityXYZ123", "Paris"])
+    ok = (
+        [r.ok for r in results] == [True, False, True]
+        and results[2].data["name"] == "Paris"
+        and isinstance(results[1].error, WeatherServiceError)
+    )
+    print(f"{'✅' if ok else '❌'} Batch results: {[(r.city, r.ok) for r in results]}")
+    return ok
+
+
+async def test_batch_deduplicates_cities():
+    """Test that repeated cities in a batch are requested once and share a result."""
+    replay = Replay()
+    service = WeatherService(
+        config={"API_KEY": "test-key", "SNAPSHOT_DB_PATH": ""},
+        transport=ReplayTransport(replay),
+    )
+    async with service:
+        results = await service.get_weather_many(["London", " london ", "LONDON", "Paris"])
+    ok = len(results) == 4 and results[0] is results[1] is results[2] and replay.requests == 2
+    print(f"{'✅' if ok else '❌'} {len(results)} results from {replay.requests} requests")
+    return ok
+
+
+async def test_batch_concurrency_bound():
+    """Test that a batch never has more than `concurrency` lookups in flight."""
+    service = replay_service()
+    in_flight = 0
+    most = 0
+
+    async def slow_lookup(city):
+        nonlocal in_flight, most
+        in_flight += 1
+        most = max(most, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return {"name": city}
+
+    service.get_weather = slow_lookup
+    cities = [f"City {i}" for i in range(10)]
+    results = [r async for r in service.iter_weather_many(cities, concurrency=3)]
+    ok = len(results) == 10 and all(r.ok for r in results) and most == 3
+    print(f"{'✅' if ok else '❌'} At most {most} of {len(cities)} lookups in flight")
+    return ok
+
+
+async def test_cache_lru_and_ttl():
+    """Test LRU eviction, expiry and counters of the response cache."""
+    cache = TTLCache(max_entries=2)
+    cache.set("london", 1, ttl=60)
+    cache.set("paris", 2, ttl=60)
+    cache.get("london")            # london is now most recently used
+    cache.set("tokyo", 3, ttl=60)  # evicts paris
+    cache.set("tokyo", 3, ttl=0.01)
+    time.sleep(0.02)
+
+    ok = (
+        cache.get("paris") is None
+        and cache.get("london") == 1
+        and cache.get("tokyo") is None
+    )
+    stats = cache.stats()
+    ok = ok and stats["hits"] == 2 and stats["evictions"] == 1 and stats["expirations"] == 1
+    if ok:
+        print(f"✅ Cache evicts and expires correctly: {stats}")
+    else:
+        print(f"❌ Unexpected cache state: {stats}")
+    return ok
+
+
+async def test_retry_recovers_from_5xx():
+    """Test that transient 5xx responses are retried until one succeeds."""
+    stub = StubServer([(503, {}), (502, {}), (200, {})])
+    try:
+        async with stub_service(stub) as service:
+            data = await service.get_weather("London")
+        ok = data["name"] == "Stubville" and stub.requests == 3
+        print(f"{'✅' if ok else '❌'} Recovered after {stub.requests - 1} retries")
+        return ok
+    finally:
+        stub.stop()
+
+
+async def test_retry_honors_retry_after():
+    """Test that a 429 waits for the Retry-After header before retrying."""
+    stub = StubServer([(429, {"Retry-After": "1"}), (200, {})])
+    try:
+        async with stub_service(stub) as service:
+            started = time.monotonic()
+            await service.get_weather("London")
+            waited = time.monotonic() - started
+        ok = waited >= 1 and stub.requests == 2
+        print(f"{'✅' if ok else '❌'} Waited {waited:.2f}s for Retry-After")
+        return ok
+    finally:
+        stub.stop()
+
+
+async def test_no_retry_on_client_error():
+    """Test that a 404 fails immediately with a friendly message."""
+    stub = StubServer([(404, {})])
+    try:
+        async with stub_service(stub) as service:
+            await service.get_weather("Atlantis")
+        print("❌ Should have raised an error")
+        return False
+    except WeatherServiceError as e:
+        ok = "not found" in str(e) and stub.requests == 1
+        print(f"{'✅' if ok else '❌'} Not retried: {e}")
+        return ok
+    finally:
+        stub.stop()
+
+
+async def test_forecast_errors_are_mapped():
+    """Test that forecast failures raise WeatherServiceError, not httpx errors."""
+    stub = StubServer([(500, {})])
+    try:
+        async with stub_service(stub, max_retries=0) as service:
+            await service.get_forecast("London")
+        print("❌ Should have raised an error")
+        return False
+    except WeatherServiceError as e:
+        print(f"✅ Forecast error mapped: {e}")
+        return True
+    finally:
+        stub.stop()
+
+
+async def test_current_location_errors_are_mapped():
+    """Test that a failed IP lookup raises WeatherServiceError, not httpx errors."""
+    stub = StubServer([(503, {})])
+    try:
+        async with stub_service(stub, max_retries=1) as service:
+            await service.get_current_location()
+        print("❌ Should have raised an error")
+        return False
+    except WeatherServiceError as e:
+        ok = "unavailable" in str(e) and stub.requests == 2
+        print(f"{'✅' if ok else '❌'} Location error mapped after a retry: {e}")
+        return ok
+    finally:
+        stub.stop()
+
+
+async def test_current_location_failures_leave_weather_alone():
+    """Test that IP lookup failures use no weather quota and trip no weather breaker."""
+    weather = StubServer([(200, {})])
+    location = StubServer([(429, {}), (429, {}), (401, {})])
+    try:
+        async with stub_service(
+            weather, max_retries=0, failure_threshold=2, geolocation_stub=location
+        ) as service:
+            # One token a minute: a lookup that took one would stall the weather call
+            service.rate_limiter = TokenBucket.per_minute(1, 1)
+            errors = []
+            for _ in range(3):
+                try:
+                    await service.get_current_location()
+                except WeatherServiceError as e:
+                    errors.append(str(e))
+            data = await asyncio.wait_for(service.get_weather("London"), 5)
+        ok = (
+            data["name"] == "Stubville"
+            and errors[-1] == "Location service is temporarily unavailable. "
+            "Please try again in a moment."
+            and not any("API key" in error for error in errors)
+            and location.requests == 2
+        )
+        print(f"{'✅' if ok else '❌'} Location failures kept apart from weather: {errors}")
+        return ok
+    except Exception as e:
+        print(f"❌ Test failed: {e}")
+        return False
+    finally:
+        weather.stop()
+        location.stop()
+
+
+async def test_current_location_unauthorized_is_not_an_api_key_error():
+    """Test that a 401 from the IP lookup is not blamed on the weather API key."""
+    stub = StubServer([(401, {})])
+    try:
+        async with stub_service(stub) as service:
+            await service.get_current_location()
+        print("❌ Should have raised an error")
+        return False
+    except WeatherServiceError as e:
+        ok = str(e) == "Could not determine your location."
+        print(f"{'✅' if ok else '❌'} Location 401 mapped: {e}")
+        return ok
+    finally:
+        stub.stop()
+
+
+async def test_circuit_breaker_fails_fast():
+    """Test that the breaker stops calling a failing upstream."""
+    stub = StubServer([(500, {})])
+    try:
+        async with stub_service(stub, max_retries=0, failure_threshold=2) as service:
+            for city in ("London", "Paris", "Tokyo"):
+                try:
+                    await service.get_weather(city)
+                except WeatherServiceError:
+                    pass
+        ok = stub.requests == 2 and service.circuit_breaker.state == CircuitBreaker.OPEN
+        print(f"{'✅' if ok else '❌'} Circuit opened after {stub.requests} failed requests")
+        return ok
+    finally:
+        stub.stop()
+
+
+async def test_shared_rate_limit():
+    """Test that two buckets on the same file draw from one budget."""
+    path = os.path.join(tempfile.mkdtemp(), "quota.db")
+    first = SharedTokenBucket(rate=5, burst=2, path=path)
+    second = SharedTokenBucket(rate=5, burst=2, path=path)
+    try:
+        await first.acquire()
+        await first.acquire()
+        started = time.monotonic()
+        await second.acquire()  # budget is spent: must wait ~0.2s for a refill
+        waited = time.monotonic() - started
+        ok = waited >= 0.15
+        print(f"{'✅' if ok else '❌'} Second instance waited {waited:.2f}s for a token")
+        return ok
+    finally:
+        first.close()
+        second.close()
+
+
+async def test_shared_rate_limit_does_not_block_the_loop():
+    """Test that waiting on another process's lock on the bucket file leaves the loop free."""
+    path = os.path.join(tempfile.mkdtemp(), "quota.db")
+    bucket = SharedTokenBucket(rate=5, burst=2, path=path)
+    other = sqlite3.connect(path, isolation_level=None)
+    ticks = 0
+
+    async def tick():
+        nonlocal ticks
+        while True:
+            await asyncio.sleep(0.01)
+            ticks += 1
+
+    try:
+        bucket.open()
+        other.execute("BEGIN IMMEDIATE")  # another process holds the write lock
+        ticker = asyncio.create_task(tick())
+        acquiring = asyncio.create_task(bucket.acquire())
+        await asyncio.sleep(0.3)
+        other.execute("COMMIT")
+        await acquiring
+        ticker.cancel()
+        ok = ticks >= 10
+        print(f"{'✅' if ok else '❌'} Event loop ran {ticks} ticks while the bucket waited")
+        return ok
+    finally:
+        other.close()
+        bucket.close()
+
+
+async def test_service_close_closes_shared_rate_limit():
+    """Test that the shared bucket's connection opens with the service and closes with it."""
+    path = os.path.join(tempfile.mkdtemp(), "quota.db")
+    service = WeatherService(config={
+        "API_KEY": "test-key", "SNAPSHOT_DB_PATH": "", "RATE_LIMIT_SHARED_PATH": path,
+    })
+    idle = service.rate_limiter._conn is None
+    async with service:
+        opened = service.rate_limiter._conn is not None
+    ok = idle and opened and service.rate_limiter._conn is None
+    print(f"{'✅' if ok else '❌'} Shared limiter opened={opened}, closed afterwards")
+    return ok
+
+
+async def test_forecast_model_daily_summary():
+    """Test that the forecast is parsed once into per-day aggregates."""
+    day = 1700006400  # 2023-11-15 00:00 UTC
+    payload = {
+        "city": {"name": "Stubville"},
+        "list": [
+            {
+                "dt": day + hour * 3600,
+                "main": {"temp": temp, "temp_min": temp - 1, "temp_max": temp + 1},
+                "weather": [{"icon": icon, "description": "few clouds"}],
+            }
+            for hour, temp, icon in [(0, 10, "02n"), (12, 20, "02d"), (21, 12, "02n"), (24, 5, "13d")]
+        ],
+    }
+    forecast = Forecast.from_api(payload)
+    first = forecast.daily[0]
+    ok = (
+        len(forecast.daily) == 2
+        and (first.temp_min, first.temp_max, first.temp_mean) == (9, 21, 14)
+        and first.icon == "02d"
+        and first.description == "Few Clouds"
+    )
+    print(f"{'✅' if ok else '❌'} Daily summary: {forecast.daily}")
+    return ok
+
+
+async def test_forecast_local_days():
+    """Test that days are bucketed in the city's local time, not UTC."""
+    day = 1700006400  # 2023-11-15 00:00 UTC
+    payload = {
+        "city": {"name": "Sydney", "timezone": 11 * 3600},
+        "list": [
+            {
+                "dt": day + hour * 3600,
+                "main": {"temp": 20},
+                "weather": [{"icon": icon, "description": "x"}],
+                "pop": pop,
+            }
+            for hour, icon, pop in [(0, "10d", 0.8), (3, "10d", 0.6), (14, "01n", 0.0), (15, "01n", 0.1)]
+        ],
+    }
+    daily = Forecast.from_api(payload).daily
+    # 00:00/03:00 UTC are 11:00/14:00 on the 15th; 14:00/15:00 UTC fall on the 16th
+    ok = (
+        [d.points for d in daily] == [2, 2]
+        and daily[0].icon == "10d" and daily[0].pop == 0.8
+        and str(daily[1].date) == "2023-11-16"
+    )
+    print(f"{'✅' if ok else '❌'} Local-time days: {daily}")
+    return ok
+
+
+async def test_unit_views_do_not_drift():
+    """Test that unit views are converted from the source values, not each other."""
+    weather = {
+        "main": {"temp": 21.3, "feels_like": 20.9, "temp_min": 19.7, "temp_max": 22.4, "pressure": 1013},
+        "wind": {"speed": 4.1},
+    }
+    readings = WeatherReadings(weather, source_system="metric")
+    for _ in range(1000):
+        readings.view("imperial")
+        metric = readings.view("metric")
+    imperial = readings.view("imperial")
+    standard = readings.view("standard", wind_unit="km/h", pressure_unit="mmHg")
+    ok = (
+        metric.temp == 21.3
+        and readings.view("imperial") is imperial
+        and round(imperial.temp, 2) == 70.34
+        and round(standard.temp, 2) == 294.45
+        and imperial.wind_unit == "mph" and round(imperial.wind_speed, 2) == 9.17
+        and round(standard.wind_speed, 2) == 14.76
+        and round(standard.pressure) == 760
+    )
+    print(f"{'✅' if ok else '❌'} Unit views: {imperial.temp:.2f}{imperial.temp_symbol}, "
+          f"{standard.pressure:.0f} {standard.pressure_unit}")
+    return ok
+
+
+async def test_config_layers_and_overrides():
+    """Test config layering (defaults < TOML < .env < environment) and overrides."""
+    with tempfile.TemporaryDirectory() as tmp:
+        toml_path = os.path.join(tmp, "weather.toml")
+        env_path = os.path.join(tmp, ".env")
+        with open(toml_path, "w") as f:
+            f.write('api_key = "from-toml"\nmax_retries = 7\n[weather]\ntimeout = 3\n')
+        with open(env_path, "w") as f:
+            f.write("OPENWEATHER_API_KEY=from-dotenv\nMAX_RETRIES=4\n")
+
+        settings = load_settings(
+            env_file=env_path, toml_file=toml_path, environ={"MAX_RETRIES": "1"}
+        )
+    service = WeatherService(config=settings.with_overrides(API_KEY="second-key"))
+    ok = (
+        (settings.API_KEY, settings.MAX_RETRIES, settings.TIMEOUT) == ("from-dotenv", 1, 3.0)
+        and settings.CACHE_MAX_ENTRIES == Settings.CACHE_MAX_ENTRIES
+        and service.api_key == "second-key"
+        and service.retry_policy.max_retries == 1
+    )
+    try:
+        WeatherService(config={"API_KEY": ""})
+        ok = False
+    except ValueError:
+        pass
+    print(f"{'✅' if ok else '❌'} Config layers: {settings.API_KEY}, retries={settings.MAX_RETRIES}")
+    return ok
+
+
+async def test_config_skips_blank_values_and_finds_dotenv():
+    """Test that blank variables keep the lower layer and .env is found upwards."""
+    import dotenv
+
+    find_dotenv = dotenv.find_dotenv
+    with tempfile.TemporaryDirectory() as tmp:
+        env_path = os.path.join(tmp, ".env")
+        with open(env_path, "w") as f:
+            f.write("OPENWEATHER_API_KEY=from-dotenv\nHTTP_TIMEOUT=\n")
+        found = []
+        # find_dotenv searches from config.py's directory, not the working one
+        dotenv.find_dotenv = lambda: found.append(True) or env_path
+        try:
+            settings = load_settings(environ={"MAX_RETRIES": ""})
+        finally:
+            dotenv.find_dotenv = find_dotenv
+    ok = (
+        found == [True]
+        and settings.API_KEY == "from-dotenv"
+        and settings.TIMEOUT == Settings.TIMEOUT
+        and settings.MAX_RETRIES == Settings.MAX_RETRIES
+    )
+    print(f"{'✅' if ok else '❌'} Blank config values ignored, .env found: {settings.API_KEY}")
+    return ok
+
+
+async def test_old_snapshots_are_pruned():
+    """Test that snapshots older than SNAPSHOT_MAX_AGE are deleted, not just hidden."""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "snapshots.db")
+        config = {"API_KEY": "test-key", "SNAPSHOT_DB_PATH": path, "SNAPSHOT_MAX_AGE": 3600}
+        replay = Replay()
+
+        async with WeatherService(config=config, transport=ReplayTransport(replay)) as service:
+            await service.get_weather_bundle("London")
+        conn = sqlite3.connect(path)
+        conn.execute("UPDATE snapshots SET fetched_at = fetched_at - 7200")
+        conn.commit()
+
+        # Opening the store prunes, and so does every save
+        service = WeatherService(config=config, transport=ReplayTransport(replay))
+        on_open = service.load_snapshot("London")
+        left_on_open = conn.execute("SELECT count(*) FROM snapshots").fetchone()[0]
+        await service.get_weather_bundle("Tokyo")
+        conn.execute("UPDATE snapshots SET fetched_at = fetched_at - 7200")
+        conn.commit()
+        await service.get_weather_bundle("London")
+        cities = [city for (city,) in conn.execute("SELECT city FROM snapshots")]
+        await service.close()
+        conn.close()
+
+    ok = on_open is None and left_on_open == 0 and cities == ["London"]
+    print(f"{'✅' if ok else '❌'} Old snapshots pruned: {cities}")
+    return ok
+
+
+async def run_tests():
+    """Run all tests."""
+    print("Running Weather Service Tests\n")
+    print("=" * 50)
+    
+    results = []
+    results.append(await test_valid_city())
+    results.append(await test_invalid_city())
+    results.append(await test_empty_city())
+    results.append(await test_batch_partial_failure())
+    results.append(await test_batch_deduplicates_cities())
+    results.append(await test_batch_concurrency_bound())
+    results.append(await test_cache_lru_and_ttl())
+    results.append(await test_retry_recovers_from_5xx())
+    results.append(await test_retry_honors_retry_after())
+    results.append(await test_no_retry_on_client_error())
+    results.append(await test_forecast_errors_are_mapped())
+    results.append(await test_current_location_errors_are_mapped())
+    results.append(await test_current_location_failures_leave_weather_alone())
+    results.append(await test_current_location_unauthorized_is_not_an_api_key_error())
+    results.append(await test_circuit_breaker_fails_fast())
+    results.append(await test_shared_rate_limit())
+    results.append(await test_shared_rate_limit_does_not_block_the_loop())
+    results.append(await test_service_close_closes_shared_rate_limit())
+    results.append(await test_forecast_model_daily_summary())
+    results.append(await test_forecast_local_days())
+    results.append(await test_unit_views_do_not_drift())
+    results.append(await test_old_snapshots_are_pruned())
+    results.append(await test_config_layers_and_overrides())
+    results.append(await test_config_skips_blank_values_and_finds_dotenv())
+    
+    print("\n" + "=" * 50)
+    passed = sum(results)
+    total = len(results)
+    print(f"\nTests Passed: {passed}/{total}")
+
+
+if __name__ == "__main__":
     asyncio.run(run_tests())
\ No newline at end of file
@@ -0,0 +1,183 @@
+"""Unit conversion for weather readings."""
+
+from array import array
+from typing import Dict, Optional, Tuple
+
+from forecast_model import Forecast
+
+# What each OpenWeatherMap "units" setting means for the values it returns
+UNIT_SYSTEMS = {
+    "metric": {"temp": "°C", "wind": "m/s", "pressure": "hPa"},
+    "imperial": {"temp": "°F", "wind": "mph", "pressure": "inHg"},
+    "standard": {"temp": "K", "wind": "m/s", "pressure": "hPa"},
+}
+
+# Linear maps kelvin -> unit as (scale, offset): value = kelvin * scale + offset
+_FROM_KELVIN = {
+    "metric": (1.0, -273.15),
+    "imperial": (9 / 5, -459.67),
+    "standard": (1.0, 0.0),
+}
+
+# m/s -> unit
+_FROM_MPS = {"m/s": 1.0, "km/h": 3.6, "mph": 2.2369362920544}
+
+# hPa -> unit
+_FROM_HPA = {"hPa": 1.0, "kPa": 0.1, "inHg": 0.029529983071445, "mmHg": 0.750061683}
+
+# Current-conditions temperature fields, in the order they are stored
+CURRENT_TEMP_FIELDS = ("temp", "feels_like", "temp_min", "temp_max")
+
+
+def temperature_map(source: str, target: str) -> Tuple[float, float]:
+    """
+    Return (scale, offset) converting temperatures from one system to another.
+
+    The kelvin round trip is folded into a single linear map, so each value
+    is converted with one multiply-add.
+    """
+    source_scale, source_offset = _FROM_KELVIN[source]
+    target_scale, target_offset = _FROM_KELVIN[target]
+    scale = target_scale / source_scale
+    return scale, target_offset - source_offset * scale
+
+
+def _convert_array(values: array, scale: float, offset: float) -> array:
+    """Apply value * scale + offset to a whole array at once."""
+    if scale == 1.0 and offset == 0.0:
+        return array("d", values)  # same system: keep the API values exactly
+    return array("d", [v * scale + offset for v in values])
+
+
+class UnitView:
+    """All readings expressed in one unit system."""
+
+    __slots__ = (
+        "system",
+        "temp_symbol",
+        "wind_unit",
+        "pressure_unit",
+        "temp",
+        "feels_like",
+        "temp_min",
+        "temp_max",
+        "wind_speed",
+        "pressure",
+        "forecast_temps",
+        "daily_min",
+        "daily_max",
+        "daily_mean",
+    )
+
+    def __init__(
+        self,
+        system: str,
+        temps: array,
+        wind_speed: float,
+        wind_unit: str,
+        pressure: float,
+        pressure_unit: str,
+        forecast_points: int,
+        days: int,
+    ):
+        self.system = system
+        self.temp_symbol = UNIT_SYSTEMS[system]["temp"]
+        self.wind_unit = wind_unit
+        self.pressure_unit = pressure_unit
+        self.wind_speed = wind_speed
+        self.pressure = pressure
+
+        # temps is [current fields, forecast points, daily mins, maxes, means]
+        self.temp, self.feels_like, self.temp_min, self.temp_max = temps[:4]
+        start = len(CURRENT_TEMP_FIELDS)
+        self.forecast_temps = temps[start:start + forecast_points]
+        start += forecast_points
+        self.daily_min = temps[start:start + days]
+        self.daily_max = temps[start + days:start + 2 * days]
+        self.daily_mean = temps[start + 2 * days:start + 3 * days]
+
+
+class WeatherReadings:
+    """
+    Source values of one weather + forecast response, with per-unit views.
+
+    Every temperature (current conditions, each forecast point and the
+    daily aggregates) is kept in one array exactly as the API sent it.
+    A view in another unit system is converted from that array in one
+    batch and cached, so switching units is a dict lookup and toggling
+    back and forth never drifts.
+    """
+
+    def __init__(
+        self,
+        weather: Dict,
+        forecast: Optional[Forecast] = None,
+        source_system: str = "metric",
+    ):
+        main = weather.get("main", {})
+        current = [float(main.get(field, 0)) for field in CURRENT_TEMP_FIELDS]
+
+        daily = forecast.daily if forecast else []
+        self.forecast_points = len(forecast) if forecast else 0
+        self.days = len(daily)
+
+        temps = array("d", current)
+        if forecast:
+            temps.extend(forecast.temps)
+        temps.extend(day.temp_min for day in daily)
+        temps.extend(day.temp_max for day in daily)
+        temps.extend(day.temp_mean for day in daily)
+
+        self.source_system = source_system
+        self.temps = temps
+
+        self.wind_speed = float(weather.get("wind", {}).get("speed", 0))
+        self.wind_unit = UNIT_SYSTEMS[source_system]["wind"]
+        self.pressure_hpa = float(main.get("pressure", 0))  # hPa in every system
+
+        self._views: Dict[Tuple[str, str, str], UnitView] = {}
+
+    def view(
+        self,
+        system: str,
+        wind_unit: Optional[str] = None,
+        pressure_unit: Optional[str] = None,
+    ) -> UnitView:
+        """
+        Return the readings converted to a unit system.
+
+        Args:
+            system: "metric", "imperial" or "standard"
+            wind_unit: Override the system's wind unit ("m/s", "km/h", "mph")
+            pressure_unit: Override the system's pressure unit
+                ("hPa", "kPa", "inHg", "mmHg")
+
+        Returns:
+            A cached UnitView; converting happens once per combination
+        """
+        units = UNIT_SYSTEMS[system]
+        wind_unit = wind_unit or units["wind"]
+        pressure_unit = pressure_unit or units["pressure"]
+        key = (system, wind_unit, pressure_unit)
+
+        cached = self._views.get(key)
+        if cached is not None:
+            return cached
+
+        scale, offset = temperature_map(self.source_system, system)
+        wind_speed = self.wind_speed
+        if wind_unit != self.wind_unit:
+            wind_speed *= _FROM_MPS[wind_unit] / _FROM_MPS[self.wind_unit]
+
+        view = UnitView(
+            system,
+            _convert_array(self.temps, scale, offset),
+            wind_speed=wind_speed,
+            wind_unit=wind_unit,
+            pressure=self.pressure_hpa * _FROM_HPA[pressure_unit],
+            pressure_unit=pressure_unit,
+            forecast_points=self.forecast_points,
+            days=self.days,
+        )
+        self._views[key] = view
+        return view
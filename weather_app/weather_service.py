@@ -1,129 +1,651 @@
-# weather_service.py
-"""Weather API service layer."""
-
-import httpx
-from typing import Dict
-from config import Config
-
-
-class WeatherServiceError(Exception):
-    """Custom exception for weather service errors."""
-    pass
-
-
-class WeatherService:
-    """Service for fetching weather data from OpenWeatherMap API."""
-    
-    def __init__(self):
-        self.api_key = Config.API_KEY
-        self.base_url = Config.BASE_URL
-        self.timeout = Config.TIMEOUT
-    
-    async def get_weather(self, city: str) -> Dict:
-        """
-        Fetch weather data for a given city.
-        
-        Args:
-            city: Name of the city
-            
-        Returns:
-            Dictionary containing weather data
-            
-        Raises:
-            WeatherServiceError: If the request fails
-        """
-        if not city:
-            raise WeatherServiceError("City name cannot be empty")
-        
-        # Build request parameters
-        params = {
-            "q": city,
-            "appid": self.api_key,
-            "units": Config.UNITS,
-        }
-        
-        try:
-            # Make async HTTP request
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.get(self.base_url, params=params)
-                
-                # Check for HTTP errors
-                if response.status_code == 404:
-                    raise WeatherServiceError(
-                        f"City '{city}' not found. Please check the spelling."
-                    )
-                elif response.status_code == 401:
-                    raise WeatherServiceError(
-                        "Invalid API key. Please check your configuration."
-                    )
-                elif response.status_code >= 500:
-                    raise WeatherServiceError(
-                        "Weather service is currently unavailable. "
-                        "Please try again later."
-                    )
-                elif response.status_code != 200:
-                    raise WeatherServiceError(
-                        f"Error fetching weather data: {response.status_code}"
-                    )
-                
-                # Parse JSON response
-                data = response.json()
-                return data
-                
-        except httpx.TimeoutException:
-            raise WeatherServiceError(
-                "Request timed out. Please check your internet connection."
-            )
-        except httpx.NetworkError:
-            raise WeatherServiceError(
-                "Network error. Please check your internet connection."
-            )
-        except httpx.HTTPError as e:
-            raise WeatherServiceError(f"HTTP error occurred: {str(e)}")
-        except Exception as e:
-            raise WeatherServiceError(f"An unexpected error occurred: {str(e)}")
-    
-    async def get_weather_by_coordinates(
-        self, 
-        lat: float, 
-        lon: float
-    ) -> Dict:
-        """
-        Fetch weather data by coordinates.
-        
-        Args:
-            lat: Latitude
-            lon: Longitude
-            
-        Returns:
-            Dictionary containing weather data
-        """
-        params = {
-            "lat": lat,
-            "lon": lon,
-            "appid": self.api_key,
-            "units": Config.UNITS,
-        }
-        
-        try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.get(self.base_url, params=params)
-                response.raise_for_status()
-                return response.json()
-                
-        except Exception as e:
-            raise WeatherServiceError(f"Error fetching weather data: {str(e)}")
-        
-    async def get_forecast(self, city: str) -> Dict:
-        """Get 5-day weather forecast."""
-        forecast_url = "https://api.openweathermap.org/data/2.5/forecast"
-        params = {
-            "q": city,
-            "appid": self.api_key,
-            "units": Config.UNITS,
-        }
-            
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
-            response = await client.get(forecast_url, params=params)
-            response.raise_for_status()
-            return response.json()
\ No newline at end of file
+# weather_service.py
+"""Weather API service layer."""
+
+import asyncio
+import sqlite3
+import httpx
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Iterable, List, Mapping, Optional, Tuple, Union
+from config import Settings, resolve_settings
+from cache import TTLCache
+from snapshot_store import SnapshotStore
+from resilience import CircuitBreaker, RetryPolicy, parse_retry_after
+from rate_limit import SharedTokenBucket, TokenBucket
+from forecast_model import Forecast, parse_forecast
+
+
+class WeatherServiceError(Exception):
+    """Custom exception for weather service errors."""
+    pass
+
+
+@dataclass
+class WeatherBundle:
+    """Current conditions and forecast for one city, fetched together.
+
+    Either half may be missing; its error is kept alongside so the caller
+    can still render whatever did come back.
+    """
+    city: str
+    weather: Optional[Dict] = None
+    forecast: Optional[Forecast] = None
+    weather_error: Optional[WeatherServiceError] = None
+    forecast_error: Optional[WeatherServiceError] = None
+    fetched_at: Optional[float] = None  # set when loaded from disk
+    stale: bool = False
+
+    @property
+    def ok(self) -> bool:
+        """True when both current weather and forecast were fetched."""
+        return self.weather is not None and self.forecast is not None
+
+
+@dataclass
+class BatchResult:
+    """Outcome of one city in a batch lookup: data or an error, never both."""
+    city: str
+    data: Optional[Dict] = None
+    error: Optional[WeatherServiceError] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+class WeatherService:
+    """Service for fetching weather data from OpenWeatherMap API."""
+    
+    def __init__(
+        self,
+        config: Union[Settings, Mapping[str, Any], None] = None,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+    ):
+        """
+        Args:
+            config: Settings for this instance. None uses the process-wide
+                settings; a Settings object or a mapping of overrides such
+                as ``{"API_KEY": "..."}`` lets several services with
+                different keys or limits run side by side.
+            transport: Custom httpx transport, e.g. replay.ReplayTransport
+                to serve recorded responses without a network
+        """
+        self.config = config = resolve_settings(config)
+        self.transport = transport
+        self.api_key = config.API_KEY
+        self.base_url = config.BASE_URL
+        self.forecast_url = config.FORECAST_URL
+        self.timeout = config.TIMEOUT
+        self.batch_concurrency = config.BATCH_CONCURRENCY
+        self.limits = httpx.Limits(
+            max_connections=config.MAX_CONNECTIONS,
+            max_keepalive_connections=config.MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=config.KEEPALIVE_EXPIRY,
+        )
+        self._client: Optional[httpx.AsyncClient] = None
+        self.current_ttl = config.CURRENT_WEATHER_TTL
+        self.forecast_ttl = config.FORECAST_TTL
+        self._cache = TTLCache(max_entries=config.CACHE_MAX_ENTRIES)
+        self.snapshot_path = config.SNAPSHOT_DB_PATH
+        self.snapshot_stale_after = config.SNAPSHOT_STALE_AFTER
+        self.snapshot_max_age = config.SNAPSHOT_MAX_AGE
+        self._snapshots: Optional[SnapshotStore] = None
+        self._inflight: Dict[Tuple, asyncio.Future] = {}
+        self.retry_policy = RetryPolicy(
+            max_retries=config.MAX_RETRIES,
+            backoff_base=config.RETRY_BACKOFF_BASE,
+            backoff_max=config.RETRY_BACKOFF_MAX,
+        )
+        self.circuit_breaker = CircuitBreaker(
+            failure_threshold=config.CIRCUIT_FAILURE_THRESHOLD,
+            reset_timeout=config.CIRCUIT_RESET_TIMEOUT,
+        )
+        # The IP lookup is another upstream: its outages must not stop
+        # weather requests
+        self.geolocation_breaker = CircuitBreaker(
+            failure_threshold=config.CIRCUIT_FAILURE_THRESHOLD,
+            reset_timeout=config.CIRCUIT_RESET_TIMEOUT,
+        )
+        if config.RATE_LIMIT_SHARED_PATH:
+            self.rate_limiter = SharedTokenBucket.per_minute(
+                config.RATE_LIMIT_PER_MINUTE,
+                config.RATE_LIMIT_BURST,
+                config.RATE_LIMIT_SHARED_PATH,
+            )
+        else:
+            self.rate_limiter = TokenBucket.per_minute(
+                config.RATE_LIMIT_PER_MINUTE, config.RATE_LIMIT_BURST
+            )
+
+    # ------------------ CLIENT LIFECYCLE ------------------ #
+
+    async def open(self) -> None:
+        """
+        Open the shared HTTP client and the rate limiter.
+
+        The client keeps connections alive between requests, so back-to-back
+        lookups against the same host reuse one TCP/TLS connection. Calling
+        this more than once is harmless.
+        """
+        if self._client is None or self._client.is_closed:
+            try:
+                # A shared limiter opens a SQLite file, which may wait on a lock
+                await asyncio.to_thread(self.rate_limiter.open)
+            except sqlite3.Error:
+                pass  # it retries on first use and never blocks requests
+            self._client = httpx.AsyncClient(
+                timeout=self.timeout,
+                limits=self.limits,
+                transport=self.transport,
+            )
+
+    async def close(self) -> None:
+        """Close the shared HTTP client, the rate limiter and the snapshot store."""
+        if self._client is not None:
+            client, self._client = self._client, None
+            await client.aclose()
+        self.rate_limiter.close()
+        if self._snapshots is not None:
+            self._snapshots.close()
+            self._snapshots = None
+
+    async def __aenter__(self) -> "WeatherService":
+        await self.open()
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+    async def _get_client(self) -> httpx.AsyncClient:
+        """Return the shared client, opening it on first use."""
+        await self.open()
+        return self._client
+
+    # ------------------ RESPONSE CACHE ------------------ #
+
+    @staticmethod
+    def _normalize_city(city: str) -> str:
+        """Normalize a city query so 'new  york' and 'New York' share a cache entry."""
+        return " ".join(city.split()).casefold()
+
+    def _city_key(self, kind: str, city: str) -> Tuple:
+        return (kind, "city", self._normalize_city(city), self.config.UNITS)
+
+    def _coords_key(self, kind: str, lat: float, lon: float) -> Tuple:
+        # ~1 km precision is plenty for weather and keeps nearby lookups together
+        return (kind, "coords", round(lat, 2), round(lon, 2), self.config.UNITS)
+
+    def cache_stats(self) -> Dict[str, int]:
+        """Return hit/miss/eviction counters for the response cache."""
+        return self._cache.stats()
+
+    def clear_cache(self) -> None:
+        """Forget every cached response."""
+        self._cache.clear()
+
+    # ------------------ REQUEST COALESCING ------------------ #
+
+    async def _single_flight(
+        self,
+        key: Tuple,
+        fetch: Callable[[], Awaitable[Any]],
+    ) -> Any:
+        """
+        Run fetch() once for all concurrent callers asking for the same key.
+
+        The first caller starts the request; later callers await the same
+        task. A caller that gets cancelled (e.g. a superseded search) stops
+        waiting without cancelling the shared request, so the response
+        still lands in the cache for everyone else.
+        """
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fetch())
+            self._inflight[key] = task
+            task.add_done_callback(lambda done: self._finish_flight(key, done))
+        return await asyncio.shield(task)
+
+    def _finish_flight(self, key: Tuple, task: asyncio.Future) -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if not task.cancelled():
+            task.exception()  # mark as retrieved even if every waiter left
+
+    # ------------------ DISK SNAPSHOTS ------------------ #
+
+    def _get_snapshot_store(self) -> Optional[SnapshotStore]:
+        """
+        Open the snapshot database on first use (None if disabled),
+        dropping snapshots too old to be shown.
+        """
+        if self._snapshots is None and self.snapshot_path:
+            self._snapshots = SnapshotStore(self.snapshot_path)
+            self._snapshots.prune(self.snapshot_max_age)
+        return self._snapshots
+
+    def load_snapshot(self, city: Optional[str] = None) -> Optional[WeatherBundle]:
+        """
+        Load the last saved response from disk without touching the network.
+
+        Args:
+            city: City to look up, or None for the most recently saved one
+
+        Returns:
+            WeatherBundle with ``stale`` set if it is older than
+            SNAPSHOT_STALE_AFTER, or None if there is no snapshot younger
+            than SNAPSHOT_MAX_AGE
+        """
+        try:
+            store = self._get_snapshot_store()
+            if store is None:
+                return None
+            key = self._normalize_city(city) if city else None
+            snapshot = store.load(key)
+        except sqlite3.Error:
+            return None
+
+        if snapshot is None or snapshot.age > self.snapshot_max_age:
+            return None
+
+        return WeatherBundle(
+            city=snapshot.city,
+            weather=snapshot.weather,
+            forecast=parse_forecast(snapshot.forecast),
+            fetched_at=snapshot.fetched_at,
+            stale=snapshot.age > self.snapshot_stale_after,
+        )
+
+    def _save_snapshot(self, bundle: WeatherBundle) -> None:
+        """Persist a fetched bundle; a disk problem never fails the lookup."""
+        try:
+            store = self._get_snapshot_store()
+            if store is not None:
+                store.save(
+                    self._normalize_city(bundle.city),
+                    bundle.city,
+                    bundle.weather,
+                    bundle.forecast.to_dict() if bundle.forecast else None,
+                )
+                # Cities not looked up for SNAPSHOT_MAX_AGE would otherwise
+                # stay in the file forever
+                store.prune(self.snapshot_max_age)
+        except sqlite3.Error:
+            pass
+
+    # ------------------ HTTP + RESILIENCE ------------------ #
+
+    @staticmethod
+    def _status_error(
+        status_code: int, not_found: str, geolocation: bool = False
+    ) -> WeatherServiceError:
+        """Map a non-200 status code to a user-facing error."""
+        service = "Location service" if geolocation else "Weather service"
+        if status_code == 404 or (geolocation and status_code in (401, 403)):
+            return WeatherServiceError(not_found)
+        elif status_code == 401:
+            return WeatherServiceError(
+                "Invalid API key. Please check your configuration."
+            )
+        elif status_code == 429:
+            return WeatherServiceError(
+                "Too many requests. Please wait a moment and try again."
+            )
+        elif status_code >= 500:
+            return WeatherServiceError(
+                f"{service} is currently unavailable. "
+                "Please try again later."
+            )
+        return WeatherServiceError(
+            f"Error fetching {'location' if geolocation else 'weather'} data: "
+            f"{status_code}"
+        )
+
+    async def _request(
+        self, url: str, params: Dict, not_found: str, geolocation: bool = False
+    ) -> Dict:
+        """
+        GET a JSON document, retrying transient failures.
+
+        Every attempt first waits for a token from the rate limiter.
+        5xx responses, 429s, timeouts and network errors are retried with
+        jittered backoff (honoring Retry-After on 429). Other errors fail
+        immediately. Failures that survive every retry feed the circuit
+        breaker; while it is open, requests fail without touching the
+        network.
+
+        Args:
+            url: Endpoint to call
+            params: Query parameters
+            not_found: Error message to use for a 404
+            geolocation: Call the IP location service instead of
+                OpenWeatherMap: it has its own circuit breaker and error
+                messages, and does not use the OpenWeatherMap rate limit
+
+        Returns:
+            Parsed JSON response
+
+        Raises:
+            WeatherServiceError: If the request ultimately fails
+        """
+        breaker = self.geolocation_breaker if geolocation else self.circuit_breaker
+        if not breaker.allow():
+            service = "Location service" if geolocation else "Weather service"
+            raise WeatherServiceError(
+                f"{service} is temporarily unavailable. "
+                "Please try again in a moment."
+            )
+
+        attempt = 0
+        try:
+            while True:
+                retry_after = None
+                if not geolocation:
+                    # Queue behind the API quota rather than risk a 429
+                    await self.rate_limiter.acquire()
+                try:
+                    # Make async HTTP request over the shared client
+                    client = await self._get_client()
+                    response = await client.get(url, params=params)
+                except httpx.TimeoutException:
+                    error = WeatherServiceError(
+                        "Request timed out. Please check your internet connection."
+                    )
+                except httpx.NetworkError:
+                    error = WeatherServiceError(
+                        "Network error. Please check your internet connection."
+                    )
+                except httpx.HTTPError as e:
+                    breaker.record_failure()
+                    raise WeatherServiceError(f"HTTP error occurred: {str(e)}")
+                else:
+                    if response.status_code == 200:
+                        breaker.record_success()
+                        try:
+                            return response.json()
+                        except ValueError as e:
+                            raise WeatherServiceError(
+                                f"An unexpected error occurred: {str(e)}"
+                            )
+
+                    error = self._status_error(
+                        response.status_code, not_found, geolocation
+                    )
+                    if response.status_code == 429:
+                        retry_after = parse_retry_after(
+                            response.headers.get("Retry-After")
+                        )
+                    elif response.status_code < 500:
+                        # The upstream answered; the request itself was bad
+                        breaker.record_success()
+                        raise error
+
+                delay = self.retry_policy.next_delay(attempt, retry_after)
+                if delay is None:
+                    breaker.record_failure()
+                    raise error
+                attempt += 1
+                await asyncio.sleep(delay)
+        except asyncio.CancelledError:
+            breaker.release()
+            raise
+
+    # ------------------ API CALLS ------------------ #
+
+    async def get_weather(self, city: str) -> Dict:
+        """
+        Fetch weather data for a given city.
+        
+        Args:
+            city: Name of the city
+            
+        Returns:
+            Dictionary containing weather data
+            
+        Raises:
+            WeatherServiceError: If the request fails
+        """
+        if not city:
+            raise WeatherServiceError("City name cannot be empty")
+
+        cache_key = self._city_key("weather", city)
+        cached = self._cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        return await self._single_flight(
+            cache_key, lambda: self._fetch_weather(city, cache_key)
+        )
+
+    async def _fetch_weather(self, city: str, cache_key: Tuple) -> Dict:
+        """Request current weather for a city and cache the response."""
+        # Build request parameters
+        params = {
+            "q": city,
+            "appid": self.api_key,
+            "units": self.config.UNITS,
+        }
+        data = await self._request(
+            self.base_url,
+            params,
+            not_found=f"City '{city}' not found. Please check the spelling.",
+        )
+        self._cache.set(cache_key, data, self.current_ttl)
+        return data
+    
+    async def get_weather_by_coordinates(
+        self, 
+        lat: float, 
+        lon: float
+    ) -> Dict:
+        """
+        Fetch weather data by coordinates.
+        
+        Args:
+            lat: Latitude
+            lon: Longitude
+            
+        Returns:
+            Dictionary containing weather data
+        """
+        cache_key = self._coords_key("weather", lat, lon)
+        cached = self._cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        return await self._single_flight(
+            cache_key, lambda: self._fetch_weather_by_coordinates(lat, lon, cache_key)
+        )
+
+    async def _fetch_weather_by_coordinates(
+        self,
+        lat: float,
+        lon: float,
+        cache_key: Tuple,
+    ) -> Dict:
+        """Request current weather for coordinates and cache the response."""
+        params = {
+            "lat": lat,
+            "lon": lon,
+            "appid": self.api_key,
+            "units": self.config.UNITS,
+        }
+        
+        data = await self._request(
+            self.base_url,
+            params,
+            not_found="No weather data found for these coordinates.",
+        )
+        self._cache.set(cache_key, data, self.current_ttl)
+        return data
+
+
+    async def get_forecast(self, city: str) -> Forecast:
+        """
+        Get the 5-day / 3-hour forecast for a city.
+
+        The payload is parsed once into a compact Forecast (with per-day
+        summaries precomputed); that model is what gets cached.
+        """
+        cache_key = self._city_key("forecast", city)
+        cached = self._cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        return await self._single_flight(
+            cache_key, lambda: self._fetch_forecast(city, cache_key)
+        )
+
+    async def _fetch_forecast(self, city: str, cache_key: Tuple) -> Forecast:
+        """Request the forecast for a city, parse it and cache the model."""
+        params = {
+            "q": city,
+            "appid": self.api_key,
+            "units": self.config.UNITS,
+        }
+        data = await self._request(
+            self.forecast_url,
+            params,
+            not_found=f"City '{city}' not found. Please check the spelling.",
+        )
+        try:
+            forecast = Forecast.from_api(data)
+        except (AttributeError, TypeError, ValueError) as e:
+            raise WeatherServiceError(f"Unexpected forecast data: {str(e)}")
+        self._cache.set(cache_key, forecast, self.forecast_ttl)
+        return forecast
+
+    async def get_weather_bundle(self, city: str) -> WeatherBundle:
+        """
+        Fetch current weather and the forecast for a city concurrently.
+
+        Both requests go out at the same time over the shared client, so a
+        search costs one round trip instead of two. A failure in one half
+        does not discard the other.
+
+        Args:
+            city: Name of the city
+
+        Returns:
+            WeatherBundle with whatever data (and errors) came back
+
+        Raises:
+            WeatherServiceError: If the city name is empty
+        """
+        if not city:
+            raise WeatherServiceError("City name cannot be empty")
+
+        weather, forecast = await asyncio.gather(
+            self.get_weather(city),
+            self.get_forecast(city),
+            return_exceptions=True,
+        )
+
+        bundle = WeatherBundle(city=city)
+        if isinstance(weather, BaseException):
+            bundle.weather_error = self._as_service_error(weather)
+        else:
+            bundle.weather = weather
+        if isinstance(forecast, BaseException):
+            bundle.forecast_error = self._as_service_error(forecast)
+        else:
+            bundle.forecast = forecast
+
+        if bundle.weather is not None:
+            self._save_snapshot(bundle)
+        return bundle
+
+    @staticmethod
+    def _as_service_error(error: BaseException) -> WeatherServiceError:
+        """Wrap an arbitrary exception as a WeatherServiceError."""
+        if isinstance(error, asyncio.CancelledError):
+            raise error
+        if isinstance(error, WeatherServiceError):
+            return error
+        return WeatherServiceError(f"Error fetching weather data: {str(error)}")
+
+    async def iter_weather_many(
+        self,
+        cities: Iterable[str],
+        concurrency: Optional[int] = None,
+    ) -> AsyncIterator[BatchResult]:
+        """
+        Fetch current weather for many cities, yielding results as they finish.
+
+        Cities that normalize to the same name are requested once. At most
+        ``concurrency`` requests are in flight at a time. A failing city
+        yields a BatchResult with ``error`` set instead of stopping the batch.
+
+        Args:
+            cities: City names to look up
+            concurrency: Max parallel requests (defaults to BATCH_CONCURRENCY)
+
+        Yields:
+            One BatchResult per distinct city, in completion order
+        """
+        unique: Dict[str, str] = {}
+        for city in cities:
+            key = self._normalize_city(city or "")
+            if key not in unique:
+                unique[key] = city
+
+        semaphore = asyncio.Semaphore(max(1, concurrency or self.batch_concurrency))
+
+        async def fetch_one(city: str) -> BatchResult:
+            async with semaphore:
+                try:
+                    return BatchResult(city=city, data=await self.get_weather(city))
+                except WeatherServiceError as e:
+                    return BatchResult(city=city, error=e)
+                except Exception as e:
+                    return BatchResult(city=city, error=self._as_service_error(e))
+
+        tasks = [asyncio.create_task(fetch_one(city)) for city in unique.values()]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            # Stop outstanding requests if the caller breaks out early
+            for task in tasks:
+                task.cancel()
+
+    async def get_weather_many(
+        self,
+        cities: Iterable[str],
+        concurrency: Optional[int] = None,
+    ) -> List[BatchResult]:
+        """
+        Fetch current weather for many cities.
+
+        Args:
+            cities: City names to look up
+            concurrency: Max parallel requests (defaults to BATCH_CONCURRENCY)
+
+        Returns:
+            One BatchResult per input city, in input order (duplicates share
+            the same result)
+        """
+        cities = list(cities)
+        by_key: Dict[str, BatchResult] = {}
+        async for result in self.iter_weather_many(cities, concurrency):
+            by_key[self._normalize_city(result.city or "")] = result
+        return [by_key[self._normalize_city(city or "")] for city in cities]
+
+    async def get_current_location(self) -> Dict:
+        """
+        Look up the caller's approximate location from their IP address.
+
+        Gets the same retries and error mapping as the weather calls, but
+        its own circuit breaker and no OpenWeatherMap rate limiting.
+
+        Returns:
+            Dictionary from the geolocation service (``city``,
+            ``country_name``, ``latitude``, ``longitude``, ...)
+
+        Raises:
+            WeatherServiceError: If the lookup fails
+        """
+        return await self._request(
+            self.config.GEOLOCATION_URL,
+            {},
+            not_found="Could not determine your location.",
+            geolocation=True,
+        )
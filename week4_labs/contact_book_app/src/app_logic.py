@@ -1,136 +1,406 @@
-import flet as ft
-from database import update_contact_db, delete_contact_db, add_contact_db, get_all_contacts_db
-
-def display_contacts(page, contacts_list_view, db_conn, search: str = "", filter_by: str = "all"):
-    """Fetches and displays all contacts in the ListView with optional search + filter."""
-    contacts_list_view.controls.clear()
-    contacts = get_all_contacts_db(db_conn, search, filter_by) 
-
-    for contact in contacts:
-        contact_id, name, phone, email = contact
-
-        contacts_list_view.controls.append(
-            ft.ListTile(
-                title=ft.Text(name),
-                subtitle=ft.Text(f"Phone: {phone} | Email: {email}"),
-                trailing=ft.PopupMenuButton(
-                    icon=ft.Icons.MORE_HORIZ,
-                    items=[
-                        ft.PopupMenuItem(
-                            text="Edit",
-                            icon=ft.Icons.EDIT,
-                            on_click=lambda _, c=contact: open_edit_dialog(page, c, db_conn, contacts_list_view)
-                        ),
-                        ft.PopupMenuItem(),
-                        ft.PopupMenuItem(
-                            text="Delete",
-                            icon=ft.Icons.DELETE,
-                            on_click=lambda _, cid=contact_id: delete_contact(page, cid, db_conn, contacts_list_view)
-                        ),
-                    ],
-                ), 
-            )
-        )
-    page.update()
-
-def add_contact(page, inputs, contacts_list_view, db_conn):
-
-    """Adds a new contact and refreshes the list."""
-    name_input, phone_input, email_input = inputs
-    
-    name_input.error_text = None
-    phone_input.error_text = None
-    email_input.error_text = None
-
-    if not name_input.value.strip():
-        name_input.error_text = "Name cannot be empty."
-        page.update()
-        return
-    if name_input.value.strip():
-        if not phone_input.value.strip():
-            phone_input.error_text = "Phone must be provided."
-            page.update()
-            return
-        if not email_input.value.strip():
-            email_input.error_text = "Email must be provided."
-            page.update()
-            return
-    
-    if phone_input.value and not phone_input.value.isdigit():
-        phone_input.error_text = "Phone number must contain only digits."
-        page.update()
-        return
-    
-    add_contact_db(db_conn, name_input.value, phone_input.value, email_input.value)
-
-    for field in inputs:
-        field.value = ""
-
-    display_contacts(page, contacts_list_view, db_conn)
-    page.update()
-
-def delete_contact(page: ft.Page, contact_id: int, db_conn: any, contacts_list_view: ft.ListView):
-    """Ask for confirmation, then delete the contact if confirmed."""
-    
-    def confirm_delete(e: ft.ControlEvent):
-        delete_contact_db(db_conn, contact_id)
-        page.close(dialog)
-        display_contacts(page, contacts_list_view, db_conn)
-        page.snack_bar = ft.SnackBar(ft.Text("Contact deleted successfully."), open=True)
-        page.update()
-
-    def cancel_delete(e: ft.ControlEvent):
-        page.close(dialog)
-        page.update()
-
-    dialog = ft.AlertDialog(
-        modal=True,
-        title=ft.Text("Delete Contact"),
-        icon=ft.Icon(ft.Icons.WARNING, color=ft.Colors.RED),
-        content=ft.Text("Are you sure you want to delete this contact?"),
-        actions=[
-            ft.TextButton("Cancel", on_click=cancel_delete),
-            ft.TextButton("Delete", on_click=confirm_delete),
-        ],
-    )
-
-    page.open(dialog)
-    page.update()
-
-
-def open_edit_dialog(page: ft.Page, contact: tuple, db_conn: any, contacts_list_view: ft.ListView):
-    contact_id, name, phone, email = contact
-    
-    edit_name = ft.TextField(label="Name", value=name)
-    edit_phone = ft.TextField(label="Phone", value=phone)
-    edit_email = ft.TextField(label="Email", value=email)
-
-    def save_and_close(e: ft.ControlEvent):
-        try:
-            update_contact_db(db_conn, contact_id, edit_name.value, edit_phone.value, edit_email.value)
-            page.close(dialog)
-            display_contacts(page, contacts_list_view, db_conn)
-            page.snack_bar = ft.SnackBar(ft.Text("Contact updated successfully."), open=True)
-            page.update()
-        except Exception as e:
-            page.snack_bar = ft.SnackBar(ft.Text(f"Error updating contact: {e}"), open=True)
-            page.update()
-
-    def close_dialog(e: ft.ControlEvent):
-        page.close(dialog)
-        page.update()
-
-    dialog = ft.AlertDialog(
-        modal=True,
-        title=ft.Text("Edit Contact"),
-        content=ft.Column([edit_name, edit_phone, edit_email]),
-        actions=[
-            ft.TextButton("Cancel", on_click=close_dialog),
-            ft.TextButton("Save", on_click=save_and_close),
-        ],
-    )
-    page.open(dialog)
-    page.update()
-
-
-
+import asyncio
+import logging
+
+import flet as ft
+from database import name_key, page_order, validate_contact
+
+logger = logging.getLogger(__name__)
+
+# Contacts fetched per query; scrolling near the end fetches the next page
+PAGE_SIZE = 50
+
+# Pages kept as controls at once. Scrolling further drops the page at the
+# other end and fetches it again when the user scrolls back.
+MAX_PAGES = 3
+
+# Fixed row height, which lets the list keep its scroll position when
+# rows are added or dropped above the visible ones
+ROW_HEIGHT = 80
+
+# Distance from either end of the list (in pixels) that triggers a fetch
+LOAD_THRESHOLD = ROW_HEIGHT * 10
+
+
+class ContactListView(ft.ListView):
+    """
+    A ListView that shows contacts a page at a time.
+
+    Only the rows of MAX_PAGES pages exist as controls. Scrolling near the
+    bottom fetches the next page with its keyset cursor and, once the
+    window is full, drops the top page; scrolling back up fetches the
+    dropped pages again from their remembered cursors. Dropped row
+    controls are kept and reused for the next rows shown, with the contact
+    stored in tile.data instead of captured in closures. Memory and the
+    size of each update therefore stay the same however many contacts
+    match.
+
+    Searches show their rows in the order get_contacts_page returns them
+    (best match first). Added, edited and deleted contacts are patched into
+    the rows shown (insert_contact, replace_contact, remove_contact) rather
+    than reloading the list.
+    """
+
+    def __init__(self, store, page_size: int = PAGE_SIZE, **kwargs):
+        super().__init__(
+            item_extent=ROW_HEIGHT,
+            auto_scroll=False,
+            on_scroll=self._on_scroll,
+            on_scroll_interval=100,
+            **kwargs,
+        )
+        self.store = store  # contact_store.ContactStore (or an AsyncContactDAO)
+        self.page_size = page_size
+        self.search = ""
+        self.filter_by = "all"
+        self._page_starts = [None]  # cursor that fetches each page
+        self._first_page = 0  # number of the first page shown
+        self._row_pages = []  # tiles of each page shown
+        self._next_cursor = None  # cursor after the last page shown
+        self._spare_tiles = []
+        self._loading = False
+        self._query_id = 0  # bumped by show() so late fetches are dropped
+        self._more_button = ft.TextButton("Load more", on_click=self._on_load_more)
+
+    def show(self, rows, next_cursor, search: str = "", filter_by: str = "all"):
+        """Replaces the list with the first page of a new query (call page.update after)."""
+        self._query_id += 1
+        self.search = search
+        self.filter_by = filter_by
+        for tiles in self._row_pages:
+            self._spare_tiles.extend(tiles)
+        self._row_pages = [self._bind_tiles(rows)]
+        self._page_starts = [None]
+        self._first_page = 0
+        self._next_cursor = next_cursor
+        self._refresh_controls()
+        if self.page:
+            self.scroll_to(offset=0)
+
+    async def insert_contact(self, contact):
+        """
+        Shows a contact where the current query orders it.
+
+        Nothing is shown if the contact does not match the search, or if it
+        sorts before or after the rows shown; it then appears when that
+        part of the list is fetched. Call page.update afterwards.
+        """
+        self.remove_contact(contact[0])  # already shown, e.g. fetched after the insert
+        query_id = self._query_id
+        cursor = self._next_cursor or next(filter(None, self._page_starts), None)
+        order = page_order(self.search, cursor)
+        ids = [contact[0]]
+        if order == "rank":
+            ids += [tile.data[0] for tile in self._shown_tiles()]
+        keys = await self.store.sort_keys(ids, self.search, self.filter_by, order)
+        key = keys.get(contact[0])
+        if key is None or query_id != self._query_id:
+            return
+
+        shown = self._shown_tiles()
+        if order == "name":
+            keys.update((tile.data[0], (name_key(tile.data[1]), tile.data[0])) for tile in shown)
+
+        position = next(
+            (i for i, tile in enumerate(shown) if tile.data[0] in keys and keys[tile.data[0]] > key),
+            len(shown),
+        )
+        if shown and position == 0 and self._first_page > 0:
+            return  # belongs to a page above the window
+        if position == len(shown) and self._next_cursor is not None:
+            return  # belongs to a page below the window
+
+        tile = self._bind_tiles([contact])[0]
+        if not self._row_pages:
+            self._row_pages.append([])
+        # A row between two pages joins the later one, the page its key
+        # would be fetched with
+        for tiles in self._row_pages:
+            if position < len(tiles):
+                tiles.insert(position, tile)
+                break
+            position -= len(tiles)
+        else:
+            self._row_pages[-1].append(tile)
+        self._refresh_controls()
+
+    def remove_contact(self, contact_id):
+        """Removes a contact's row if it is shown. Call page.update afterwards."""
+        for tiles in self._row_pages:
+            for tile in tiles:
+                if tile.data[0] == contact_id:
+                    tiles.remove(tile)
+                    self._spare_tiles.append(tile)
+                    self._refresh_controls()
+                    return
+
+    async def replace_contact(self, contact_id, contact):
+        """Moves an edited contact to where it now sorts (contact None removes it)."""
+        self.remove_contact(contact_id)
+        if contact is not None:
+            # The freed tile is the next spare, so an unmoved row keeps its control
+            await self.insert_contact(contact)
+
+    async def apply_event(self, event):
+        """Applies a contact_store.ContactEvent from another session."""
+        if event.kind == "deleted":
+            self.remove_contact(event.contact_id)
+        else:
+            await self.replace_contact(event.contact_id, event.contact)
+
+    async def load_next(self):
+        """Fetches and appends the page after the last one shown."""
+        if self._loading or self._next_cursor is None:
+            return
+        cursor = self._next_cursor
+        rows, next_cursor = await self._fetch(cursor)
+        if rows is None:
+            return
+        rows = self._unshown(rows)
+
+        number = self._first_page + len(self._row_pages)
+        if len(self._page_starts) == number:
+            self._page_starts.append(cursor)
+        self._row_pages.append(self._bind_tiles(rows))
+        self._next_cursor = next_cursor
+
+        dropped = 0
+        if len(self._row_pages) > MAX_PAGES:
+            dropped = self._drop(0)
+            self._first_page += 1
+        self._refresh_controls()
+        self.update()
+        if dropped:
+            # Rows vanished above the viewport; move up by as much to stay put
+            self.scroll_to(delta=-dropped * ROW_HEIGHT)
+
+    async def load_previous(self):
+        """Fetches again and prepends the page before the first one shown."""
+        if self._loading or self._first_page == 0:
+            return
+        rows, _ = await self._fetch(self._page_starts[self._first_page - 1])
+        if rows is None:
+            return
+        rows = self._unshown(rows)
+
+        self._row_pages.insert(0, self._bind_tiles(rows))
+        self._first_page -= 1
+        if len(self._row_pages) > MAX_PAGES:
+            self._drop(-1)
+            self._next_cursor = self._page_starts[self._first_page + len(self._row_pages)]
+        self._refresh_controls()
+        self.update()
+        self.scroll_to(delta=len(rows) * ROW_HEIGHT)
+
+    async def _fetch(self, cursor):
+        """Runs one page query; rows is None if a newer query replaced the list meanwhile."""
+        self._loading = True
+        query_id = self._query_id
+        try:
+            rows, next_cursor = await self.store.get_page(
+                self.search, self.filter_by, cursor, self.page_size,
+            )
+        finally:
+            self._loading = False
+        if query_id != self._query_id:
+            return None, None
+        return rows, next_cursor
+
+    async def _on_scroll(self, e: ft.OnScrollEvent):
+        if e.pixels >= e.max_scroll_extent - LOAD_THRESHOLD:
+            await self.load_next()
+        elif e.pixels <= e.min_scroll_extent + LOAD_THRESHOLD:
+            await self.load_previous()
+
+    async def _on_load_more(self, e):
+        await self.load_next()
+
+    def _drop(self, index):
+        """Removes one page of rows from the window; returns how many rows it had."""
+        tiles = self._row_pages.pop(index)
+        self._spare_tiles.extend(tiles)
+        return len(tiles)
+
+    def _shown_tiles(self):
+        return [tile for tiles in self._row_pages for tile in tiles]
+
+    def _unshown(self, rows):
+        """Drops fetched rows already shown (rows inserted since their page was read)."""
+        shown = {tile.data[0] for tile in self._shown_tiles()}
+        return [row for row in rows if row[0] not in shown]
+
+    def _refresh_controls(self):
+        self.controls = self._shown_tiles()
+        if self._next_cursor is not None:
+            self.controls.append(self._more_button)
+
+    def _bind_tiles(self, rows):
+        tiles = []
+        for contact in rows:
+            tile = self._spare_tiles.pop() if self._spare_tiles else self._new_tile()
+            contact_id, name, phone, email = contact
+            tile.data = contact
+            tile.title.value = name
+            tile.subtitle.value = f"Phone: {phone} | Email: {email}"
+            tiles.append(tile)
+        return tiles
+
+    def _new_tile(self):
+        tile = ft.ListTile(title=ft.Text(), subtitle=ft.Text())
+        # Menu items find their contact through the tile they belong to
+        tile.trailing = ft.PopupMenuButton(
+            icon=ft.Icons.MORE_HORIZ,
+            items=[
+                ft.PopupMenuItem(text="Edit", icon=ft.Icons.EDIT, on_click=self._on_edit, data=tile),
+                ft.PopupMenuItem(),
+                ft.PopupMenuItem(text="Delete", icon=ft.Icons.DELETE, on_click=self._on_delete, data=tile),
+            ],
+        )
+        return tile
+
+    def _on_edit(self, e):
+        open_edit_dialog(self.page, e.control.data.data, self.store, self)
+
+    def _on_delete(self, e):
+        delete_contact(self.page, e.control.data.data[0], self.store, self)
+
+
+async def display_contacts(page, contacts_list_view, store, search: str = "", filter_by: str = "all"):
+    """Shows the first page of matching contacts; more load as the list scrolls."""
+    rows, next_cursor = await store.get_page(search, filter_by, None, contacts_list_view.page_size)
+    contacts_list_view.show(rows, next_cursor, search, filter_by)
+    page.update()
+
+class DebouncedSearch:
+    """
+    Runs the searches typed into the search box, showing only the latest.
+
+    Every run() bumps a generation number. A search first waits for typing
+    to pause (delay); if another search started meanwhile it gives up, and
+    if one starts while its query runs its result is dropped. A query that
+    fails is logged and the list is emptied, with the error in a snack bar.
+    """
+
+    def __init__(self, page, contacts_list_view):
+        self.page = page
+        self.contacts_list_view = contacts_list_view
+        self.generation = 0
+
+    async def run(self, search, filter_by="all", delay=0.0):
+        """Searches unless superseded; returns whether the list was updated."""
+        self.generation += 1
+        generation = self.generation
+
+        await asyncio.sleep(delay)
+        if generation != self.generation:
+            return False  # more typing arrived while waiting
+
+        view = self.contacts_list_view
+        error = None
+        try:
+            # Query off the event loop so typing stays responsive
+            rows, next_cursor = await view.store.get_page(search, filter_by, None, view.page_size)
+        except Exception as e:
+            logger.exception("Search for %r (filter %s) failed", search, filter_by)
+            rows, next_cursor, error = [], None, e
+        if generation != self.generation:
+            return False  # superseded while the query ran; drop the stale result
+
+        view.show(rows, next_cursor, search, filter_by)
+        if error is not None:
+            self.page.snack_bar = ft.SnackBar(ft.Text(f"Search failed: {error}"), open=True)
+        self.page.update()
+        return True
+
+
+async def add_contact(page, inputs, contacts_list_view, store):
+
+    """Adds a new contact and shows it in the list."""
+    name_input, phone_input, email_input = inputs
+    
+    name_input.error_text = None
+    phone_input.error_text = None
+    email_input.error_text = None
+
+    problem = validate_contact(name_input.value, phone_input.value, email_input.value)
+    if problem:
+        field, message = problem
+        fields = {"name": name_input, "phone": phone_input, "email": email_input}
+        fields[field].error_text = message
+        page.update()
+        return
+
+    contact = await store.add(name_input.value, phone_input.value, email_input.value, origin=page)
+
+    for field in inputs:
+        field.value = ""
+
+    await contacts_list_view.insert_contact(contact)
+    page.update()
+
+def delete_contact(page: ft.Page, contact_id: int, store: any, contacts_list_view: ft.ListView):
+    """Ask for confirmation, then delete the contact if confirmed."""
+    
+    async def confirm_delete(e: ft.ControlEvent):
+        await store.delete(contact_id, origin=page)
+        page.close(dialog)
+        contacts_list_view.remove_contact(contact_id)
+        page.snack_bar = ft.SnackBar(ft.Text("Contact deleted successfully."), open=True)
+        page.update()
+
+    def cancel_delete(e: ft.ControlEvent):
+        page.close(dialog)
+        page.update()
+
+    dialog = ft.AlertDialog(
+        modal=True,
+        title=ft.Text("Delete Contact"),
+        icon=ft.Icon(ft.Icons.WARNING, color=ft.Colors.RED),
+        content=ft.Text("Are you sure you want to delete this contact?"),
+        actions=[
+            ft.TextButton("Cancel", on_click=cancel_delete),
+            ft.TextButton("Delete", on_click=confirm_delete),
+        ],
+    )
+
+    page.open(dialog)
+    page.update()
+
+
+def open_edit_dialog(page: ft.Page, contact: tuple, store: any, contacts_list_view: ft.ListView):
+    contact_id, name, phone, email = contact
+    
+    edit_name = ft.TextField(label="Name", value=name)
+    edit_phone = ft.TextField(label="Phone", value=phone)
+    edit_email = ft.TextField(label="Email", value=email)
+
+    async def save_and_close(e: ft.ControlEvent):
+        try:
+            contact = await store.update(
+                contact_id, edit_name.value, edit_phone.value, edit_email.value, origin=page
+            )
+            page.close(dialog)
+            await contacts_list_view.replace_contact(contact_id, contact)
+            page.snack_bar = ft.SnackBar(ft.Text("Contact updated successfully."), open=True)
+            page.update()
+        except Exception as e:
+            page.snack_bar = ft.SnackBar(ft.Text(f"Error updating contact: {e}"), open=True)
+            page.update()
+
+    def close_dialog(e: ft.ControlEvent):
+        page.close(dialog)
+        page.update()
+
+    dialog = ft.AlertDialog(
+        modal=True,
+        title=ft.Text("Edit Contact"),
+        content=ft.Column([edit_name, edit_phone, edit_email]),
+        actions=[
+            ft.TextButton("Cancel", on_click=close_dialog),
+            ft.TextButton("Save", on_click=save_and_close),
+        ],
+    )
+    page.open(dialog)
+    page.update()
+
+
+
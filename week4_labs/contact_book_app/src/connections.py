@@ -0,0 +1,165 @@
+# connections.py
+"""
+Shared SQLite connections for the contact book.
+
+The web app serves every browser session from one process. Instead of a
+connection per session, all sessions share one ConnectionManager per
+database file:
+
+- one writer connection, used by one thread at a time (a lock), so
+  in-process writes queue up instead of failing with "database is locked"
+- a small pool of read-only connections; in WAL mode reads never wait for
+  the writer or for each other
+
+The database functions accept a manager wherever they take a connection,
+and check out the right kind of connection for each call.
+"""
+
+import atexit
+import os
+import queue
+import sqlite3
+import threading
+from contextlib import contextmanager
+
+from database import connect, db_path, migrate
+
+# Read connections opened at most per database
+DEFAULT_MAX_READERS = 4
+
+_managers = {}
+_managers_lock = threading.Lock()
+
+
+class ConnectionManager:
+    """Pooled readers and a single serialized writer for one database file."""
+
+    def __init__(self, path=None, max_readers=DEFAULT_MAX_READERS):
+        self.path = db_path(path)
+        self.max_readers = max_readers
+        self._writer = connect(self.path)
+        self._write_lock = threading.Lock()
+        self._readers = queue.LifoQueue()
+        self._opened_readers = 0
+        self._readers_lock = threading.Lock()
+        self._closed = False
+        self._changes = 0  # mark_changed calls
+        self._data_version = None
+        # Before any reader opens, so readers always see the current schema
+        migrate(self._writer)
+
+    @contextmanager
+    def writer(self):
+        """The writer connection, held exclusively for the with block."""
+        with self._write_lock:
+            self._check_open()
+            try:
+                yield self._writer
+            except BaseException:
+                if self._writer.in_transaction:
+                    self._writer.rollback()
+                raise
+
+    @contextmanager
+    def reader(self):
+        """A read-only connection from the pool, returned to it afterwards."""
+        conn = self._take_reader()
+        try:
+            yield conn
+        finally:
+            if conn.in_transaction:
+                conn.rollback()
+            self._return_reader(conn)
+
+    def version(self):
+        """
+        A value that changes when the data may have changed without the
+        caller knowing: when another process commits (the writer's PRAGMA
+        data_version, which writes through this manager leave alone), or
+        when mark_changed is called.
+
+        Never waits for the writer: while it is busy the last data_version
+        read is used, and a change is seen on a later call.
+        """
+        if self._write_lock.acquire(blocking=False):
+            try:
+                self._check_open()
+                self._data_version = self._writer.execute("PRAGMA data_version").fetchone()[0]
+            finally:
+                self._write_lock.release()
+        return self._changes, self._data_version
+
+    def mark_changed(self):
+        """Records a bulk change (e.g. an import) that in-memory copies must reload."""
+        with self._readers_lock:
+            self._changes += 1
+
+    def _take_reader(self):
+        self._check_open()
+        try:
+            conn = self._readers.get_nowait()
+        except queue.Empty:
+            with self._readers_lock:
+                if self._opened_readers < self.max_readers:
+                    self._opened_readers += 1
+                    return connect(self.path, read_only=True)
+            # Pool exhausted: wait for a reader to come back
+            conn = self._readers.get()
+        if conn is None:  # closed meanwhile (see _return_reader)
+            self._readers.put(None)  # for the next waiter
+            self._check_open()
+        return conn
+
+    def _return_reader(self, conn):
+        # Under the lock close() drains the pool with, so a reader is
+        # either drained by close() or sees it closed here
+        with self._readers_lock:
+            if not self._closed:
+                self._readers.put(conn)
+                return
+        conn.close()
+        self._readers.put(None)  # wakes anyone waiting for a reader
+
+    def _check_open(self):
+        if self._closed:
+            raise sqlite3.ProgrammingError(f"Connections to {self.path} are closed")
+
+    def close(self):
+        """Closes the writer and every idle reader; readers in use close when returned."""
+        with self._write_lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._writer.execute("PRAGMA optimize")
+            self._writer.close()
+        with self._readers_lock:
+            while True:
+                try:
+                    conn = self._readers.get_nowait()
+                except queue.Empty:
+                    break
+                if conn is not None:
+                    conn.close()
+
+    def __repr__(self):
+        return f"<ConnectionManager {self.path} readers={self._opened_readers}>"
+
+
+def get_manager(path=None):
+    """The process-wide ConnectionManager for a database, created (and migrated) once."""
+    key = os.path.abspath(db_path(path))
+    with _managers_lock:
+        manager = _managers.get(key)
+        if manager is None:
+            manager = _managers[key] = ConnectionManager(key)
+        return manager
+
+
+@atexit.register
+def close_all():
+    """Closes every manager made by get_manager."""
+    with _managers_lock:
+        managers = list(_managers.values())
+        _managers.clear()
+    for manager in managers:
+        manager.close()
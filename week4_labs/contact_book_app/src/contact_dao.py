@@ -0,0 +1,190 @@
+# contact_dao.py
+"""
+Async access to the contacts database for the Flet event loop.
+
+sqlite3 calls block, so every operation runs on a small pool of database
+threads and the caller awaits the result. The number of operations waiting
+for or holding a thread is bounded: once max_pending are outstanding,
+further callers wait their turn on the event loop (nothing else is
+blocked) instead of piling work onto the pool.
+
+stats() reports queue depth and query timings:
+
+    {"pending": 3, "running": 2, "completed": 1520, "failed": 0,
+     "operations": {"get_page": {"count": 1400, "avg_ms": 1.8, "max_ms": 24.0,
+                                 "avg_wait_ms": 0.1}, ...}}
+"""
+
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from connections import DEFAULT_MAX_READERS, get_manager
+from database import (
+    DEFAULT_PAGE_SIZE, add_contact_db, delete_contact_db, get_all_contacts_db,
+    get_contacts_page, get_sort_keys, update_contact_db,
+)
+
+# Operations allowed to wait for or run on a database thread at once
+DEFAULT_MAX_PENDING = 64
+
+_daos = {}
+_daos_lock = threading.Lock()
+
+
+class _OperationStats:
+    __slots__ = ("count", "failed", "total", "longest", "waited")
+
+    def __init__(self):
+        self.count = 0
+        self.failed = 0
+        self.total = 0.0  # seconds spent running
+        self.longest = 0.0
+        self.waited = 0.0  # seconds spent queued before running
+
+    def summary(self):
+        return {
+            "count": self.count,
+            "failed": self.failed,
+            "avg_ms": round(self.total / self.count * 1000, 2) if self.count else 0.0,
+            "max_ms": round(self.longest * 1000, 2),
+            "avg_wait_ms": round(self.waited / self.count * 1000, 2) if self.count else 0.0,
+        }
+
+
+class AsyncContactDAO:
+    """
+    Awaitable versions of the database.py operations.
+
+    Args:
+        db: A connection or connections.ConnectionManager
+        max_workers: Database threads (defaults to one per pooled reader
+            plus one for the writer)
+        max_pending: Operations queued or running at once before callers
+            have to wait
+    """
+
+    def __init__(self, db, max_workers=DEFAULT_MAX_READERS + 1, max_pending=DEFAULT_MAX_PENDING):
+        self.db = db
+        self.max_pending = max_pending
+        self._executor = ThreadPoolExecutor(max_workers, thread_name_prefix="contacts-db")
+        # Made on first use: the DAO may be built on a thread with no event loop
+        self._slots = None
+        self._waiting = 0  # for a slot
+        self._queued = set()  # jobs submitted to the pool, not started yet
+        self._running = 0
+        self._stats = {}
+        self._lock = threading.Lock()
+
+    # Operations
+
+    async def add(self, name, phone, email):
+        """add_contact_db; returns the new (id, name, phone, email)."""
+        return await self._run("add", add_contact_db, name, phone, email)
+
+    async def update(self, contact_id, name, phone, email):
+        """update_contact_db; returns the new row or None."""
+        return await self._run("update", update_contact_db, contact_id, name, phone, email)
+
+    async def delete(self, contact_id):
+        """delete_contact_db; returns the deleted row or None."""
+        return await self._run("delete", delete_contact_db, contact_id)
+
+    async def get_page(self, search="", filter_by="all", cursor=None, limit=DEFAULT_PAGE_SIZE):
+        """get_contacts_page; returns (rows, next_cursor)."""
+        return await self._run("get_page", get_contacts_page, search, filter_by, cursor, limit)
+
+    async def search(self, search, filter_by="all", limit=DEFAULT_PAGE_SIZE):
+        """First page of a search; returns (rows, next_cursor)."""
+        return await self.get_page(search, filter_by, None, limit)
+
+    async def all(self, search="", filter_by="all"):
+        """get_all_contacts_db; returns every matching row in list order."""
+        return await self._run("all", get_all_contacts_db, search, filter_by)
+
+    async def sort_keys(self, contact_ids, search="", filter_by="all", order="name"):
+        """get_sort_keys; returns {id: key}."""
+        return await self._run("sort_keys", get_sort_keys, contact_ids, search, filter_by, order)
+
+    # Machinery
+
+    async def _run(self, name, function, *args):
+        slots = self._pending_slots()
+        with self._lock:
+            self._waiting += 1
+        try:
+            await slots.acquire()
+        finally:
+            with self._lock:
+                self._waiting -= 1
+
+        job = object()
+        try:
+            with self._lock:
+                self._queued.add(job)
+            queued = time.perf_counter()
+            return await asyncio.get_running_loop().run_in_executor(
+                self._executor, self._call, job, name, queued, function, args,
+            )
+        finally:
+            # Still there if the caller was cancelled before the job started
+            with self._lock:
+                self._queued.discard(job)
+            slots.release()
+
+    def _pending_slots(self):
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.max_pending)
+        return self._slots
+
+    def _call(self, job, name, queued, function, args):
+        """Runs on a database thread."""
+        started = time.perf_counter()
+        with self._lock:
+            self._queued.discard(job)
+            self._running += 1
+        failed = False
+        try:
+            return function(self.db, *args)
+        except BaseException:
+            failed = True
+            raise
+        finally:
+            elapsed = time.perf_counter() - started
+            with self._lock:
+                self._running -= 1
+                stats = self._stats.get(name)
+                if stats is None:
+                    stats = self._stats[name] = _OperationStats()
+                stats.count += 1
+                stats.failed += failed
+                stats.total += elapsed
+                stats.longest = max(stats.longest, elapsed)
+                stats.waited += started - queued
+
+    def stats(self):
+        """Queue depth and per-operation timings (see module docstring)."""
+        with self._lock:
+            operations = {name: s.summary() for name, s in self._stats.items()}
+            return {
+                "pending": self._waiting + len(self._queued),
+                "running": self._running,
+                "completed": sum(s["count"] for s in operations.values()),
+                "failed": sum(s["failed"] for s in operations.values()),
+                "operations": operations,
+            }
+
+    def close(self):
+        """Waits for running operations and stops the database threads."""
+        self._executor.shutdown(wait=True)
+
+
+def get_dao(path=None):
+    """The process-wide AsyncContactDAO for a database (see connections.get_manager)."""
+    manager = get_manager(path)
+    with _daos_lock:
+        dao = _daos.get(manager.path)
+        if dao is None:
+            dao = _daos[manager.path] = AsyncContactDAO(manager)
+        return dao
@@ -0,0 +1,367 @@
+# contact_io.py
+"""
+Bulk import and export of contacts as CSV or vCard.
+
+Files are streamed: records are read, validated (with the same rules as
+the Add Contact form) and inserted in chunks of executemany calls, each
+chunk in one transaction, so memory use does not depend on the file size
+and a 200k-line file costs a few dozen commits instead of 200k.
+
+    python contact_io.py import contacts.csv
+    python contact_io.py import phone.vcf --rejects rejected.csv
+    python contact_io.py import big.csv --defer-index
+    python contact_io.py export backup.vcf --search smith
+
+Rejected records are counted and can be written to a CSV file with the
+line they came from and the reason.
+"""
+
+import argparse
+import csv
+import sys
+import time
+from dataclasses import dataclass, field
+from itertools import islice
+
+from connections import get_manager
+from database import FTS_TRIGGERS, iter_contacts, mark_changed, validate_contact, writing
+from fuzzy import index_terms, name_words, rebuild_terms
+
+# Rows per executemany call and per transaction
+DEFAULT_CHUNK_SIZE = 5000
+
+# Rejected records kept on ImportResult; all of them are still counted and
+# passed to on_reject
+MAX_KEPT_REJECTS = 100
+
+# CSV header (case-insensitive) -> contact field
+CSV_COLUMNS = {
+    "name": "name",
+    "full name": "name",
+    "phone": "phone",
+    "phone number": "phone",
+    "email": "email",
+    "e-mail": "email",
+}
+
+INSERT_SQL = "INSERT INTO contacts (name, phone, email) VALUES (?, ?, ?)"
+
+
+@dataclass
+class Rejected:
+    """One record that failed validation."""
+
+    line: int
+    reason: str
+    name: str
+    phone: str
+    email: str
+
+
+@dataclass
+class ImportResult:
+    """Counts of an import and the first MAX_KEPT_REJECTS rejected records."""
+
+    imported: int = 0
+    rejected: int = 0
+    rejects: list = field(default_factory=list)
+    seconds: float = 0.0
+
+    @property
+    def rows_per_second(self):
+        return self.imported / self.seconds if self.seconds else 0.0
+
+
+def guess_format(path):
+    """"vcard" for .vcf/.vcard files, "csv" for anything else."""
+    return "vcard" if path.lower().endswith((".vcf", ".vcard")) else "csv"
+
+
+def read_csv(f):
+    """
+    Yields (line, name, phone, email) from a CSV file with a header row.
+
+    Columns are matched by header name (see CSV_COLUMNS); other columns are
+    ignored and missing ones read as empty.
+    """
+    reader = csv.reader(f)
+    header = next(reader, None)
+    if header is None:
+        return
+    positions = {}
+    for index, title in enumerate(header):
+        column = CSV_COLUMNS.get(title.strip().lower())
+        if column and column not in positions:
+            positions[column] = index
+    if "name" not in positions:
+        raise ValueError(f"CSV header has no name column: {header}")
+
+    def cell(row, column):
+        index = positions.get(column)
+        return row[index].strip() if index is not None and index < len(row) else ""
+
+    for row in reader:
+        if not any(value.strip() for value in row):
+            continue  # blank line
+        yield reader.line_num, cell(row, "name"), cell(row, "phone"), cell(row, "email")
+
+
+def _unfold(f):
+    """Yields (line number, logical line) from a vCard file, joining folded lines."""
+    current, start = None, 0
+    for number, line in enumerate(f, start=1):
+        line = line.rstrip("\r\n")
+        if line[:1] in (" ", "\t") and current is not None:
+            current += line[1:]
+            continue
+        if current is not None:
+            yield start, current
+        current, start = line, number
+    if current is not None:
+        yield start, current
+
+
+def _unescape(value):
+    out = []
+    chars = iter(value)
+    for ch in chars:
+        if ch == "\\":
+            escaped = next(chars, "")
+            out.append("\n" if escaped in ("n", "N") else escaped)
+        else:
+            out.append(ch)
+    return "".join(out)
+
+
+def read_vcard(f):
+    """
+    Yields (line, name, phone, email) for each card of a vCard (2.1-4.0) file.
+
+    The name is FN, or N's given and family names when FN is missing; the
+    first TEL and EMAIL are used.
+    """
+    card = None
+    for number, line in _unfold(f):
+        if ":" not in line:
+            continue
+        key, value = line.split(":", 1)
+        # "item1.TEL;TYPE=CELL" -> "TEL"
+        prop = key.split(";", 1)[0].rsplit(".", 1)[-1].upper()
+
+        if prop == "BEGIN" and value.strip().upper() == "VCARD":
+            card = {"line": number}
+        elif card is None:
+            continue
+        elif prop == "END":
+            name = card.get("FN") or card.get("N", "")
+            yield card["line"], name, card.get("TEL", ""), card.get("EMAIL", "")
+            card = None
+        elif prop == "N" and "N" not in card:
+            family, given = (value.split(";") + ["", ""])[:2]
+            card["N"] = " ".join(_unescape(part).strip() for part in (given, family) if part.strip())
+        elif prop in ("FN", "TEL", "EMAIL") and prop not in card:
+            card[prop] = _unescape(value).strip()
+
+
+READERS = {"csv": read_csv, "vcard": read_vcard}
+
+
+def _chunks(iterable, size):
+    iterator = iter(iterable)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+def import_contacts(db, records, chunk_size=DEFAULT_CHUNK_SIZE, defer_index=False,
+                    on_reject=None):
+    """
+    Validates and inserts (line, name, phone, email) records.
+
+    Valid rows go in with executemany, chunk_size rows per transaction.
+    The fuzzy search words of the new names are added once, after the
+    last chunk. With defer_index the full-text index triggers are
+    dropped, and the index and the fuzzy search words are rebuilt once
+    at the end; the whole import then runs in a single transaction so
+    the index can never be left out of step. That is much faster when
+    the import is large compared to the table.
+
+    db is a connection or a ConnectionManager (whose writer is held for
+    the whole import, and which is marked changed afterwards so in-memory
+    copies reload). on_reject, if given, is called with each Rejected
+    record.
+
+    Returns an ImportResult.
+    """
+    result = ImportResult()
+    started = time.perf_counter()
+
+    def valid_rows():
+        for line, name, phone, email in records:
+            problem = validate_contact(name, phone, email)
+            if problem is None:
+                yield name, phone, email
+                continue
+            rejected = Rejected(line, problem[1], name, phone, email)
+            result.rejected += 1
+            if len(result.rejects) < MAX_KEPT_REJECTS:
+                result.rejects.append(rejected)
+            if on_reject:
+                on_reject(rejected)
+
+    try:
+        with writing(db) as conn:
+            if defer_index:
+                conn.execute("BEGIN")
+                try:
+                    for trigger in ("contacts_fts_insert", "contacts_fts_delete", "contacts_fts_update"):
+                        conn.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+                    for chunk in _chunks(valid_rows(), chunk_size):
+                        conn.executemany(INSERT_SQL, chunk)
+                        result.imported += len(chunk)
+                    conn.execute("INSERT INTO contacts_fts (contacts_fts) VALUES ('rebuild')")
+                    rebuild_terms(conn)
+                    for statement in FTS_TRIGGERS:
+                        conn.execute(statement)
+                    conn.execute("COMMIT")
+                except BaseException:
+                    conn.execute("ROLLBACK")
+                    raise
+            else:
+                terms = set()
+                try:
+                    for chunk in _chunks(valid_rows(), chunk_size):
+                        with conn:
+                            conn.executemany(INSERT_SQL, chunk)
+                        terms |= name_words(name for name, _, _ in chunk)
+                        result.imported += len(chunk)
+                finally:
+                    # Fuzzy search words of every committed chunk, added once
+                    with conn:
+                        index_terms(conn, terms)
+    finally:
+        # Imports bypass contact_store; make it reload
+        mark_changed(db)
+
+    result.seconds = time.perf_counter() - started
+    return result
+
+
+def write_csv(f, contacts):
+    """Writes (id, name, phone, email) rows as CSV with a name,phone,email header."""
+    writer = csv.writer(f)
+    writer.writerow(("name", "phone", "email"))
+    count = 0
+    for _, name, phone, email in contacts:
+        writer.writerow((name, phone, email))
+        count += 1
+    return count
+
+
+def _escape(value):
+    return (
+        (value or "")
+        .replace("\\", "\\\\")
+        .replace(",", "\\,")
+        .replace(";", "\\;")
+        .replace("\n", "\\n")
+    )
+
+
+def _fold(line):
+    """Splits a content line into 75-character pieces as RFC 6350 asks."""
+    if len(line) <= 75:
+        return line + "\r\n"
+    pieces = [line[:75]] + [" " + line[i:i + 74] for i in range(75, len(line), 74)]
+    return "\r\n".join(pieces) + "\r\n"
+
+
+def write_vcard(f, contacts):
+    """Writes (id, name, phone, email) rows as vCard 4.0 cards."""
+    count = 0
+    for _, name, phone, email in contacts:
+        f.write("BEGIN:VCARD\r\nVERSION:4.0\r\n")
+        f.write(_fold(f"FN:{_escape(name)}"))
+        if phone:
+            f.write(_fold(f"TEL:{_escape(phone)}"))
+        if email:
+            f.write(_fold(f"EMAIL:{_escape(email)}"))
+        f.write("END:VCARD\r\n")
+        count += 1
+    return count
+
+
+WRITERS = {"csv": write_csv, "vcard": write_vcard}
+
+
+def _open(path, mode):
+    # newline="" lets csv handle line endings and keeps vCard's CRLF as written
+    if path == "-":
+        stream = sys.stdin if "r" in mode else sys.stdout
+        stream.reconfigure(newline="")
+        return stream
+    return open(path, mode, encoding="utf-8-sig" if "r" in mode else "utf-8", newline="")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Import or export contacts as CSV or vCard.")
+    parser.add_argument("--db", help="database file (default: CONTACTS_DB_PATH or src/contacts.db)")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    importer = commands.add_parser("import", help="add contacts from a file")
+    importer.add_argument("file", help="CSV or vCard file, or - for stdin")
+    importer.add_argument("--format", choices=sorted(READERS))
+    importer.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    importer.add_argument("--defer-index", action="store_true",
+                          help="rebuild the search index once at the end (large imports)")
+    importer.add_argument("--rejects", metavar="FILE", help="write rejected records as CSV")
+
+    exporter = commands.add_parser("export", help="write contacts to a file")
+    exporter.add_argument("file", help="CSV or vCard file, or - for stdout")
+    exporter.add_argument("--format", choices=sorted(WRITERS))
+    exporter.add_argument("--search", default="")
+    exporter.add_argument("--filter", default="all", choices=("all", "name", "phone", "email", "fuzzy"))
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    db = get_manager(args.db)
+    file_format = args.format or guess_format(args.file)
+
+    if args.command == "export":
+        with _open(args.file, "w") as f:
+            count = WRITERS[file_format](f, iter_contacts(db, args.search, args.filter, page_size=1000))
+        print(f"Exported {count} contacts", file=sys.stderr)
+        return 0
+
+    rejects_file = open(args.rejects, "w", encoding="utf-8", newline="") if args.rejects else None
+    try:
+        on_reject = None
+        if rejects_file:
+            rejects_writer = csv.writer(rejects_file)
+            rejects_writer.writerow(("line", "reason", "name", "phone", "email"))
+            on_reject = lambda r: rejects_writer.writerow((r.line, r.reason, r.name, r.phone, r.email))
+
+        with _open(args.file, "r") as f:
+            result = import_contacts(
+                db, READERS[file_format](f), args.chunk_size, args.defer_index, on_reject,
+            )
+    finally:
+        if rejects_file:
+            rejects_file.close()
+
+    print(
+        f"Imported {result.imported} contacts in {result.seconds:.2f}s "
+        f"({result.rows_per_second:,.0f}/s), rejected {result.rejected}",
+        file=sys.stderr,
+    )
+    if not rejects_file:
+        for r in result.rejects[:10]:
+            print(f"  line {r.line}: {r.reason}", file=sys.stderr)
+        if result.rejected > 10:
+            print(f"  ... use --rejects FILE to list all {result.rejected}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
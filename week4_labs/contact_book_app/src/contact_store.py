@@ -0,0 +1,195 @@
+# contact_store.py
+"""
+One in-memory copy of the contacts, shared by every browser session.
+
+The store loads all contacts, in list order, and keeps them in step by
+making every write itself: add/update/delete go through the DAO to the
+database, then patch the copy and publish a ContactEvent on the
+CONTACTS_TOPIC pubsub topic to the other sessions, which patch their lists
+instead of reloading.
+
+The plain contact list (no search), which is what every session opens on
+and scrolls through, is paged from memory with the same keyset cursors as
+get_contacts_page. Searches still go to the full-text index.
+
+Writes that bypass the store are picked up by reloading: before memory is
+used, database.data_version is checked, which changes when another process
+commits or an in-process import calls ConnectionManager.mark_changed.
+Sessions see the reloaded contacts on their next fetch.
+"""
+
+import asyncio
+import threading
+from bisect import bisect_left, bisect_right, insort
+from dataclasses import dataclass
+from typing import Optional
+
+from contact_dao import get_dao
+from database import DEFAULT_PAGE_SIZE, data_version, decode_cursor, encode_cursor, name_key
+
+CONTACTS_TOPIC = "contacts"
+
+_stores = {}
+_stores_lock = threading.Lock()
+
+
+@dataclass(frozen=True)
+class ContactEvent:
+    """A change published to the other sessions."""
+
+    kind: str  # "added", "updated" or "deleted"
+    contact_id: int
+    contact: Optional[tuple] = None  # the new row; None for "deleted"
+
+
+class ContactStore:
+    """
+    Contacts kept in memory in list order, with write-through to the database.
+
+    Offers the same get_page/sort_keys calls as AsyncContactDAO, so a
+    ContactListView can read from either.
+    """
+
+    def __init__(self, dao):
+        self.dao = dao
+        self._rows = {}  # id -> (id, name, phone, email)
+        self._order = []  # (name_key, id) of every contact, sorted like ORDER_BY
+        self._loaded = False
+        self._version = None  # data_version the copy was loaded at
+        self._lock = None  # held by loads and writes
+        self.memory_reads = 0
+        self.database_reads = 0
+        self.loads = 0
+
+    # Reads
+
+    async def load(self):
+        """
+        Reads every contact, the first time and whenever the database has
+        been changed behind the store's back; otherwise returns at once.
+        """
+        if self._loaded and self._version == data_version(self.dao.db):
+            return
+        async with self._locked():
+            await self._reload_if_stale()
+
+    async def get_page(self, search="", filter_by="all", cursor=None, limit=DEFAULT_PAGE_SIZE):
+        """Like get_contacts_page; the unsearched list is served from memory."""
+        if search.strip():
+            self.database_reads += 1
+            return await self.dao.get_page(search, filter_by, cursor, limit)
+
+        await self.load()
+        self.memory_reads += 1
+        start = 0
+        if cursor:
+            name, contact_id = decode_cursor(cursor, "name")
+            start = bisect_right(self._order, (name_key(name), contact_id))
+        rows = [self._rows[i] for _, i in self._order[start:start + limit + 1]]
+        if len(rows) > limit:
+            rows = rows[:limit]
+            return rows, encode_cursor("name", rows[-1][1], rows[-1][0])
+        return rows, None
+
+    async def sort_keys(self, contact_ids, search="", filter_by="all", order="name"):
+        """Like get_sort_keys; answered from memory when there is no search."""
+        if search.strip() or order != "name":
+            self.database_reads += 1
+            return await self.dao.sort_keys(contact_ids, search, filter_by, order)
+
+        await self.load()
+        self.memory_reads += 1
+        return {i: self._sort_key(i) for i in contact_ids if i in self._rows}
+
+    def contact(self, contact_id):
+        """The stored row of a contact, or None."""
+        return self._rows.get(contact_id)
+
+    def __len__(self):
+        return len(self._rows)
+
+    # Writes
+
+    # Writes. Each holds the lock, so a reload never runs between the
+    # database write and the patch of the copy.
+
+    async def add(self, name, phone, email, origin=None):
+        """Adds a contact; origin is the ft.Page making the change (it is not notified)."""
+        async with self._locked():
+            await self._reload_if_stale()
+            contact = await self.dao.add(name, phone, email)
+            self._put(contact)
+        self._publish(origin, ContactEvent("added", contact[0], contact))
+        return contact
+
+    async def update(self, contact_id, name, phone, email, origin=None):
+        """Updates a contact; returns the new row or None if it was gone."""
+        async with self._locked():
+            await self._reload_if_stale()
+            contact = await self.dao.update(contact_id, name, phone, email)
+            self._remove(contact_id)
+            if contact is not None:
+                self._put(contact)
+        if contact is None:
+            self._publish(origin, ContactEvent("deleted", contact_id))
+        else:
+            self._publish(origin, ContactEvent("updated", contact_id, contact))
+        return contact
+
+    async def delete(self, contact_id, origin=None):
+        """Deletes a contact; returns the deleted row or None."""
+        async with self._locked():
+            await self._reload_if_stale()
+            contact = await self.dao.delete(contact_id)
+            self._remove(contact_id)
+        self._publish(origin, ContactEvent("deleted", contact_id))
+        return contact
+
+    # Internals
+
+    def _locked(self):
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        return self._lock
+
+    async def _reload_if_stale(self):
+        """Loads every contact unless the copy is current (call with the lock held)."""
+        # Read before loading, so a change made during the load is seen next time
+        version = data_version(self.dao.db)
+        if self._loaded and self._version == version:
+            return
+        rows = await self.dao.all()
+        self._rows = {row[0]: row for row in rows}
+        self._order = [(name_key(row[1]), row[0]) for row in rows]  # already in list order
+        self._version = version
+        self._loaded = True
+        self.loads += 1
+
+    def _sort_key(self, contact_id):
+        return name_key(self._rows[contact_id][1]), contact_id
+
+    def _put(self, contact):
+        self._remove(contact[0])
+        self._rows[contact[0]] = contact
+        insort(self._order, self._sort_key(contact[0]))
+
+    def _remove(self, contact_id):
+        if contact_id not in self._rows:
+            return
+        del self._order[bisect_left(self._order, self._sort_key(contact_id))]
+        del self._rows[contact_id]
+
+    @staticmethod
+    def _publish(origin, event):
+        if origin is not None:
+            origin.pubsub.send_others_on_topic(CONTACTS_TOPIC, event)
+
+
+def get_store(path=None):
+    """The process-wide ContactStore for a database (see contact_dao.get_dao)."""
+    dao = get_dao(path)
+    with _stores_lock:
+        store = _stores.get(dao.db.path)
+        if store is None:
+            store = _stores[dao.db.path] = ContactStore(dao)
+        return store
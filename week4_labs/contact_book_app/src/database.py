@@ -1,62 +1,621 @@
-# database.py
-import sqlite3
-def init_db():
-    """Initializes the database and creates the contacts table if it doesn't exist."""
-    conn = sqlite3.connect('contacts.db', check_same_thread=False)
-    cursor = conn.cursor()
-    cursor.execute('''
-    CREATE TABLE IF NOT EXISTS contacts (
-        id INTEGER PRIMARY KEY AUTOINCREMENT,
-        name TEXT NOT NULL,
-        phone TEXT,
-        email TEXT
-        )
-    ''')
-    conn.commit()
-    return conn
-
-def add_contact_db(conn, name, phone, email):
-    """Adds a new contact to the database."""
-    cursor = conn.cursor()
-    cursor.execute(
-        "INSERT INTO contacts (name, phone, email) VALUES (?, ?, ?)",
-        (name, phone, email)
-    )
-    conn.commit()
-
-def get_all_contacts_db(db_conn, search: str = "", filter_by: str = "all"):
-    cursor = db_conn.cursor()
-    try:
-        if search:
-            like_term = f"%{search}%"
-            if filter_by == "name":
-                cursor.execute("SELECT id, name, phone, email FROM contacts WHERE name LIKE ?", (like_term,))
-            elif filter_by == "phone":
-                cursor.execute("SELECT id, name, phone, email FROM contacts WHERE phone LIKE ?", (like_term,))
-            elif filter_by == "email":
-                cursor.execute("SELECT id, name, phone, email FROM contacts WHERE email LIKE ?", (like_term,))
-            else:
-                cursor.execute(
-                    "SELECT id, name, phone, email FROM contacts WHERE name LIKE ? OR phone LIKE ? OR email LIKE ?",
-                    (like_term, like_term, like_term)
-                )
-        else:
-            cursor.execute("SELECT id, name, phone, email FROM contacts")
-        return cursor.fetchall()
-    finally:
-        cursor.close()
-
-def update_contact_db(conn, contact_id, name, phone, email):
-    """Updates an existing contact in the database."""
-    cursor = conn.cursor()
-    cursor.execute(
-        "UPDATE contacts SET name = ?, phone = ?, email = ? WHERE id = ?",
-        (name, phone, email, contact_id)
-    )
-    conn.commit()
-
-def delete_contact_db(conn, contact_id):
-    """Deletes a contact from the database."""
-    cursor = conn.cursor()
-    cursor.execute("DELETE FROM contacts WHERE id = ?", (contact_id,))
-    conn.commit()
+# database.py
+import base64
+import json
+import os
+import re
+import sqlite3
+import time
+from contextlib import contextmanager
+
+from fuzzy import SCHEMA as FUZZY_SCHEMA, fuzzy_query, index_names, rebuild_terms
+
+DEFAULT_PAGE_SIZE = 50
+
+# The database lives next to this file unless CONTACTS_DB_PATH says otherwise
+DEFAULT_DB_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "contacts.db")
+
+# Applied to every connection. WAL lets readers run alongside the writer,
+# and with WAL synchronous=NORMAL is still crash-safe (it may only lose the
+# last commits on power loss). Negative cache_size is in KiB.
+PRAGMAS = (
+    "PRAGMA synchronous = NORMAL",
+    "PRAGMA cache_size = -8000",
+    "PRAGMA mmap_size = 268435456",
+    "PRAGMA temp_store = MEMORY",
+    "PRAGMA busy_timeout = 5000",
+)
+
+# INSERT/UPDATE/DELETE ... RETURNING needs SQLite 3.35; older libraries
+# (e.g. Python 3.9 on Debian 11 has 3.34) read the row with a SELECT instead
+HAS_RETURNING = sqlite3.sqlite_version_info >= (3, 35, 0)
+
+CONTACT_COLUMNS = "id, name, phone, email"
+
+# phone with common separators stripped, so "555-12 34" is searchable as
+# "5551234". Used by migration 3; changing it needs a new migration.
+PHONE_DIGITS_SQL = "coalesce(phone, '')"
+for _separator in " -()+./":
+    PHONE_DIGITS_SQL = f"replace({PHONE_DIGITS_SQL}, '{_separator}', '')"
+
+# Triggers keeping contacts_fts in step with contacts. Bulk imports may drop
+# them and rebuild the index once at the end (see contact_io), so they are
+# kept here rather than only inside migration 3.
+FTS_TRIGGERS = (
+    '''
+    CREATE TRIGGER contacts_fts_insert AFTER INSERT ON contacts BEGIN
+        INSERT INTO contacts_fts (rowid, name, email, phone_digits)
+        VALUES (new.id, new.name, new.email, new.phone_digits);
+    END
+    ''',
+    '''
+    CREATE TRIGGER contacts_fts_delete AFTER DELETE ON contacts BEGIN
+        INSERT INTO contacts_fts (contacts_fts, rowid, name, email, phone_digits)
+        VALUES ('delete', old.id, old.name, old.email, old.phone_digits);
+    END
+    ''',
+    '''
+    CREATE TRIGGER contacts_fts_update AFTER UPDATE OF name, phone, email ON contacts BEGIN
+        INSERT INTO contacts_fts (contacts_fts, rowid, name, email, phone_digits)
+        VALUES ('delete', old.id, old.name, old.email, old.phone_digits);
+        INSERT INTO contacts_fts (rowid, name, email, phone_digits)
+        VALUES (new.id, new.name, new.email, new.phone_digits);
+    END
+    ''',
+)
+
+
+
+def _create_name_terms(conn):
+    """Migration 4: word tables for fuzzy name search, filled from contacts_fts."""
+    for statement in FUZZY_SCHEMA:
+        conn.execute(statement)
+    rebuild_terms(conn)
+
+
+# Schema migrations, applied in order. Each one is a tuple of SQL statements
+# or a function taking the connection. PRAGMA user_version records how many
+# have run, so existing contacts.db files are upgraded in place on startup.
+# Only ever append to this list.
+MIGRATIONS = [
+    # 1: the original table (already present in databases created before
+    #    migrations existed, hence IF NOT EXISTS)
+    (
+        '''
+        CREATE TABLE IF NOT EXISTS contacts (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name TEXT NOT NULL,
+            phone TEXT,
+            email TEXT
+        )
+        ''',
+    ),
+    # 2: indexes for the sorted, paginated list and exact lookups
+    (
+        "CREATE INDEX IF NOT EXISTS idx_contacts_name_id ON contacts (name COLLATE NOCASE, id)",
+        "CREATE INDEX IF NOT EXISTS idx_contacts_phone ON contacts (phone)",
+        "CREATE INDEX IF NOT EXISTS idx_contacts_email ON contacts (email COLLATE NOCASE)",
+    ),
+    # 3: full-text index. contacts_fts is an external-content FTS5 table over
+    #    contacts (it stores only the index), kept in sync by triggers.
+    #    phone_digits is a generated column, so it can never go stale.
+    (
+        f"ALTER TABLE contacts ADD COLUMN phone_digits TEXT "
+        f"GENERATED ALWAYS AS ({PHONE_DIGITS_SQL}) VIRTUAL",
+        '''
+        CREATE VIRTUAL TABLE contacts_fts USING fts5(
+            name, email, phone_digits,
+            content='contacts', content_rowid='id',
+            tokenize='unicode61 remove_diacritics 2',
+            prefix='1 2 3'
+        )
+        ''',
+        *FTS_TRIGGERS,
+        # Index the rows that already exist
+        "INSERT INTO contacts_fts (contacts_fts) VALUES ('rebuild')",
+        # Rank by bm25 with a name match worth more than a phone or email one
+        "INSERT INTO contacts_fts (contacts_fts, rank) VALUES ('rank', 'bm25(10.0, 3.0, 5.0)')",
+    ),
+    # 4: name words and their trigrams, for typo-tolerant search (fuzzy.py)
+    _create_name_terms,
+]
+
+# Contacts are listed alphabetically (case-insensitive); id breaks ties so
+# the order is total and keyset pagination never skips or repeats a row.
+ORDER_BY = "name COLLATE NOCASE, id"
+
+SEARCH_COLUMNS = {
+    "name": ("name",),
+    "phone": ("phone",),
+    "email": ("email",),
+    "all": ("name", "phone", "email"),
+    "fuzzy": ("name",),
+}
+
+# Text columns of contacts_fts searched for each filter_by value; phone
+# searches go to phone_digits instead
+FTS_TEXT_COLUMNS = {
+    "name": "name",
+    "email": "email",
+    "all": "name email",
+}
+
+# Shorter searches match a large share of the table; an ordered index scan
+# that stops after one page beats ranking every FTS match
+MIN_FTS_LENGTH = 2
+
+# Longest a ranked search may take before falling back to the name-order scan
+RANK_TIME_BUDGET = 0.02  # seconds
+
+
+def migrate(conn):
+    """Brings the schema up to date; returns the resulting schema version."""
+    version = conn.execute("PRAGMA user_version").fetchone()[0]
+    for number, step in enumerate(MIGRATIONS[version:], start=version + 1):
+        try:
+            conn.execute("BEGIN")
+            if callable(step):
+                step(conn)
+            else:
+                for statement in step:
+                    conn.execute(statement)
+            # PRAGMA does not accept parameters; number is an int we control
+            conn.execute(f"PRAGMA user_version = {number}")
+            conn.execute("COMMIT")
+        except sqlite3.Error:
+            conn.execute("ROLLBACK")
+            raise
+    return len(MIGRATIONS)
+
+
+def db_path(path=None):
+    """The database file to use: path, else CONTACTS_DB_PATH, else DEFAULT_DB_PATH."""
+    return path or os.environ.get("CONTACTS_DB_PATH") or DEFAULT_DB_PATH
+
+
+def connect(path=None, read_only=False):
+    """Opens a connection with PRAGMAS applied (WAL is switched on by writers)."""
+    conn = sqlite3.connect(db_path(path), check_same_thread=False)
+    if not read_only:
+        conn.execute("PRAGMA journal_mode = WAL")
+    for pragma in PRAGMAS:
+        conn.execute(pragma)
+    if read_only:
+        conn.execute("PRAGMA query_only = ON")
+    return conn
+
+
+def init_db(path=None):
+    """Opens a single connection and migrates the database to the current schema."""
+    conn = connect(path)
+    migrate(conn)
+    return conn
+
+
+# Every function below takes either a plain connection or a
+# connections.ConnectionManager (which the app shares between sessions).
+# These pick the right connection for a read or a write.
+
+@contextmanager
+def reading(db):
+    """A connection to read with: db itself, or a pooled reader of a manager."""
+    if isinstance(db, sqlite3.Connection):
+        yield db
+    else:
+        with db.reader() as conn:
+            yield conn
+
+
+@contextmanager
+def writing(db):
+    """A connection to write with: db itself, or a manager's (locked) writer."""
+    if isinstance(db, sqlite3.Connection):
+        yield db
+    else:
+        with db.writer() as conn:
+            yield conn
+
+
+def data_version(db):
+    """
+    A value that changes when another connection (or, for a manager,
+    another process or a mark_changed call) has changed the database.
+    """
+    if isinstance(db, sqlite3.Connection):
+        return db.execute("PRAGMA data_version").fetchone()[0]
+    return db.version()
+
+
+def mark_changed(db):
+    """After a bulk write, makes data_version of a manager change (a no-op for a connection)."""
+    if not isinstance(db, sqlite3.Connection):
+        db.mark_changed()
+
+
+def validate_contact(name, phone, email):
+    """
+    Checks a contact against the app's rules (shared by the form and imports).
+
+    Returns (field, message) for the first problem found, or None.
+    """
+    if not name.strip():
+        return "name", "Name cannot be empty."
+    if not phone.strip():
+        return "phone", "Phone must be provided."
+    if not email.strip():
+        return "email", "Email must be provided."
+    if not phone.isdigit():
+        return "phone", "Phone number must contain only digits."
+    return None
+
+
+def _write_contact(conn, sql, params, contact_id=None):
+    """
+    Runs an INSERT, UPDATE or DELETE of one contact and returns the row
+    written (for a DELETE, the row removed), or None if there was none.
+
+    Without RETURNING (see HAS_RETURNING) the row is read with a SELECT in
+    the same transaction: after the write, or before it for a DELETE.
+    """
+    if HAS_RETURNING:
+        return conn.execute(f"{sql} RETURNING {CONTACT_COLUMNS}", params).fetchone()
+    if not conn.in_transaction:
+        conn.execute("BEGIN")
+    select = f"SELECT {CONTACT_COLUMNS} FROM contacts WHERE id = ?"
+    if sql.startswith("DELETE"):
+        contact = conn.execute(select, (contact_id,)).fetchone()
+        conn.execute(sql, params)
+        return contact
+    cursor = conn.execute(sql, params)
+    if cursor.rowcount == 0:
+        return None
+    return conn.execute(select, (cursor.lastrowid if contact_id is None else contact_id,)).fetchone()
+
+
+def add_contact_db(db, name, phone, email):
+    """Adds a new contact to the database; returns it as (id, name, phone, email)."""
+    with writing(db) as conn:
+        contact = _write_contact(
+            conn,
+            "INSERT INTO contacts (name, phone, email) VALUES (?, ?, ?)",
+            (name, phone, email)
+        )
+        index_names(conn, [name])
+        conn.commit()
+    return contact
+
+
+def encode_cursor(kind, key, contact_id):
+    """
+    Makes an opaque page token pointing just past one row.
+
+    kind is "name" (key is the contact's name) or "rank" (key is its
+    search rank).
+    """
+    raw = json.dumps([kind, key, contact_id]).encode()
+    return base64.urlsafe_b64encode(raw).decode()
+
+
+def decode_cursor(token, kind):
+    """Reverses encode_cursor; raises ValueError for a malformed or foreign token."""
+    try:
+        token_kind, key, contact_id = json.loads(base64.urlsafe_b64decode(token.encode()))
+    except (TypeError, ValueError) as e:
+        raise ValueError(f"Invalid page cursor: {token!r}") from e
+    if token_kind != kind:
+        raise ValueError(f"Page cursor {token!r} belongs to a different query")
+    return key, int(contact_id)
+
+
+def phone_digits(text):
+    """Keeps only the digits of a phone number or search term."""
+    return "".join(ch for ch in text if ch.isdigit())
+
+
+def _search_terms(search):
+    """Lower-cased words and the digits of a search string."""
+    return re.findall(r"\w+", search.lower()), phone_digits(search)
+
+
+def fts_query(search, filter_by="all"):
+    """
+    Builds an FTS5 MATCH expression for the search box, or None if it
+    cannot match anything.
+
+    Every word becomes a prefix term and all of them must match, so
+    "jo sm" finds "John Smith". Phone searches ignore everything but
+    digits and match the start of the normalized number, so "555 12"
+    finds "555-1234".
+    """
+    words, digits = _search_terms(search)
+    phone_term = f'{{phone_digits}} : "{digits}"*' if digits else None
+
+    if filter_by == "phone":
+        return phone_term
+
+    columns = FTS_TEXT_COLUMNS.get(filter_by, FTS_TEXT_COLUMNS["all"])
+    text_term = None
+    if words:
+        terms = " AND ".join(f'"{word}"*' for word in words)
+        text_term = f"{{{columns}}} : ({terms})"
+
+    if filter_by == "all" and phone_term:
+        return f"({text_term}) OR ({phone_term})" if text_term else phone_term
+    return text_term
+
+
+def _like_clause(search, filter_by):
+    """
+    LIKE version of fts_query, used for the name-order scan.
+
+    Each word must appear somewhere in the searched columns, so it matches
+    everything the FTS query would (and a little more).
+    """
+    words, digits = _search_terms(search)
+    columns = [c for c in SEARCH_COLUMNS.get(filter_by, SEARCH_COLUMNS["all"]) if c != "phone"]
+
+    phone_clause = None
+    if digits and filter_by in ("phone", "all"):
+        phone_clause = ("phone_digits LIKE ?", [f"{digits}%"])
+
+    text_clause = None
+    if words and columns:
+        parts = []
+        params = []
+        for word in words:
+            parts.append("(" + " OR ".join(f"{column} LIKE ?" for column in columns) + ")")
+            params.extend([f"%{word}%"] * len(columns))
+        text_clause = (" AND ".join(parts), params)
+
+    clauses = [clause for clause in (text_clause, phone_clause) if clause]
+    if not clauses:
+        return None, ()
+    sql = " OR ".join(f"({clause})" for clause, _ in clauses)
+    return f"({sql})", [param for _, params in clauses for param in params]
+
+
+def _match_query(conn, search, filter_by):
+    """fts_query, or for the "fuzzy" filter the similar-words query of fuzzy.py."""
+    if filter_by == "fuzzy":
+        return fuzzy_query(conn, search)
+    return fts_query(search, filter_by)
+
+
+def _filter_clause(search, filter_by, query):
+    """
+    WHERE clause for the name-order scan of a search whose MATCH query is query.
+
+    Fuzzy matches cannot be expressed with LIKE, so they are looked up in
+    contacts_fts; searches too short for that scan the names with LIKE
+    like the "name" filter.
+    """
+    if filter_by == "fuzzy" and query is not None and len(search) >= MIN_FTS_LENGTH:
+        return "id IN (SELECT rowid FROM contacts_fts WHERE contacts_fts MATCH ?)", [query]
+    return _like_clause(search, filter_by)
+
+
+def _page(rows, limit, kind, key_index):
+    """Trims the look-ahead row and builds the next-page cursor."""
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        return [row[:4] for row in rows], encode_cursor(kind, last[key_index], last[0])
+    return [row[:4] for row in rows], None
+
+
+def get_contacts_page(db_conn, search: str = "", filter_by: str = "all",
+                      cursor: str = None, limit: int = DEFAULT_PAGE_SIZE):
+    """
+    Returns one page of contacts and the token for the next page.
+
+    Without a search, contacts come in name order. Pages are
+    keyset-paginated: the cursor holds the (name, id) of the last row
+    shown, and the query seeks straight to it through the name index, so
+    deep pages cost the same as the first.
+
+    With a search, contacts_fts finds the matches and they come best match
+    first (bm25), paginated on (rank, id). Ranking has to score every
+    match, so searches that match a big part of the table (a single
+    letter, a common email domain) instead scan the name index in order
+    with LIKE; such matches are dense, so the scan fills a page quickly.
+    The cursor remembers which of the two a search used.
+
+    filter_by "fuzzy" searches names allowing typos (see fuzzy.py); the
+    matches are ranked and paginated like any other search.
+
+    Returns (rows, next_cursor); next_cursor is None on the last page.
+    """
+    search = search.strip()
+    with reading(db_conn) as conn:
+        if not search:
+            return _name_page(conn, "", (), cursor, limit)
+        query = _match_query(conn, search, filter_by)
+        if query is None:
+            return [], None
+
+        by_name = len(search) < MIN_FTS_LENGTH or (cursor and _cursor_kind(cursor) == "name")
+        if not by_name:
+            try:
+                return _rank_page(conn, query, cursor, limit)
+            except _RankingTooSlow:
+                pass
+
+        clause, params = _filter_clause(search, filter_by, query)
+        return _name_page(conn, clause, params, cursor, limit)
+
+
+def _cursor_kind(token):
+    try:
+        return json.loads(base64.urlsafe_b64decode(token.encode()))[0]
+    except (TypeError, ValueError, IndexError, KeyError) as e:
+        raise ValueError(f"Invalid page cursor: {token!r}") from e
+
+
+def _name_page(db_conn, clause, params, cursor, limit):
+    conditions = [clause] if clause else []
+    params = list(params)
+    if cursor:
+        name, contact_id = decode_cursor(cursor, "name")
+        # The row-value test alone makes SQLite scan the index from the
+        # start; the plain range test lets it seek straight to the cursor
+        conditions.append("name COLLATE NOCASE >= ? AND (name COLLATE NOCASE, id) > (?, ?)")
+        params.extend((name, name, contact_id))
+
+    where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+    # Fetch one extra row to know whether another page exists
+    rows = db_conn.execute(
+        f"SELECT id, name, phone, email FROM contacts {where} "
+        f"ORDER BY {ORDER_BY} LIMIT ?",
+        (*params, limit + 1),
+    ).fetchall()
+    return _page(rows, limit, "name", 1)
+
+
+class _RankingTooSlow(Exception):
+    """The ranked query ran past RANK_TIME_BUDGET."""
+
+
+def _rank_page(db_conn, query, cursor, limit):
+    after = ""
+    params = [query]
+    if cursor:
+        rank, contact_id = decode_cursor(cursor, "rank")
+        after = "WHERE (rank, id) > (?, ?)"
+        params.extend((rank, contact_id))
+
+    # Rank on the index alone, then read just this page's rows. Only the
+    # first page is timed: once a search has been ranked, later pages must
+    # follow the same order.
+    deadline = time.perf_counter() + RANK_TIME_BUDGET
+    if not cursor:
+        db_conn.set_progress_handler(lambda: time.perf_counter() > deadline, 1000)
+    try:
+        ranked = db_conn.execute(
+            f"""
+            SELECT id, rank FROM (
+                SELECT rowid AS id, rank FROM contacts_fts WHERE contacts_fts MATCH ?
+            )
+            {after}
+            ORDER BY rank, id LIMIT ?
+            """,
+            (*params, limit + 1),
+        ).fetchall()
+    except sqlite3.OperationalError as e:
+        if not cursor and time.perf_counter() > deadline:
+            raise _RankingTooSlow() from e
+        raise
+    finally:
+        db_conn.set_progress_handler(None, 0)
+
+    if not ranked:
+        return [], None
+    ids = [contact_id for contact_id, _ in ranked]
+    found = {
+        row[0]: row
+        for row in db_conn.execute(
+            f"SELECT id, name, phone, email FROM contacts "
+            f"WHERE id IN ({', '.join('?' * len(ids))})",
+            ids,
+        )
+    }
+    rows = [(*found[contact_id], rank) for contact_id, rank in ranked if contact_id in found]
+    return _page(rows, limit, "rank", 4)
+
+
+def page_order(search: str = "", cursor: str = None):
+    """
+    The order get_contacts_page lists a query in: "name" or "rank".
+
+    Pass the cursor of any page of the query when there is one; without it
+    the order is the one a first page would normally use.
+    """
+    if cursor:
+        return _cursor_kind(cursor)
+    return "rank" if len(search.strip()) >= MIN_FTS_LENGTH else "name"
+
+
+def name_key(name):
+    """Python equivalent of SQLite's NOCASE collation (ASCII-only folding)."""
+    return name.translate(_ASCII_LOWER)
+
+
+_ASCII_LOWER = str.maketrans("ABCDEFGHIJKLMNOPQRSTUVWXYZ", "abcdefghijklmnopqrstuvwxyz")
+
+
+def get_sort_keys(db_conn, contact_ids, search: str = "", filter_by: str = "all",
+                  order: str = "name"):
+    """
+    Sort keys of some contacts within a query's order, for placing rows in
+    an already displayed list.
+
+    Returns {id: key} for the given contacts that match the query; keys
+    compare like the query orders its rows ((name, id) or (rank, id)).
+    """
+    contact_ids = list(contact_ids)
+    if not contact_ids:
+        return {}
+    marks = ", ".join("?" * len(contact_ids))
+    search = search.strip()
+
+    with reading(db_conn) as conn:
+        query = _match_query(conn, search, filter_by) if search else None
+
+        if order == "rank":
+            if query is None:
+                return {}
+            rows = conn.execute(
+                "SELECT rowid, rank FROM contacts_fts "
+                f"WHERE contacts_fts MATCH ? AND rowid IN ({marks})",
+                (query, *contact_ids),
+            ).fetchall()
+            return {contact_id: (rank, contact_id) for contact_id, rank in rows}
+
+        clause, params = _filter_clause(search, filter_by, query) if search else ("", ())
+        if clause is None:
+            return {}
+        where = f"AND {clause}" if clause else ""
+        rows = conn.execute(
+            f"SELECT id, name FROM contacts WHERE id IN ({marks}) {where}",
+            (*contact_ids, *params),
+        ).fetchall()
+    return {contact_id: (name_key(name), contact_id) for contact_id, name in rows}
+
+
+def iter_contacts(db_conn, search: str = "", filter_by: str = "all",
+                  page_size: int = 500):
+    """Yields every matching contact, one page at a time, in page order."""
+    cursor = None
+    while True:
+        rows, cursor = get_contacts_page(db_conn, search, filter_by, cursor, page_size)
+        yield from rows
+        if cursor is None:
+            return
+
+
+def get_all_contacts_db(db_conn, search: str = "", filter_by: str = "all"):
+    """Returns every matching contact (prefer get_contacts_page)."""
+    return list(iter_contacts(db_conn, search, filter_by))
+
+
+def update_contact_db(db, contact_id, name, phone, email):
+    """Updates an existing contact; returns the new row, or None if it no longer exists."""
+    with writing(db) as conn:
+        contact = _write_contact(
+            conn,
+            "UPDATE contacts SET name = ?, phone = ?, email = ? WHERE id = ?",
+            (name, phone, email, contact_id),
+            contact_id
+        )
+        if contact is not None:
+            index_names(conn, [name])
+        conn.commit()
+    return contact
+
+
+def delete_contact_db(db, contact_id):
+    """Deletes a contact; returns the deleted row, or None if there was none."""
+    with writing(db) as conn:
+        contact = _write_contact(
+            conn, "DELETE FROM contacts WHERE id = ?", (contact_id,), contact_id
+        )
+        conn.commit()
+    return contact
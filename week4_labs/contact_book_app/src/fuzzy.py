@@ -0,0 +1,241 @@
+# fuzzy.py
+"""
+Typo-tolerant name search ("Jonh Smiht" finds John Smith).
+
+Fuzzy matching works on the distinct words of contact names (a few tens
+of thousands even for a million contacts), not on the contacts:
+
+1. name_terms holds every name word once, with its Soundex code, and
+   term_trigrams maps each trigram of a word (padded, so " jo" marks a
+   word start) to the words containing it.
+2. For each search word, words sharing enough trigrams and of a similar
+   length are fetched with one indexed query, plus words that sound the
+   same (Soundex). Each candidate is then checked with a bounded edit
+   distance (Levenshtein with transpositions), which gives up as soon as
+   the limit is passed.
+3. The surviving words become an FTS5 query over the name column, so
+   contacts are found and ranked through contacts_fts as usual.
+
+The tables are filled by migration 4 from the full-text index and kept up
+to date by the write functions in database.py. Words of deleted contacts
+stay behind; they only cost a query term that matches nothing.
+"""
+
+import re
+import unicodedata
+
+# Edit distance allowed for a search word, by its length
+MAX_DISTANCE_SHORT = 1  # up to SHORT_WORD letters
+MAX_DISTANCE_LONG = 2
+SHORT_WORD = 5
+
+# Words shorter than this are matched by prefix only
+MIN_FUZZY_LENGTH = 3
+
+# Similar words kept per search word (closest first)
+MAX_ALTERNATIVES = 20
+
+# Candidates fetched per search word before the edit-distance check
+MAX_CANDIDATES = 2000
+
+SCHEMA = (
+    '''
+    CREATE TABLE name_terms (
+        term TEXT PRIMARY KEY,
+        soundex TEXT NOT NULL
+    ) WITHOUT ROWID
+    ''',
+    "CREATE INDEX idx_name_terms_soundex ON name_terms (soundex, length(term))",
+    '''
+    CREATE TABLE term_trigrams (
+        trigram TEXT NOT NULL,
+        length INTEGER NOT NULL,
+        term TEXT NOT NULL,
+        PRIMARY KEY (trigram, length, term)
+    ) WITHOUT ROWID
+    ''',
+)
+
+_SOUNDEX_CODES = {
+    **dict.fromkeys("bfpv", "1"),
+    **dict.fromkeys("cgjkqsxz", "2"),
+    **dict.fromkeys("dt", "3"),
+    "l": "4",
+    **dict.fromkeys("mn", "5"),
+    "r": "6",
+}
+
+
+def words(text):
+    """
+    Splits text into lower-case words without diacritics, the way the
+    contacts_fts tokenizer (unicode61, remove_diacritics 2) does.
+    """
+    text = unicodedata.normalize("NFKD", text.lower())
+    text = "".join(ch for ch in text if not unicodedata.combining(ch))
+    return re.findall(r"[^\W_]+", text)
+
+
+def trigrams(term):
+    """Distinct trigrams of a word padded with one space on each side."""
+    padded = f" {term} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def soundex(term):
+    """American Soundex code ("robert" -> "R163"); "" if term has no letters."""
+    letters = [ch for ch in term if "a" <= ch <= "z"]
+    if not letters:
+        return ""
+    code = letters[0].upper()
+    previous = _SOUNDEX_CODES.get(letters[0], "")
+    for ch in letters[1:]:
+        digit = _SOUNDEX_CODES.get(ch, "")
+        if digit and digit != previous:
+            code += digit
+            if len(code) == 4:
+                break
+        if ch not in "hw":  # h and w do not separate equal codes
+            previous = digit
+    return code.ljust(4, "0")
+
+
+def edit_distance(a, b, limit):
+    """
+    Levenshtein distance with adjacent transpositions (optimal string
+    alignment) between a and b, or limit + 1 once it is known to exceed
+    limit.
+    """
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    if a == b:
+        return 0
+    previous2 = None
+    previous = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        current = [i] + [0] * len(b)
+        row_best = i
+        for j in range(1, len(b) + 1):
+            cost = a[i - 1] != b[j - 1]
+            value = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if (previous2 is not None and j > 1
+                    and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]):
+                value = min(value, previous2[j - 2] + 1)
+            current[j] = value
+            row_best = min(row_best, value)
+        if row_best > limit:
+            return limit + 1
+        previous2, previous = previous, current
+    return min(previous[-1], limit + 1)
+
+
+def max_distance(word):
+    return MAX_DISTANCE_SHORT if len(word) <= SHORT_WORD else MAX_DISTANCE_LONG
+
+
+def name_words(names):
+    """The distinct words of some contact names."""
+    return {term for name in names for term in words(name or "")}
+
+
+def index_names(conn, names):
+    """Adds the words of some contact names to name_terms and term_trigrams."""
+    index_terms(conn, name_words(names))
+
+
+def index_terms(conn, terms):
+    """Adds words (as returned by name_words) to name_terms and term_trigrams."""
+    if not terms:
+        return
+    conn.executemany(
+        "INSERT OR IGNORE INTO name_terms (term, soundex) VALUES (?, ?)",
+        ((term, soundex(term)) for term in terms),
+    )
+    conn.executemany(
+        "INSERT OR IGNORE INTO term_trigrams (trigram, length, term) VALUES (?, ?, ?)",
+        ((trigram, len(term), term) for term in terms for trigram in trigrams(term)),
+    )
+
+
+def rebuild_terms(conn):
+    """Refills the word tables from the name column of contacts_fts."""
+    conn.execute("DELETE FROM name_terms")
+    conn.execute("DELETE FROM term_trigrams")
+    conn.execute(
+        "CREATE VIRTUAL TABLE IF NOT EXISTS temp.contacts_fts_terms "
+        "USING fts5vocab(main, contacts_fts, 'col')"
+    )
+    terms = [term for (term,) in conn.execute(
+        "SELECT term FROM temp.contacts_fts_terms WHERE col = 'name'"
+    )]
+    conn.execute("DROP TABLE temp.contacts_fts_terms")
+    index_terms(conn, terms)
+
+
+def similar_terms(conn, word):
+    """Indexed words within the allowed edit distance of word, closest first."""
+    limit = max_distance(word)
+    grams = sorted(trigrams(word))
+    # An edit changes at most three trigrams, a transposition four, so a
+    # close word shares at least this many with the search word
+    needed = max(1, len(grams) - 4 * limit)
+    marks = ", ".join("?" * len(grams))
+    candidates = {term for (term,) in conn.execute(
+        f"""
+        SELECT term FROM term_trigrams
+        WHERE trigram IN ({marks}) AND length BETWEEN ? AND ?
+        GROUP BY term HAVING count(*) >= ?
+        LIMIT ?
+        """,
+        (*grams, len(word) - limit, len(word) + limit, needed, MAX_CANDIDATES),
+    )}
+    if len(grams) - 4 * limit < 1:
+        # Too short for trigrams to be sure ("awon" and "aown" share none):
+        # also try the words with the same first letter
+        candidates.update(term for (term,) in conn.execute(
+            "SELECT term FROM name_terms WHERE term >= ? AND term < ? "
+            "AND length(term) BETWEEN ? AND ? LIMIT ?",
+            (word[0], word[0] + "\U0010ffff", len(word) - limit, len(word) + limit,
+             MAX_CANDIDATES),
+        ))
+
+    # Longer words that sound alike get one extra edit ("stephenson" ~
+    # "stevenson"); for short words that lets in too much
+    sounds_like = set()
+    code = soundex(word)
+    if code and len(word) > SHORT_WORD:
+        sounds_like = {term for (term,) in conn.execute(
+            "SELECT term FROM name_terms WHERE soundex = ? "
+            "AND length(term) BETWEEN ? AND ? LIMIT ?",
+            (code, len(word) - limit - 1, len(word) + limit + 1, MAX_CANDIDATES),
+        )}
+
+    found = []
+    for term in candidates | sounds_like:
+        allowed = limit + 1 if term in sounds_like else limit
+        distance = edit_distance(word, term, allowed)
+        if distance <= allowed:
+            found.append((distance, term))
+    found.sort()
+    return [term for _, term in found[:MAX_ALTERNATIVES]]
+
+
+def fuzzy_query(conn, search, column="name"):
+    """
+    FTS5 MATCH expression for a fuzzy search of one column, or None if
+    search has no words.
+
+    Each search word matches itself as a prefix, or any similar indexed
+    word; all search words must match. A word with no similar words still
+    gets its prefix term ({name} : (("qqqq"*))), which simply matches
+    nothing.
+    """
+    groups = []
+    for word in words(search):
+        alternatives = [f'"{word}"*']
+        if len(word) >= MIN_FUZZY_LENGTH:
+            alternatives += [f'"{term}"' for term in similar_terms(conn, word) if term != word]
+        groups.append("(" + " OR ".join(alternatives) + ")")
+    if not groups:
+        return None
+    return f"{{{column}}} : ({' AND '.join(groups)})"
@@ -0,0 +1,225 @@
+# test_app_logic.py
+"""
+Tests for ContactListView's page window, run against a real (temporary)
+database through AsyncContactDAO but without a Flet page.
+"""
+
+import asyncio
+import logging
+import sqlite3
+
+import flet as ft
+
+from app_logic import MAX_PAGES, ContactListView, DebouncedSearch
+from contact_dao import AsyncContactDAO
+from database import init_db
+
+PAGE_SIZE = 5
+
+
+class OffscreenListView(ContactListView):
+    """A ContactListView that is never added to a page."""
+
+    def update(self):
+        pass
+
+    def scroll_to(self, **kwargs):
+        pass
+
+
+class FakePage:
+    """Records page.update calls and the snack bar."""
+
+    def __init__(self):
+        self.updates = 0
+        self.snack_bar = None
+
+    def update(self):
+        self.updates += 1
+
+
+class ScriptedStore:
+    """get_page answers each search with one row named after it, or its scripted error."""
+
+    def __init__(self, errors=None, gates=None):
+        self.errors = errors or {}
+        self.gates = gates or {}  # search -> asyncio.Event the query waits for
+        self.searches = []
+
+    async def get_page(self, search="", filter_by="all", cursor=None, limit=PAGE_SIZE):
+        self.searches.append(search)
+        if search in self.gates:
+            await self.gates[search].wait()
+        if search in self.errors:
+            raise self.errors[search]
+        return [(len(self.searches), search, "555", "x@example.com")], None
+
+
+def shown(view):
+    """Ids of the rows the view shows, top to bottom."""
+    return [control.data[0] for control in view.controls if isinstance(control, ft.ListTile)]
+
+
+def make_db(tmp_path, count):
+    """A database of count contacts; returns it and their ids in list order."""
+    conn = init_db(str(tmp_path / "contacts.db"))
+    # Repeated names, so the id tie-break matters
+    conn.executemany(
+        "INSERT INTO contacts (name, phone, email) VALUES (?, '555', 'x@example.com')",
+        [(f"Contact {i % 7}",) for i in range(count)],
+    )
+    conn.commit()
+    ids = [row[0] for row in conn.execute("SELECT id FROM contacts ORDER BY name COLLATE NOCASE, id")]
+    return conn, ids
+
+
+def run_view(conn, scenario, search=""):
+    """Runs scenario(view) on a view showing the first page of search."""
+    async def run():
+        dao = AsyncContactDAO(conn)
+        try:
+            view = OffscreenListView(dao, PAGE_SIZE)
+            rows, cursor = await dao.get_page(search, "all", None, PAGE_SIZE)
+            view.show(rows, cursor, search)
+            return await scenario(view)
+        finally:
+            dao.close()
+
+    return asyncio.run(run())
+
+
+def test_scrolling_down_and_back_shows_every_contact_once(tmp_path):
+    conn, ids = make_db(tmp_path, MAX_PAGES * PAGE_SIZE * 3 + 2)
+
+    async def scenario(view):
+        seen = shown(view)
+        while view._next_cursor is not None:
+            before = set(shown(view))
+            await view.load_next()
+            assert len(shown(view)) <= MAX_PAGES * PAGE_SIZE
+            seen += [i for i in shown(view) if i not in before]
+        at_end = shown(view)
+
+        back = []
+        while view._first_page > 0:
+            before = set(shown(view))
+            await view.load_previous()
+            assert len(shown(view)) <= MAX_PAGES * PAGE_SIZE
+            back = [i for i in shown(view) if i not in before] + back
+        return seen, at_end, back, shown(view)
+
+    seen, at_end, back, top = run_view(conn, scenario)
+
+    assert seen == ids  # no duplicates, no gaps
+    assert at_end == ids[-len(at_end):]
+    assert back + at_end == ids
+    assert top == ids[:MAX_PAGES * PAGE_SIZE]
+
+
+def test_added_and_edited_contacts_are_placed_in_order(tmp_path):
+    conn, ids = make_db(tmp_path, 4)  # "Contact 0" .. "Contact 3", one page
+
+    async def scenario(view):
+        added = await view.store.add("Contact 1b", "555", "new@example.com")
+        await view.insert_contact(added)
+        after_add = shown(view)
+        moved = await view.store.update(ids[0], "Contact 9", "555", "x@example.com")
+        await view.replace_contact(ids[0], moved)
+        after_move = shown(view)
+        await view.replace_contact(ids[1], None)
+        return added[0], after_add, after_move, shown(view)
+
+    new_id, after_add, after_move, after_remove = run_view(conn, scenario)
+
+    assert after_add == ids[:2] + [new_id] + ids[2:]
+    assert after_move == ids[1:2] + [new_id] + ids[2:] + ids[:1]
+    assert after_remove == [new_id] + ids[2:] + ids[:1]
+
+
+def test_contacts_outside_the_query_or_window_are_not_shown(tmp_path):
+    conn, ids = make_db(tmp_path, PAGE_SIZE * 2)
+
+    async def scenario(view):
+        # Sorts after the first page, which is all that is shown
+        later = await view.store.add("Zed", "555", "z@example.com")
+        await view.insert_contact(later)
+        first_page = shown(view)
+        view.show(*await view.store.get_page("contact", "name", None, PAGE_SIZE), "contact", "name")
+        other = await view.store.add("Someone Else", "555", "s@example.com")
+        await view.insert_contact(other)
+        return first_page, shown(view), other[0]
+
+    first_page, searched, other_id = run_view(conn, scenario)
+
+    assert first_page == ids[:PAGE_SIZE]
+    assert other_id not in searched
+    assert len(searched) == PAGE_SIZE
+
+
+def run_searches(store, scenario):
+    """Runs scenario(searches, view, page) against a DebouncedSearch over store."""
+    async def run():
+        page = FakePage()
+        view = OffscreenListView(store, PAGE_SIZE)
+        return await scenario(DebouncedSearch(page, view), view, page)
+
+    return asyncio.run(run())
+
+
+def shown_names(view):
+    return [control.data[1] for control in view.controls if isinstance(control, ft.ListTile)]
+
+
+def test_typing_quickly_runs_only_the_last_search():
+    store = ScriptedStore()
+
+    async def scenario(searches, view, page):
+        typed = []
+        for text in ("j", "jo", "joh"):
+            typed.append(asyncio.create_task(searches.run(text, "all", 0.05)))
+            await asyncio.sleep(0.01)
+        return await asyncio.gather(*typed), shown_names(view), page.updates
+
+    results, names, updates = run_searches(store, scenario)
+
+    assert results == [False, False, True]
+    assert store.searches == ["joh"]
+    assert (names, updates) == (["joh"], 1)
+
+
+def test_a_result_that_arrives_late_is_dropped():
+    slow = asyncio.Event()
+    store = ScriptedStore(gates={"jo": slow})
+
+    async def scenario(searches, view, page):
+        first = asyncio.create_task(searches.run("jo"))
+        await asyncio.sleep(0.01)  # its query is running
+        second = await searches.run("jane")
+        slow.set()
+        return await first, second, shown_names(view)
+
+    first, second, names = run_searches(store, scenario)
+
+    assert store.searches == ["jo", "jane"]
+    assert (first, second) == (False, True)
+    assert names == ["jane"]
+
+
+def test_a_failed_search_is_logged_and_shown(caplog):
+    store = ScriptedStore(errors={'"': sqlite3.OperationalError("fts5: syntax error near \"\"\"")})
+
+    async def scenario(searches, view, page):
+        await searches.run("jo")
+        with caplog.at_level(logging.ERROR, logger="app_logic"):
+            failed = await searches.run('"')
+        after_error = shown_names(view), page.snack_bar
+        await searches.run("jane")  # later searches still work
+        return failed, after_error, shown_names(view)
+
+    failed, (names, snack_bar), later = run_searches(store, scenario)
+
+    assert failed is True
+    assert names == []
+    assert snack_bar.open and "Search failed: fts5: syntax error" in snack_bar.content.value
+    assert "Search for" in caplog.text and "OperationalError" in caplog.text
+    assert later == ["jane"]
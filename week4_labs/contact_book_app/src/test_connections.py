@@ -0,0 +1,136 @@
+# test_connections.py
+"""Tests for ConnectionManager's writer lock, reader pool and versions."""
+
+import sqlite3
+import threading
+import time
+
+import pytest
+
+from connections import ConnectionManager
+
+
+@pytest.fixture
+def manager(tmp_path):
+    manager = ConnectionManager(str(tmp_path / "contacts.db"), max_readers=2)
+    yield manager
+    manager.close()
+
+
+def test_writer_uses_wal_and_readers_are_read_only(manager):
+    with manager.writer() as conn:
+        assert conn.execute("PRAGMA journal_mode").fetchone() == ("wal",)
+    with manager.reader() as conn:
+        with pytest.raises(sqlite3.OperationalError):
+            conn.execute("INSERT INTO contacts (name, phone, email) VALUES ('x', '1', 'x@example.com')")
+
+
+def test_readers_are_reused_up_to_the_limit(manager):
+    with manager.reader() as first:
+        pass
+    with manager.reader() as again:
+        assert again is first
+    with manager.reader() as one, manager.reader() as two:
+        assert one is not two
+    assert manager._opened_readers == 2
+
+    # A third reader waits for one to come back
+    got = []
+
+    def read():
+        with manager.reader() as conn:
+            got.append(conn)
+
+    with manager.reader() as one, manager.reader() as two:
+        thread = threading.Thread(target=read)
+        thread.start()
+        time.sleep(0.05)
+        assert got == []
+    thread.join(5)
+    assert got[0] in (one, two)
+    assert manager._opened_readers == 2
+
+
+def test_writes_are_serialized(manager):
+    inside, overlaps = [0], []
+
+    def write(i):
+        with manager.writer() as conn:
+            inside[0] += 1
+            overlaps.append(inside[0])
+            conn.execute("INSERT INTO contacts (name, phone, email) VALUES (?, '1', 'x@example.com')", (f"C{i}",))
+            time.sleep(0.01)
+            conn.commit()
+            inside[0] -= 1
+
+    threads = [threading.Thread(target=write, args=(i,)) for i in range(5)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert overlaps == [1] * 5
+    with manager.reader() as conn:
+        assert conn.execute("SELECT count(*) FROM contacts").fetchone() == (5,)
+
+
+def test_version_changes_for_outside_writes_and_mark_changed(manager):
+    before = manager.version()
+    with manager.writer() as conn:
+        conn.execute("INSERT INTO contacts (name, phone, email) VALUES ('Own', '1', 'o@example.com')")
+        conn.commit()
+    assert manager.version() == before  # the manager's own writes are known
+
+    other = sqlite3.connect(manager.path)
+    other.execute("INSERT INTO contacts (name, phone, email) VALUES ('Other', '2', 'x@example.com')")
+    other.commit()
+    other.close()
+    after_other = manager.version()
+    assert after_other != before
+
+    manager.mark_changed()
+    assert manager.version() != after_other
+
+    # While the writer is busy the last known version is returned at once
+    with manager.writer():
+        assert manager.version() == manager.version()
+
+
+def test_close_closes_idle_and_returned_readers(manager):
+    with manager.reader() as idle:
+        pass
+    with manager.reader() as in_use:
+        manager.close()
+        in_use.execute("SELECT 1")  # still usable until returned
+    for conn in (idle, in_use):
+        with pytest.raises(sqlite3.ProgrammingError):
+            conn.execute("SELECT 1")
+    with pytest.raises(sqlite3.ProgrammingError):
+        with manager.reader():
+            pass
+    with pytest.raises(sqlite3.ProgrammingError):
+        with manager.writer():
+            pass
+    manager.close()  # again: nothing to do
+
+
+def test_close_wakes_threads_waiting_for_a_reader(tmp_path):
+    manager = ConnectionManager(str(tmp_path / "contacts.db"), max_readers=1)
+    errors = []
+
+    def wait_for_reader():
+        try:
+            with manager.reader():
+                pass
+        except sqlite3.ProgrammingError as e:
+            errors.append(e)
+
+    with manager.reader():
+        thread = threading.Thread(target=wait_for_reader)
+        thread.start()
+        time.sleep(0.05)
+        manager.close()
+    thread.join(5)
+
+    assert not thread.is_alive()
+    assert len(errors) == 1
@@ -0,0 +1,83 @@
+# test_contact_dao.py
+"""Tests for AsyncContactDAO's thread pool, pending limit and stats."""
+
+import asyncio
+import threading
+
+import pytest
+
+from contact_dao import AsyncContactDAO
+from contact_store import get_store
+from database import init_db
+
+
+def test_store_can_be_built_on_a_thread_without_an_event_loop(tmp_path, monkeypatch):
+    # Flet runs a sync main(page), which builds the store, on a worker thread
+    for registry in ("connections._managers", "contact_dao._daos", "contact_store._stores"):
+        monkeypatch.setattr(registry, {})
+    built = []
+    thread = threading.Thread(target=lambda: built.append(get_store(str(tmp_path / "contacts.db"))))
+    thread.start()
+    thread.join()
+    store = built[0]
+    assert store.dao._slots is None  # nothing tied to an event loop yet
+
+    async def scenario():
+        await store.add("John Smith", "5551234", "john@example.com")
+        return await store.get_page()
+
+    try:
+        rows, _ = asyncio.run(scenario())
+    finally:
+        store.dao.close()
+        store.dao.db.close()
+    assert [row[1] for row in rows] == ["John Smith"]
+
+
+def test_max_pending_bounds_the_work_handed_to_the_pool(tmp_path):
+    dao = AsyncContactDAO(init_db(str(tmp_path / "contacts.db")), max_workers=1, max_pending=2)
+    started = threading.Event()
+    release = threading.Event()
+
+    def slow(db):
+        started.set()
+        release.wait(5)
+        return "done"
+
+    def broken(db):
+        raise ValueError("bad query")
+
+    async def scenario():
+        tasks = [asyncio.create_task(dao._run("slow", slow)) for _ in range(5)]
+        await asyncio.to_thread(started.wait, 5)
+        await asyncio.sleep(0.05)
+        busy = dao.stats()
+        handed_over = len(dao._queued) + dao._running
+
+        # The second call is queued in the pool but not started
+        tasks[1].cancel()
+        await asyncio.gather(tasks[1], return_exceptions=True)
+        await asyncio.sleep(0.05)
+        after_cancel = dao.stats()
+
+        release.set()
+        results = await asyncio.gather(*tasks, return_exceptions=True)
+        with pytest.raises(ValueError):
+            await dao._run("broken", broken)
+        return busy, handed_over, after_cancel, results, dao.stats()
+
+    try:
+        busy, handed_over, after_cancel, results, done = asyncio.run(scenario())
+    finally:
+        dao.close()
+
+    assert (busy["running"], busy["pending"]) == (1, 4)  # 1 queued in the pool, 3 waiting
+    assert handed_over == 2
+    assert (after_cancel["running"], after_cancel["pending"]) == (1, 3)
+    assert isinstance(results[1], asyncio.CancelledError)
+    assert results[:1] + results[2:] == ["done"] * 4
+
+    assert (done["pending"], done["running"], done["completed"], done["failed"]) == (0, 0, 5, 1)
+    assert done["operations"]["slow"]["count"] == 4
+    assert done["operations"]["broken"] == {**done["operations"]["broken"], "count": 1, "failed": 1}
+    assert done["operations"]["slow"]["max_ms"] >= done["operations"]["slow"]["avg_ms"] > 0
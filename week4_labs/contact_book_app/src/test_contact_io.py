@@ -0,0 +1,144 @@
+# test_contact_io.py
+"""Tests for CSV/vCard parsing and bulk import."""
+
+import io
+
+import pytest
+
+from contact_io import import_contacts, read_csv, read_vcard, write_vcard
+from database import get_contacts_page, init_db
+from fuzzy import fuzzy_query
+
+FTS_TRIGGERS = {"contacts_fts_insert", "contacts_fts_delete", "contacts_fts_update"}
+
+
+def triggers(conn):
+    return {name for (name,) in conn.execute("SELECT name FROM sqlite_master WHERE type = 'trigger'")}
+
+
+def test_read_csv_matches_columns_by_header():
+    f = io.StringIO(
+        "E-Mail,Full Name,Notes,Phone Number\n"
+        "john@example.com, John Smith ,x,5551234\n"
+        "\n"
+        "jane@example.com,Jane Doe\n"
+    )
+    assert list(read_csv(f)) == [
+        (2, "John Smith", "5551234", "john@example.com"),
+        (4, "Jane Doe", "", "jane@example.com"),
+    ]
+    with pytest.raises(ValueError):
+        list(read_csv(io.StringIO("phone,email\n1,a@b\n")))
+
+
+def test_read_vcard_unfolds_and_unescapes_lines():
+    f = io.StringIO(
+        "BEGIN:VCARD\r\n"
+        "VERSION:3.0\r\n"
+        "FN:Jonathan Alexander Bartholomew Smith-\r\n"
+        " Worthington\\, Jr.\r\n"
+        "item1.TEL;TYPE=CELL:555\r\n"
+        "\t1234\r\n"
+        "TEL:999\r\n"
+        "EMAIL;TYPE=INTERNET:john@example.com\r\n"
+        "END:VCARD\r\n"
+    )
+    assert list(read_vcard(f)) == [
+        (1, "Jonathan Alexander Bartholomew Smith-Worthington, Jr.", "5551234", "john@example.com"),
+    ]
+
+
+def test_read_vcard_uses_n_when_there_is_no_fn():
+    f = io.StringIO(
+        "BEGIN:VCARD\nVERSION:2.1\nN:Doe;Jane;;;\nTEL:5550000\nEND:VCARD\n"
+        "BEGIN:VCARD\nN:Prince;;;;\nEND:VCARD\n"
+    )
+    assert list(read_vcard(f)) == [(1, "Jane Doe", "5550000", ""), (6, "Prince", "", "")]
+
+
+def test_write_vcard_folds_long_lines_that_read_vcard_restores():
+    name = "A" * 60 + ", " + "B" * 60
+    out = io.StringIO()
+    write_vcard(out, [(1, name, "5551234", "a@example.com")])
+    assert all(len(line) <= 75 for line in out.getvalue().split("\r\n"))
+    assert list(read_vcard(io.StringIO(out.getvalue()))) == [(1, name, "5551234", "a@example.com")]
+
+
+def test_rejected_records_are_counted_and_reported(tmp_path, monkeypatch):
+    monkeypatch.setattr("contact_io.MAX_KEPT_REJECTS", 2)
+    conn = init_db(str(tmp_path / "contacts.db"))
+    records = [
+        (2, "John Smith", "5551234", "john@example.com"),
+        (3, "", "5551234", "nobody@example.com"),
+        (4, "Jane Doe", "555-0000", "jane@example.com"),
+        (5, "Joe Bloggs", "5559876", ""),
+        (6, "Anna Jones", "5554321", "anna@example.com"),
+    ]
+    reported = []
+
+    result = import_contacts(conn, records, chunk_size=2, on_reject=reported.append)
+
+    assert (result.imported, result.rejected) == (2, 3)
+    assert [(r.line, r.reason) for r in reported] == [
+        (3, "Name cannot be empty."),
+        (4, "Phone number must contain only digits."),
+        (5, "Email must be provided."),
+    ]
+    assert result.rejects == reported[:2]
+    assert conn.execute("SELECT name FROM contacts ORDER BY id").fetchall() == [
+        ("John Smith",), ("Anna Jones",),
+    ]
+
+
+@pytest.mark.parametrize("defer_index", [False, True])
+def test_imported_contacts_are_searchable(tmp_path, defer_index):
+    conn = init_db(str(tmp_path / "contacts.db"))
+    f = io.StringIO("name,phone,email\nJohn Smith,5551234,john@example.com\nJane Doe,5550000,jane@example.com\n")
+
+    import_contacts(conn, read_csv(f), defer_index=defer_index)
+
+    assert [row[1] for row in get_contacts_page(conn, "smi")[0]] == ["John Smith"]
+    assert triggers(conn) == FTS_TRIGGERS
+
+
+@pytest.mark.parametrize("defer_index", [False, True])
+def test_imported_names_are_found_despite_typos(tmp_path, defer_index):
+    conn = init_db(str(tmp_path / "contacts.db"))
+    f = io.StringIO(
+        "name,phone,email\n"
+        "Bartholomew Quigley,5551234,bart@example.com\n"
+        "Jane Doe,5550000,jane@example.com\n"
+        "Anna Jones,5554321,anna@example.com\n"
+    )
+
+    import_contacts(conn, read_csv(f), chunk_size=2, defer_index=defer_index)
+
+    query = fuzzy_query(conn, "bartolomew quigly")
+    assert '"bartholomew"' in query and '"quigley"' in query
+    assert [row[1] for row in get_contacts_page(conn, "bartolomew quigly", "fuzzy")[0]] == [
+        "Bartholomew Quigley",
+    ]
+    assert [row[1] for row in get_contacts_page(conn, "jnes", "fuzzy")[0]] == ["Anna Jones"]
+
+
+def test_failed_deferred_import_is_rolled_back(tmp_path):
+    conn = init_db(str(tmp_path / "contacts.db"))
+    conn.execute("INSERT INTO contacts (name, phone, email) VALUES ('Old Contact', '1', 'o@example.com')")
+    conn.commit()
+
+    def records():
+        for i in range(10):
+            yield i + 2, f"New {i}", "5551234", "n@example.com"
+        raise OSError("file went away")
+
+    with pytest.raises(OSError):
+        import_contacts(conn, records(), chunk_size=3, defer_index=True)
+
+    assert not conn.in_transaction
+    assert conn.execute("SELECT name FROM contacts").fetchall() == [("Old Contact",)]
+    assert triggers(conn) == FTS_TRIGGERS
+    # The restored triggers still keep the index in step
+    conn.execute("INSERT INTO contacts (name, phone, email) VALUES ('Later Contact', '2', 'l@example.com')")
+    conn.commit()
+    assert [row[1] for row in get_contacts_page(conn, "later")[0]] == ["Later Contact"]
+    conn.execute("INSERT INTO contacts_fts (contacts_fts) VALUES ('integrity-check')")
@@ -0,0 +1,86 @@
+# test_contact_store.py
+"""Tests for the shared in-memory ContactStore."""
+
+import asyncio
+import sqlite3
+
+from connections import ConnectionManager
+from contact_dao import AsyncContactDAO
+from contact_io import import_contacts
+from contact_store import ContactStore
+from database import get_contacts_page
+
+
+def run_store(tmp_path, scenario):
+    """Runs scenario(store, path) on a store over a new database file."""
+    path = str(tmp_path / "contacts.db")
+
+    async def run():
+        manager = ConnectionManager(path)
+        dao = AsyncContactDAO(manager)
+        try:
+            return await scenario(ContactStore(dao), path)
+        finally:
+            dao.close()
+            manager.close()
+
+    return asyncio.run(run())
+
+
+async def all_pages(store, limit=3):
+    rows, cursor = await store.get_page(limit=limit)
+    while cursor:
+        more, cursor = await store.get_page(cursor=cursor, limit=limit)
+        rows += more
+    return rows
+
+
+def test_memory_pages_match_the_database_after_writes(tmp_path):
+    async def scenario(store, path):
+        ids = [(await store.add(name, "555", "x@example.com"))[0]
+               for name in ("bob", "Alice", "alice", "Bob", "carol", "Alice")]
+        await store.update(ids[0], "Aaron", "555", "x@example.com")
+        await store.update(ids[2], "alice", "556", "y@example.com")  # same name, new phone
+        await store.delete(ids[3])
+        await store.delete(999)
+        return await all_pages(store), store.loads, store.memory_reads
+
+    rows, loads, memory_reads = run_store(tmp_path, scenario)
+
+    conn = sqlite3.connect(str(tmp_path / "contacts.db"))
+    assert rows == get_contacts_page(conn, limit=100)[0]
+    assert [row[1] for row in rows] == ["Aaron", "Alice", "alice", "Alice", "carol"]
+    assert loads == 1  # the store's own writes never force a reload
+    assert memory_reads > 1
+
+
+def test_write_from_another_process_is_picked_up(tmp_path):
+    async def scenario(store, path):
+        await store.add("Alice", "555", "a@example.com")
+        before = await all_pages(store)
+
+        other = sqlite3.connect(path)  # e.g. a second app process
+        other.execute("INSERT INTO contacts (name, phone, email) VALUES ('Bob', '556', 'b@example.com')")
+        other.commit()
+        other.close()
+
+        return before, await all_pages(store), store.loads
+
+    before, after, loads = run_store(tmp_path, scenario)
+
+    assert [row[1] for row in before] == ["Alice"]
+    assert [row[1] for row in after] == ["Alice", "Bob"]
+    assert loads == 2
+
+
+def test_import_through_the_manager_is_picked_up(tmp_path):
+    async def scenario(store, path):
+        await store.load()
+        records = [(2, "Carol", "557", "c@example.com"), (3, "Dave", "558", "d@example.com")]
+        await asyncio.to_thread(import_contacts, store.dao.db, records)
+        return await all_pages(store), store.loads
+
+    rows, loads = run_store(tmp_path, scenario)
+
+    assert [row[1] for row in rows] == ["Carol", "Dave"]
+    assert loads == 2
@@ -0,0 +1,284 @@
+# test_database.py
+"""
+Tests for the contact database layer. Every test works on its own
+temporary database file:
+
+    python -m pytest -q
+"""
+
+import sqlite3
+
+import pytest
+
+from database import (
+    MIGRATIONS, add_contact_db, decode_cursor, delete_contact_db, get_contacts_page, get_sort_keys,
+    init_db, migrate, page_order, update_contact_db,
+)
+from fuzzy import fuzzy_query
+
+# The contacts table as the app created it before migrations existed
+BASELINE_SCHEMA = '''
+    CREATE TABLE IF NOT EXISTS contacts (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        name TEXT NOT NULL,
+        phone TEXT,
+        email TEXT
+        )
+'''
+
+BASELINE_ROWS = [
+    (1, "John Smith", "555-1234", "john@example.com"),
+    (2, "Zoë Müller", "(030) 12 34", "zoe@example.de"),
+    (3, "Jane Doe", "5550000", "jane@example.com"),
+]
+
+
+def make_baseline_db(path, rows=BASELINE_ROWS):
+    """Creates an unversioned (user_version 0) contacts.db holding rows."""
+    conn = sqlite3.connect(path)
+    conn.execute(BASELINE_SCHEMA)
+    conn.executemany("INSERT INTO contacts (id, name, phone, email) VALUES (?, ?, ?, ?)", rows)
+    conn.commit()
+    conn.close()
+
+
+def new_db(tmp_path, contacts=()):
+    """A migrated database holding contacts, given as (name, phone, email)."""
+    conn = init_db(str(tmp_path / "contacts.db"))
+    for name, phone, email in contacts:
+        add_contact_db(conn, name, phone, email)
+    return conn
+
+
+def schema(conn):
+    return sorted(conn.execute("SELECT type, name, sql FROM sqlite_master"), key=str)
+
+
+def test_baseline_database_migrates_to_current_version(tmp_path):
+    path = str(tmp_path / "contacts.db")
+    make_baseline_db(path)
+
+    conn = init_db(path)
+
+    assert conn.execute("PRAGMA user_version").fetchone()[0] == len(MIGRATIONS)
+    assert conn.execute(
+        "SELECT id, name, phone, email FROM contacts ORDER BY id"
+    ).fetchall() == BASELINE_ROWS
+
+    indexes = {name for (name,) in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+    assert {
+        "idx_contacts_name_id", "idx_contacts_phone", "idx_contacts_email", "idx_name_terms_soundex",
+    } <= indexes
+    plan = conn.execute(
+        "EXPLAIN QUERY PLAN SELECT id FROM contacts ORDER BY name COLLATE NOCASE, id"
+    ).fetchall()
+    assert "idx_contacts_name_id" in plan[0][3]
+
+
+def test_migration_indexes_existing_rows_for_search(tmp_path):
+    path = str(tmp_path / "contacts.db")
+    make_baseline_db(path)
+    conn = init_db(path)
+
+    # Migration 3: generated phone digits and the full-text index
+    assert conn.execute("SELECT phone_digits FROM contacts WHERE id = 2").fetchone() == ("0301234",)
+    conn.execute("INSERT INTO contacts_fts (contacts_fts) VALUES ('integrity-check')")
+    assert conn.execute(
+        "SELECT rowid FROM contacts_fts WHERE contacts_fts MATCH 'smith'"
+    ).fetchall() == [(1,)]
+    assert conn.execute(
+        "SELECT rowid FROM contacts_fts WHERE contacts_fts MATCH 'muller'"
+    ).fetchall() == [(2,)]
+
+    # Migration 4: name words and their trigrams
+    terms = dict(conn.execute("SELECT term, soundex FROM name_terms"))
+    assert terms == {
+        "john": "J500", "smith": "S530", "zoe": "Z000", "muller": "M460",
+        "jane": "J500", "doe": "D000",
+    }
+    assert conn.execute(
+        "SELECT trigram FROM term_trigrams WHERE term = 'john' ORDER BY trigram"
+    ).fetchall() == [(" jo",), ("hn ",), ("joh",), ("ohn",)]
+
+
+def test_migrate_again_is_a_no_op(tmp_path):
+    conn = new_db(tmp_path, [("John Smith", "5551234", "john@example.com")])
+    before = schema(conn)
+    terms = conn.execute("SELECT count(*) FROM term_trigrams").fetchone()
+
+    assert migrate(conn) == len(MIGRATIONS)
+    assert init_db(str(tmp_path / "contacts.db")).execute("PRAGMA user_version").fetchone()[0] == len(MIGRATIONS)
+
+    assert schema(conn) == before
+    assert conn.execute("SELECT count(*) FROM term_trigrams").fetchone() == terms
+    assert conn.execute("SELECT count(*) FROM contacts").fetchone() == (1,)
+
+
+def test_failed_migration_is_rolled_back(tmp_path, monkeypatch):
+    path = str(tmp_path / "contacts.db")
+    make_baseline_db(path)
+
+    def broken(conn):
+        conn.execute("CREATE TABLE half_done (x)")
+        conn.execute("SELECT * FROM no_such_table")
+
+    monkeypatch.setattr("database.MIGRATIONS", MIGRATIONS[:1] + [broken])
+    conn = sqlite3.connect(path)
+    with pytest.raises(sqlite3.OperationalError):
+        migrate(conn)
+
+    assert conn.execute("PRAGMA user_version").fetchone()[0] == 1
+    assert conn.execute("SELECT name FROM sqlite_master WHERE name = 'half_done'").fetchone() is None
+
+
+def names(rows):
+    return [row[1] for row in rows]
+
+
+SEARCH_CONTACTS = [
+    ("John Smith", "555-1234", "john@example.com"),
+    ("Jane Doe", "(020) 7946 0000", "jane@smith.example"),
+    ("Joseph Smalls", "555 9876", "joe@example.com"),
+    ("Anna Jones", "12-555-0000", "anna@example.com"),
+]
+
+
+def test_search_words_are_prefixes_that_must_all_match(tmp_path):
+    conn = new_db(tmp_path, SEARCH_CONTACTS)
+    assert names(get_contacts_page(conn, "jo sm")[0]) == ["John Smith", "Joseph Smalls"]
+    assert names(get_contacts_page(conn, "jo smi", "name")[0]) == ["John Smith"]
+    assert get_contacts_page(conn, "ohn", "name") == ([], None)  # not a word prefix
+
+
+def test_name_matches_rank_above_email_matches(tmp_path):
+    conn = new_db(tmp_path, SEARCH_CONTACTS)
+    rows, _ = get_contacts_page(conn, "smith")
+    assert names(rows) == ["John Smith", "Jane Doe"]
+
+
+def test_phone_search_matches_the_start_of_the_digits(tmp_path):
+    conn = new_db(tmp_path, SEARCH_CONTACTS)
+    assert names(get_contacts_page(conn, "555 12", "phone")[0]) == ["John Smith"]
+    assert names(get_contacts_page(conn, "(555) 1", "phone")[0]) == ["John Smith"]
+    assert names(get_contacts_page(conn, "555", "phone")[0]) == ["John Smith", "Joseph Smalls"]
+
+
+def test_phone_search_ignores_digits_inside_the_number(tmp_path):
+    conn = new_db(tmp_path, SEARCH_CONTACTS)
+    assert get_contacts_page(conn, "1234", "phone") == ([], None)
+    assert get_contacts_page(conn, "7946", "phone") == ([], None)
+    assert get_contacts_page(conn, "smith", "phone") == ([], None)  # no digits at all
+
+
+def test_one_character_search_scans_in_name_order(tmp_path):
+    conn = new_db(tmp_path, SEARCH_CONTACTS)
+    assert page_order("j") == "name"
+    rows, cursor = get_contacts_page(conn, "j", "name", limit=2)
+    assert names(rows) == ["Anna Jones", "Jane Doe"]
+    decode_cursor(cursor, "name")
+    rows, cursor = get_contacts_page(conn, "j", "name", cursor, limit=2)
+    assert names(rows) == ["John Smith", "Joseph Smalls"]
+    assert cursor is None
+
+
+def test_slow_ranking_falls_back_to_name_order(tmp_path, monkeypatch):
+    conn = new_db(tmp_path)
+    conn.executemany(
+        "INSERT INTO contacts (name, phone, email) VALUES (?, '555', 'x@example.com')",
+        [(f"Smith {i:04}",) for i in range(3000, 0, -1)],
+    )
+    monkeypatch.setattr("database.RANK_TIME_BUDGET", 0)
+
+    rows, cursor = get_contacts_page(conn, "smith", limit=3)
+
+    assert names(rows) == ["Smith 0001", "Smith 0002", "Smith 0003"]
+    decode_cursor(cursor, "name")  # later pages keep the name order
+    assert names(get_contacts_page(conn, "smith", cursor=cursor, limit=1)[0]) == ["Smith 0004"]
+
+
+def test_fuzzy_query_falls_back_to_the_word_as_a_prefix(tmp_path):
+    conn = new_db(tmp_path, SEARCH_CONTACTS)
+    assert fuzzy_query(conn, "qqqq") == '{name} : (("qqqq"*))'
+    assert fuzzy_query(conn, " -- ") is None  # no words at all
+    assert get_contacts_page(conn, "qqqq", "fuzzy") == ([], None)
+    assert names(get_contacts_page(conn, "smiht", "fuzzy")[0]) == ["John Smith"]
+
+
+def test_cursors_of_one_order_are_rejected_by_the_other(tmp_path):
+    conn = new_db(tmp_path, SEARCH_CONTACTS)
+    _, rank_cursor = get_contacts_page(conn, "jo", limit=1)
+    _, name_cursor = get_contacts_page(conn, "", limit=1)
+
+    with pytest.raises(ValueError):
+        decode_cursor(rank_cursor, "name")
+    with pytest.raises(ValueError):
+        decode_cursor(name_cursor, "rank")
+    with pytest.raises(ValueError):
+        get_contacts_page(conn, "", cursor=rank_cursor)
+    with pytest.raises(ValueError):
+        get_contacts_page(conn, "jo", cursor="not a cursor")
+
+
+def test_keyset_pages_cover_every_row_once(tmp_path):
+    conn = new_db(tmp_path)
+    # Repeated names and mixed case, so the NOCASE order and id tie-break matter
+    conn.executemany(
+        "INSERT INTO contacts (name, phone, email) VALUES (?, '555', 'x@example.com')",
+        [(f"{'Member' if i % 3 else 'member'} {i % 5}",) for i in range(200)],
+    )
+    expected = [row[0] for row in conn.execute("SELECT id FROM contacts ORDER BY name COLLATE NOCASE, id")]
+
+    for search in ("", "mem"):
+        seen, cursor = [], None
+        while True:
+            rows, cursor = get_contacts_page(conn, search, cursor=cursor, limit=7)
+            assert len(rows) <= 7
+            seen += [row[0] for row in rows]
+            if cursor is None:
+                break
+        assert sorted(seen) == sorted(expected)
+        assert len(seen) == len(set(seen))
+        if not search:
+            assert seen == expected
+
+
+@pytest.mark.parametrize("returning", [True, False])  # False: SQLite before 3.35
+def test_writes_return_the_affected_row(tmp_path, monkeypatch, returning):
+    monkeypatch.setattr("database.HAS_RETURNING", returning)
+    conn = new_db(tmp_path)
+    added = add_contact_db(conn, "John Smith", "5551234", "john@example.com")
+    assert added[1:] == ("John Smith", "5551234", "john@example.com")
+
+    assert update_contact_db(conn, added[0], "John Smyth", "5551234", "john@example.com") == (
+        added[0], "John Smyth", "5551234", "john@example.com",
+    )
+    assert delete_contact_db(conn, added[0]) == (added[0], "John Smyth", "5551234", "john@example.com")
+    assert conn.execute("SELECT count(*) FROM contacts").fetchone() == (0,)
+
+
+@pytest.mark.parametrize("returning", [True, False])
+def test_writes_to_a_missing_contact_return_none(tmp_path, monkeypatch, returning):
+    monkeypatch.setattr("database.HAS_RETURNING", returning)
+    conn = new_db(tmp_path, [("John Smith", "5551234", "john@example.com")])
+    assert update_contact_db(conn, 999, "Nobody", "1", "n@example.com") is None
+    assert delete_contact_db(conn, 999) is None
+    assert conn.execute("SELECT count(*) FROM contacts").fetchone() == (1,)
+
+
+def test_sort_keys_only_cover_rows_matching_the_query(tmp_path):
+    conn = new_db(tmp_path, SEARCH_CONTACTS)
+    john, jane, joseph, anna = 1, 2, 3, 4
+
+    keys = get_sort_keys(conn, [john, jane, anna], "", "all", "name")
+    assert keys == {john: ("john smith", john), jane: ("jane doe", jane), anna: ("anna jones", anna)}
+
+    keys = get_sort_keys(conn, [john, jane, joseph], "j", "name", "name")
+    assert set(keys) == {john, jane, joseph}
+    keys = get_sort_keys(conn, [john, anna], "smith", "name", "rank")
+    assert keys.get(anna) is None
+    assert keys[john][1] == john
+
+    # Keys sort like the rows of the query
+    keys = get_sort_keys(conn, [john, jane, joseph], "smith", "all", "rank")
+    assert sorted(keys, key=keys.get) == [row[0] for row in get_contacts_page(conn, "smith")[0]]
+    assert get_sort_keys(conn, [jane], "555", "phone", "rank").get(jane) is None